@@ -1,5 +1,7 @@
+from openapi_schema_validator._cache import ResultCache
 from openapi_schema_validator._format import oas30_format_checker
 from openapi_schema_validator._format import oas31_format_checker
+from openapi_schema_validator.concurrency import ThreadSafeValidator
 from openapi_schema_validator.shortcuts import validate
 from openapi_schema_validator.validators import OAS30Validator
 from openapi_schema_validator.validators import OAS31Validator
@@ -16,4 +18,6 @@ __all__ = [
     "oas30_format_checker",
     "OAS31Validator",
     "oas31_format_checker",
+    "ResultCache",
+    "ThreadSafeValidator",
 ]
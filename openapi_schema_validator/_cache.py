@@ -0,0 +1,393 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Pattern
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from jsonschema._utils import equal
+from jsonschema.exceptions import SchemaError
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator._utils import canonical
+from openapi_schema_validator._utils import iter_subschemas
+from openapi_schema_validator.patterns import LinearPattern
+from openapi_schema_validator.patterns import PatternPolicy
+from openapi_schema_validator.patterns import analyze_pattern
+
+
+class EnumIndex:
+    """Hash index of enum members honoring JSON equality.
+
+    Members are looked up in a set by their canonical key, which keeps
+    ``True`` and ``False`` apart from ``1`` and ``0``. Members without
+    a canonical key are compared one by one.
+    """
+
+    def __init__(self, enums: Iterable[Any]):
+        self.hashed: Set[Any] = set()
+        self.unhashed: List[Any] = []
+        for each in enums:
+            try:
+                self.hashed.add(canonical(each))
+            except TypeError:
+                self.unhashed.append(each)
+
+    def __contains__(self, instance: Any) -> bool:
+        try:
+            if canonical(instance) in self.hashed:
+                return True
+        except TypeError:
+            pass
+        return any(equal(instance, each) for each in self.unhashed)
+
+
+@lru_cache(maxsize=4096)
+def _analyze_pattern(pattern: str) -> Tuple[str, ...]:
+    # shared by the caches of all validators
+    return tuple(analyze_pattern(pattern))
+
+
+@lru_cache(maxsize=4096)
+def _compile_pattern(
+    pattern: str, pattern_policy: Optional[PatternPolicy]
+) -> Union[Pattern[str], LinearPattern]:
+    # compiled patterns are immutable, so validators share them
+    if pattern_policy is None:
+        return re.compile(pattern)
+    return pattern_policy.compile(pattern, _analyze_pattern(pattern))
+
+
+class KeywordCache:
+    """Precomputed keyword state shared by a validator and its descendants.
+
+    Entries are keyed by the identity of the keyword value and keep a
+    reference to it, so an identity can't be reused while it is cached.
+    Patterns are compiled according to ``pattern_policy``; those prone
+    to catastrophic backtracking are listed with the issues found in
+    ``unsafe_patterns``. Patterns are only analyzed when a policy is
+    set or ``unsafe_patterns`` is read.
+
+    Pickle it together with the schema, so the keyword values it's
+    keyed by are unpickled as the same objects.
+    """
+
+    def __init__(self, pattern_policy: Optional[PatternPolicy] = None):
+        self.pattern_policy = pattern_policy
+        self._enums: Dict[int, Tuple[Any, EnumIndex]] = {}
+        self._patterns: Dict[str, Union[Pattern[str], LinearPattern]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_enums"] = list(self._enums.values())
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # identities of unpickled keyword values differ
+        state["_enums"] = {
+            id(enums): (enums, index) for enums, index in state["_enums"]
+        }
+        self.__dict__.update(state)
+
+    @property
+    def unsafe_patterns(self) -> Dict[str, List[str]]:
+        unsafe = {}
+        for pattern in self._patterns:
+            issues = _analyze_pattern(pattern)
+            if issues:
+                unsafe[pattern] = list(issues)
+        return unsafe
+
+    def compile(
+        self,
+        schema: Mapping[Hashable, Any],
+        resolver: Optional[RefResolver] = None,
+    ) -> None:
+        """Precompile regular expressions used anywhere in schema.
+
+        Raises SchemaError for patterns that are not valid.
+        """
+        for subschema in iter_subschemas(schema, resolver):
+            patterns = []
+            if isinstance(subschema.get("pattern"), str):
+                patterns.append(("pattern", subschema["pattern"]))
+            if isinstance(subschema.get("patternProperties"), Mapping):
+                patterns.extend(
+                    ("patternProperties", pattern)
+                    for pattern in subschema["patternProperties"]
+                )
+            for keyword, pattern in patterns:
+                try:
+                    self.regex(pattern)
+                except re.error as exc:
+                    raise SchemaError(
+                        f"{pattern!r} is not a valid regular expression",
+                        validator=keyword,
+                        validator_value=pattern,
+                        schema=subschema,
+                        cause=exc,
+                    )
+
+    def regex(self, pattern: str) -> Union[Pattern[str], LinearPattern]:
+        try:
+            return self._patterns[pattern]
+        except KeyError:
+            pass
+        compiled = _compile_pattern(pattern, self.pattern_policy)
+        self._patterns[pattern] = compiled
+        return compiled
+
+    def enum_index(self, enums: Iterable[Any]) -> EnumIndex:
+        try:
+            return self._enums[id(enums)][1]
+        except KeyError:
+            index = EnumIndex(enums)
+            self._enums[id(enums)] = (enums, index)
+            return index
+
+
+def _digest(instance: Any) -> Optional[str]:
+    """Hash JSON serialization of instance.
+
+    Unlike canonical keys, ``1`` and ``1.0`` get different digests
+    because they may validate differently. Returns None for values
+    that can't be serialized.
+    """
+    try:
+        serialized = json.dumps(
+            instance, sort_keys=True, separators=(",", ":")
+        )
+    except (TypeError, ValueError, RecursionError):
+        return None
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+_Result = Tuple[Optional[float], List[ValidationError]]
+_Fingerprint = Tuple[Any, Optional[str]]
+
+
+class ResultCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResultCache:
+    """Bounded cache of validation results keyed by content hash.
+
+    Keys combine a fingerprint of the schema and of the document its
+    references are resolved against, the resolution scope, the
+    validator class, format checker and read/write context, and a
+    digest of the instance (or of the raw bytes it was parsed from).
+    Least recently used entries are evicted once ``maxsize`` is
+    reached and entries older than ``ttl`` seconds are discarded.
+    Results are only stored when the errors are fully consumed, and
+    not for validators with sampling or limits. Safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[Hashable, _Result]" = OrderedDict()
+        self._fingerprints: "OrderedDict[int, _Fingerprint]" = OrderedDict()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # results are cheap to recompute, unpickled caches start empty
+        return self.__class__, (self.maxsize, self.ttl, self.timer)
+
+    def info(self) -> ResultCacheInfo:
+        with self._lock:
+            return ResultCacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._results),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._fingerprints.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def iter_errors(
+        self,
+        validator: Validator,
+        instance: Any,
+        raw: Optional[Union[bytes, bytearray, memoryview]] = None,
+    ) -> Iterator[ValidationError]:
+        """Iterate over errors of instance, reusing cached results.
+
+        ``raw`` is the serialized payload instance was parsed from;
+        hashing it is cheaper than hashing the parsed instance.
+        """
+        return self.lookup(
+            validator,
+            instance,
+            lambda: validator.evolve(schema=validator.schema).iter_errors(
+                instance
+            ),
+            raw=raw,
+        )
+
+    def descend(
+        self,
+        validator: Validator,
+        instance: Any,
+        schema: Any,
+        path: Optional[Union[str, int]] = None,
+        schema_path: Optional[Union[str, int]] = None,
+    ) -> Iterator[ValidationError]:
+        """Cached counterpart of ``Validator.descend``."""
+        evolved = validator.evolve(schema=schema)
+        for error in self.lookup(
+            evolved, instance, lambda: evolved.iter_errors(instance)
+        ):
+            if path is not None:
+                error.path.appendleft(path)
+            if schema_path is not None:
+                error.schema_path.appendleft(schema_path)
+            yield error
+
+    def lookup(
+        self,
+        validator: Validator,
+        instance: Any,
+        compute: Callable[[], Iterable[ValidationError]],
+        raw: Optional[Union[bytes, bytearray, memoryview]] = None,
+    ) -> Iterator[ValidationError]:
+        key = self._key(validator, instance, raw)
+        if key is None:
+            return iter(compute())
+        errors = self._get(key)
+        metrics = getattr(validator, "metrics", None)
+        if metrics is not None:
+            metrics.cache_lookup("result", errors is not None)
+        if errors is None:
+            return self._collect(key, compute())
+        return (type(error).create_from(error) for error in errors)
+
+    def _key(
+        self,
+        validator: Validator,
+        instance: Any,
+        raw: Optional[Union[bytes, bytearray, memoryview]],
+    ) -> Optional[Hashable]:
+        # sampled elements depend on the location of the instance, and
+        # hashing would read instances before limits reject them
+        if (
+            getattr(validator, "sampling", None) is not None
+            or getattr(validator, "limits", None) is not None
+        ):
+            return None
+        schema = self._fingerprint(validator.schema)
+        referrer = self._fingerprint(validator.resolver.referrer)
+        if schema is None or referrer is None:
+            return None
+        if raw is not None:
+            content: Optional[Tuple[str, str]] = (
+                "raw",
+                hashlib.sha256(raw).hexdigest(),
+            )
+        else:
+            digest = _digest(instance)
+            if digest is None:
+                return None
+            content = ("instance", digest)
+        return (
+            type(validator),
+            validator.format_checker,
+            getattr(validator, "read", None),
+            getattr(validator, "write", None),
+            schema,
+            referrer,
+            validator.resolver.resolution_scope,
+            content,
+        )
+
+    def _fingerprint(self, schema: Any) -> Optional[str]:
+        # entries keep a reference to the schema,
+        # so its identity can't be reused while cached
+        with self._lock:
+            try:
+                self._fingerprints.move_to_end(id(schema))
+                return self._fingerprints[id(schema)][1]
+            except KeyError:
+                pass
+        fingerprint = _digest(schema)
+        with self._lock:
+            self._fingerprints[id(schema)] = (schema, fingerprint)
+            if len(self._fingerprints) > self.maxsize:
+                self._fingerprints.popitem(last=False)
+        return fingerprint
+
+    def _get(self, key: Hashable) -> Optional[List[ValidationError]]:
+        with self._lock:
+            try:
+                expires, errors = self._results[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if expires is not None and expires <= self.timer():
+                del self._results[key]
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return errors
+
+    def _collect(
+        self, key: Hashable, errors: Iterable[ValidationError]
+    ) -> Iterator[ValidationError]:
+        collected = []
+        for error in errors:
+            # consumers prepend to paths of the errors they receive
+            collected.append(type(error).create_from(error))
+            yield error
+        expires = None if self.ttl is None else self.timer() + self.ttl
+        with self._lock:
+            self._results[key] = (expires, collected)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+                self.evictions += 1
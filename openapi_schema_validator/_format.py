@@ -1,15 +1,15 @@
 import binascii
-from base64 import b64decode
-from base64 import b64encode
 from datetime import datetime
 from typing import Any
 from typing import Tuple
-from typing import Union
 from uuid import UUID
 
 from jsonschema._format import FormatChecker
 from jsonschema.exceptions import FormatError
 
+from openapi_schema_validator._utils import BINARY_TYPES
+from openapi_schema_validator._utils import STRING_TYPES
+
 DATETIME_HAS_RFC3339_VALIDATOR = False
 DATETIME_HAS_STRICT_RFC3339 = False
 DATETIME_HAS_ISODATE = False
@@ -40,12 +40,19 @@ else:
     DATETIME_RAISES += (ValueError, TypeError)
 
 
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+# base64 is checked in chunks of whole quanta, so large buffers aren't
+# decoded at once
+BYTE_CHUNK_SIZE = 4 * 2**20
+
+
 def is_int32(instance: Any) -> bool:
-    return isinstance(instance, int)
+    return isinstance(instance, int) and INT32_MIN <= instance <= INT32_MAX
 
 
 def is_int64(instance: Any) -> bool:
-    return isinstance(instance, int)
+    return isinstance(instance, int) and INT64_MIN <= instance <= INT64_MAX
 
 
 def is_float(instance: Any) -> bool:
@@ -59,23 +66,38 @@ def is_double(instance: Any) -> bool:
 
 
 def is_binary(instance: Any) -> bool:
-    return isinstance(instance, bytes)
+    return isinstance(instance, BINARY_TYPES)
 
 
-def is_byte(instance: Union[str, bytes]) -> bool:
+def is_byte(instance: Any) -> bool:
     if isinstance(instance, str):
         instance = instance.encode()
-
-    try:
-        encoded = b64encode(b64decode(instance))
-    except TypeError:
+    if not isinstance(instance, BINARY_TYPES):
         return False
-    else:
-        return encoded == instance
+
+    with memoryview(instance) as view:
+        if not view.c_contiguous:
+            return _is_byte(memoryview(view.tobytes()))
+        with view.cast("B") as data:
+            return _is_byte(data)
+
+
+def _is_byte(data: memoryview) -> bool:
+    # encoding the decoded data gives it back only if it's canonical
+    # base64; padding may end the last chunk only
+    size = len(data)
+    for start in range(0, size, BYTE_CHUNK_SIZE):
+        chunk = data[start : start + BYTE_CHUNK_SIZE]
+        decoded = binascii.a2b_base64(chunk)
+        if binascii.b2a_base64(decoded, newline=False) != chunk:
+            return False
+        if start + BYTE_CHUNK_SIZE < size and chunk[-1] == ord("="):
+            return False
+    return True
 
 
 def is_datetime(instance: str) -> bool:
-    if not isinstance(instance, (bytes, str)):
+    if not isinstance(instance, STRING_TYPES):
         return False
 
     if DATETIME_HAS_RFC3339_VALIDATOR:
@@ -91,21 +113,21 @@ def is_datetime(instance: str) -> bool:
 
 
 def is_date(instance: Any) -> bool:
-    if not isinstance(instance, (bytes, str)):
+    if not isinstance(instance, STRING_TYPES):
         return False
 
-    if isinstance(instance, bytes):
-        instance = instance.decode()
+    if not isinstance(instance, str):
+        instance = str(instance, "utf-8")
 
     return bool(datetime.strptime(instance, "%Y-%m-%d"))
 
 
 def is_uuid(instance: Any) -> bool:
-    if not isinstance(instance, (bytes, str)):
+    if not isinstance(instance, STRING_TYPES):
         return False
 
-    if isinstance(instance, bytes):
-        instance = instance.decode()
+    if not isinstance(instance, str):
+        instance = str(instance, "utf-8")
 
     return str(UUID(instance)).lower() == instance.lower()
 
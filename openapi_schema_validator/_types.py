@@ -8,9 +8,11 @@ from jsonschema._types import is_integer
 from jsonschema._types import is_number
 from jsonschema._types import is_object
 
+from openapi_schema_validator._utils import STRING_TYPES
+
 
 def is_string(checker: TypeChecker, instance: Any) -> bool:
-    return isinstance(instance, (str, bytes))
+    return isinstance(instance, STRING_TYPES)
 
 
 oas30_type_checker = TypeChecker(
@@ -0,0 +1,173 @@
+from mmap import mmap
+from typing import Any
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Union
+
+from jsonschema._utils import uniq
+from jsonschema._utils import unbool
+from jsonschema.exceptions import RefResolutionError
+from jsonschema.validators import RefResolver
+
+# binary data, checked in place through the buffer protocol
+BINARY_TYPES = (bytes, bytearray, memoryview, mmap)
+STRING_TYPES = (str,) + BINARY_TYPES
+
+
+def canonical(instance: Any) -> Any:
+    """Build a hashable key that is equal for JSON equal instances.
+
+    Follows JSON equality rules: ``1`` and ``1.0`` share a key while
+    ``True`` and ``1`` don't. Raises TypeError for unhashable values
+    that are neither objects nor arrays.
+    """
+    if isinstance(instance, (str, bytes, int, float)):
+        return unbool(instance)
+    if instance is None:
+        return instance
+    if isinstance(instance, BINARY_TYPES):
+        # binary data is equal to bytes of the same content; read-only
+        # byte views hash like them without a copy
+        if isinstance(instance, memoryview):
+            try:
+                hash(instance)
+            except (TypeError, ValueError):
+                pass
+            else:
+                return instance
+        return bytes(instance)
+    if isinstance(instance, list):
+        return ("array", tuple([canonical(item) for item in instance]))
+    if isinstance(instance, (dict, Mapping)):
+        return (
+            "object",
+            frozenset(
+                [(key, canonical(value)) for key, value in instance.items()]
+            ),
+        )
+    if isinstance(instance, Sequence):
+        return canonical(list(instance))
+    hash(instance)
+    return instance
+
+
+def string_length(instance: Any) -> int:
+    """Length of a string, in bytes for binary data.
+
+    Buffers aren't copied: views report the size of the memory they
+    cover.
+    """
+    if isinstance(instance, memoryview):
+        return instance.nbytes
+    return len(instance)
+
+
+def unique(container: Iterable[Any]) -> bool:
+    """Check if all elements are unique in a single pass over container."""
+    seen: Set[Hashable] = set()
+    try:
+        for each in container:
+            key = canonical(each)
+            if key in seen:
+                return False
+            seen.add(key)
+    except TypeError:
+        return bool(uniq(container))
+    return True
+
+
+SCHEMA_KEYWORDS = (
+    "additionalItems",
+    "additionalProperties",
+    "contains",
+    "contentSchema",
+    "else",
+    "if",
+    "items",
+    "not",
+    "propertyNames",
+    "then",
+    "unevaluatedItems",
+    "unevaluatedProperties",
+)
+SCHEMA_ARRAY_KEYWORDS = ("allOf", "anyOf", "items", "oneOf", "prefixItems")
+SCHEMA_MAPPING_KEYWORDS = (
+    "$defs",
+    "definitions",
+    "dependentSchemas",
+    "patternProperties",
+    "properties",
+)
+
+
+def iter_subschemas(
+    schema: Any, resolver: Optional[RefResolver] = None
+) -> Iterator[Mapping[Hashable, Any]]:
+    """Iterate over schema and all subschemas nested in it.
+
+    Each subschema is yielded once. With a resolver, local references
+    are followed too; remote ones never are.
+    """
+    seen: Set[int] = set()
+    stack = [schema]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, (dict, Mapping)) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+
+        for keyword in SCHEMA_KEYWORDS:
+            if keyword in current:
+                stack.append(current[keyword])
+        for keyword in SCHEMA_ARRAY_KEYWORDS:
+            if isinstance(current.get(keyword), list):
+                stack.extend(current[keyword])
+        for keyword in SCHEMA_MAPPING_KEYWORDS:
+            # most keywords are absent, skip the slow Mapping check
+            value = current.get(keyword)
+            if value is not None and isinstance(value, (dict, Mapping)):
+                stack.extend(value.values())
+
+        ref = current.get("$ref")
+        if resolver is not None and isinstance(ref, str) and ref[:1] == "#":
+            try:
+                _, resolved = resolver.resolve(ref)
+            except RefResolutionError:
+                continue
+            stack.append(resolved)
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split JSON pointer into unescaped reference tokens."""
+    if not pointer:
+        return []
+    if pointer[0] != "/":
+        raise ValueError(f"{pointer!r} is not a valid JSON pointer")
+    return [
+        token.replace("~1", "/").replace("~0", "~")
+        for token in pointer[1:].split("/")
+    ]
+
+
+def format_pointer(tokens: Iterable[Union[str, int]]) -> str:
+    """Join reference tokens into an escaped JSON pointer."""
+    return "".join(
+        "/" + str(token).replace("~", "~0").replace("/", "~1")
+        for token in tokens
+    )
+
+
+def array_index(token: Union[str, int]) -> int:
+    """Convert JSON pointer token to an array index."""
+    if isinstance(token, int):
+        return token
+    if not token.isdigit() or (token != "0" and token[0] == "0"):
+        raise ValueError(f"{token!r} is not a valid array index")
+    return int(token)
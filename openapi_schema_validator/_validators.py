@@ -3,9 +3,11 @@ from typing import Any
 from typing import Dict
 from typing import Hashable
 from typing import ItemsView
+from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Mapping
+from typing import Tuple
 from typing import Union
 
 from jsonschema._utils import extras_msg
@@ -17,6 +19,9 @@ from jsonschema.exceptions import FormatError
 from jsonschema.exceptions import ValidationError
 from jsonschema.protocols import Validator
 
+from openapi_schema_validator._utils import string_length
+from openapi_schema_validator._utils import unique
+
 
 def handle_discriminator(
     validator: Validator, _: Any, instance: Any, schema: Mapping[Hashable, Any]
@@ -130,24 +135,172 @@ def format(
     if instance is None:
         return
 
-    if validator.format_checker is not None:
-        try:
-            validator.format_checker.check(instance, format)
-        except FormatError as error:
-            yield ValidationError(str(error), cause=error.cause)
+    limits = getattr(validator, "limits", None)
+    if limits is not None:
+        limits.check_string(instance)
+
+    format_checker = validator.format_checker
+    if format_checker is None:
+        return
+    # unknown formats are rejected by some checkers, but not counted
+    known = format in format_checker.checkers
+    metrics = getattr(validator, "metrics", None) if known else None
+    try:
+        format_checker.check(instance, format)
+    except FormatError as error:
+        if metrics is not None:
+            metrics.format_checked(format, False)
+        yield ValidationError(str(error), cause=error.cause)
+        return
+    if metrics is not None:
+        metrics.format_checked(format, True)
+    conversions = getattr(validator, "conversions", None)
+    if known and conversions is not None:
+        conversions.convert(instance, format)
+
+
+def maxLength(
+    validator: Validator,
+    mL: int,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if validator.is_type(instance, "string") and string_length(instance) > mL:
+        yield ValidationError(f"{instance!r} is too long")
+
+
+def minLength(
+    validator: Validator,
+    mL: int,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if validator.is_type(instance, "string") and string_length(instance) < mL:
+        yield ValidationError(f"{instance!r} is too short")
+
+
+def enum(
+    validator: Validator,
+    enums: List[Any],
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if instance not in validator.keyword_cache.enum_index(enums):
+        yield ValidationError(f"{instance!r} is not one of {enums!r}")
+
+
+def uniqueItems(
+    validator: Validator,
+    uI: bool,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if uI and validator.is_type(instance, "array") and not unique(instance):
+        yield ValidationError(f"{instance!r} has non-unique elements")
+
+
+def pattern(
+    validator: Validator,
+    patrn: str,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if not validator.is_type(instance, "string"):
+        return
+    limits = getattr(validator, "limits", None)
+    if limits is not None:
+        limits.check_string(instance)
+    if not validator.keyword_cache.regex(patrn).search(instance):
+        yield ValidationError(f"{instance!r} does not match {patrn!r}")
+
+
+def patternProperties(
+    validator: Validator,
+    patternProperties: Mapping[str, Any],
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if not validator.is_type(instance, "object"):
+        return
+
+    limits = getattr(validator, "limits", None)
+    if limits is not None:
+        for k in instance:
+            limits.check_string(k)
+
+    for pattern, subschema in patternProperties.items():
+        regex = validator.keyword_cache.regex(pattern)
+        for k, v in instance.items():
+            if regex.search(k):
+                yield from validator.descend(
+                    v, subschema, path=k, schema_path=pattern
+                )
 
 
 def items(
     validator: Validator,
-    items: Mapping[Hashable, Any],
+    items: Union[Mapping[Hashable, Any], bool],
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+) -> Iterator[ValidationError]:
+    if not validator.is_type(instance, "array"):
+        return
+
+    prefix = 0
+    if "prefixItems" in validator.VALIDATORS:
+        prefix = len(schema.get("prefixItems", []))
+        total = len(instance)
+        if items is False and total > prefix:
+            yield ValidationError(
+                f"Expected at most {prefix} items, but found {total}"
+            )
+            return
+
+    sample = getattr(validator, "_sample", None)
+    elements: Iterable[Tuple[int, Any]]
+    if sample is None:
+        elements = enumerate(instance)
+    else:
+        elements = (
+            (index, instance[index]) for index in sample.sample(instance)
+        )
+    # identical elements are validated once with a result cache,
+    # unless sampled elements depend on their location or
+    # limits track it
+    result_cache = getattr(validator, "result_cache", None)
+    if sample is not None or getattr(validator, "limits", None):
+        result_cache = None
+    for index, item in elements:
+        if index < prefix:
+            continue
+        if result_cache is None:
+            yield from validator.descend(item, items, path=index)
+        else:
+            yield from result_cache.descend(validator, item, items, path=index)
+
+
+def prefixItems(
+    validator: Validator,
+    prefixItems: List[Any],
     instance: Any,
     schema: Mapping[Hashable, Any],
 ) -> Iterator[ValidationError]:
     if not validator.is_type(instance, "array"):
         return
 
-    for index, item in enumerate(instance):
-        yield from validator.descend(item, items, path=index)
+    total = min(len(instance), len(prefixItems))
+    sample = getattr(validator, "_sample", None)
+    if sample is None:
+        indexes: Iterable[int] = range(total)
+    else:
+        indexes = (index for index in sample.sample(instance) if index < total)
+    for index in indexes:
+        yield from validator.descend(
+            instance[index],
+            prefixItems[index],
+            schema_path=index,
+            path=index,
+        )
 
 
 def required(
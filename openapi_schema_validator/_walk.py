@@ -0,0 +1,126 @@
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from jsonschema.exceptions import RefResolutionError
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._utils import array_index
+
+Token = Union[str, int]
+
+
+def locate(document: Any, path: List[str]) -> Tuple[Any, List[Token]]:
+    value = document
+    located: List[Token] = []
+    for token in path:
+        if isinstance(value, list):
+            index = array_index(token)
+            value = value[index]
+            located.append(index)
+        elif isinstance(value, dict):
+            value = value[token]
+            located.append(token)
+        else:
+            raise KeyError(token)
+    return value, located
+
+
+def object_paths(document: Any) -> Dict[int, Tuple[Token, ...]]:
+    """Paths of all objects in document by their identity.
+
+    Objects reachable by more than one path are recorded once.
+    """
+    paths: Dict[int, Tuple[Token, ...]] = {}
+    stack: List[Tuple[Any, Tuple[Token, ...]]] = [(document, ())]
+    while stack:
+        value, path = stack.pop()
+        if isinstance(value, dict):
+            if id(value) in paths:
+                continue
+            paths[id(value)] = path
+            stack.extend(
+                (member, path + (name,)) for name, member in value.items()
+            )
+        elif isinstance(value, list):
+            stack.extend(
+                (item, path + (index,)) for index, item in enumerate(value)
+            )
+    return paths
+
+
+def is_discriminated(schema: Mapping[Hashable, Any], instance: Any) -> bool:
+    return (
+        "discriminator" in schema
+        and isinstance(instance, dict)
+        and any(keyword in schema for keyword in ("allOf", "anyOf", "oneOf"))
+    )
+
+
+def discriminator_ref(
+    validator: Validator, instance: Any, schema: Mapping[Hashable, Any]
+) -> Optional[str]:
+    discriminator = schema["discriminator"]
+    prop_value = instance.get(discriminator["propertyName"])
+    if not prop_value:
+        return None
+    ref = (
+        discriminator.get("mapping", {}).get(prop_value)
+        or f"#/components/schemas/{prop_value}"
+    )
+    if not isinstance(ref, str):
+        return None
+    try:
+        validator.resolver.resolve(ref)
+    except RefResolutionError:
+        return None
+    return ref
+
+
+def property_schemas(
+    validator: Validator, schema: Mapping[Hashable, Any], name: str
+) -> Iterator[Tuple[Any, List[Token]]]:
+    matched = False
+    properties = schema.get("properties", {})
+    if "properties" in validator.VALIDATORS and name in properties:
+        matched = True
+        yield properties[name], ["properties", name]
+    if "patternProperties" in validator.VALIDATORS:
+        for pattern, subschema in schema.get("patternProperties", {}).items():
+            if validator.keyword_cache.regex(pattern).search(name):
+                matched = True
+                yield subschema, ["patternProperties", pattern]
+    additional = schema.get("additionalProperties")
+    if not matched and isinstance(additional, dict):
+        yield additional, ["additionalProperties"]
+
+
+def item_schemas(
+    validator: Validator, schema: Mapping[Hashable, Any], index: int
+) -> Iterator[Tuple[Any, List[Token]]]:
+    prefix = []
+    if "prefixItems" in validator.VALIDATORS:
+        prefix = schema.get("prefixItems", [])
+    if index < len(prefix):
+        yield prefix[index], ["prefixItems", index]
+    elif isinstance(schema.get("items"), dict):
+        yield schema["items"], ["items"]
+
+
+def relocate(
+    errors: Iterable[ValidationError],
+    path: List[Token],
+    schema_path: List[Token],
+) -> Iterator[ValidationError]:
+    for error in errors:
+        error.path.extendleft(reversed(path))
+        error.schema_path.extendleft(reversed(schema_path))
+        yield error
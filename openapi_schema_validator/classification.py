@@ -0,0 +1,300 @@
+from typing import Any
+from typing import Dict
+from typing import FrozenSet
+from typing import Hashable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from jsonschema.exceptions import RefResolutionError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator import _validators as oas_validators
+from openapi_schema_validator._utils import STRING_TYPES
+from openapi_schema_validator._utils import canonical
+
+TYPES = ("null", "boolean", "integer", "number", "string", "array", "object")
+COMPOSITIONS = ("allOf", "oneOf", "anyOf")
+
+
+def _kinds(instance: Any) -> Tuple[str, ...]:
+    # types an instance may have; instances of other Python types
+    # aren't narrowed down
+    if instance is None:
+        return ("null",)
+    if isinstance(instance, bool):
+        return ("boolean",)
+    if isinstance(instance, (int, float)):
+        return ("integer", "number")
+    if isinstance(instance, STRING_TYPES):
+        return ("string",)
+    if isinstance(instance, list):
+        return ("array",)
+    if isinstance(instance, dict):
+        return ("object",)
+    return TYPES
+
+
+class _Signature:
+    """What instances of a schema must be, as far as it's certain.
+
+    Only keywords applying unconditionally are looked at: those of the
+    schema, of local references and of ``allOf`` members.
+    """
+
+    def __init__(self) -> None:
+        self.types: Optional[Set[str]] = None
+        self.required: Set[str] = set()
+        # canonical keys of allowed property values
+        self.constants: Dict[str, FrozenSet[Any]] = {}
+        # allowed discriminator values, as strings
+        self.discriminators: Dict[str, FrozenSet[str]] = {}
+
+    def restrict_types(self, types: Set[str]) -> None:
+        self.types = types if self.types is None else self.types & types
+
+
+class _Analyzer:
+    def __init__(self, validator: Validator):
+        self.validator = validator
+
+    def applies(self, schema: Mapping[str, Any], keyword: str) -> bool:
+        return keyword in schema and self.validator.VALIDATORS.get(
+            keyword
+        ) not in (None, oas_validators.not_implemented)
+
+    def discriminates(self, schema: Mapping[str, Any]) -> bool:
+        # compositions with a discriminator validate the mapped schema
+        # instead of their members
+        return isinstance(schema.get("discriminator"), Mapping) and any(
+            self.applies(schema, keyword) for keyword in COMPOSITIONS
+        )
+
+    def parts(
+        self, schema: Any, refs: FrozenSet[str] = frozenset()
+    ) -> Iterator[Any]:
+        if not isinstance(schema, Mapping):
+            yield schema
+            return
+        # references under an id resolve elsewhere
+        if self.validator.ID_OF(schema):
+            return
+        yield schema
+        if self.applies(schema, "allOf") and not self.discriminates(schema):
+            for member in schema["allOf"]:
+                yield from self.parts(member, refs)
+        if self.applies(schema, "$ref"):
+            ref = schema["$ref"]
+            if not isinstance(ref, str) or not ref.startswith("#"):
+                return
+            if ref in refs:
+                return
+            try:
+                _, resolved = self.validator.resolver.resolve(ref)
+            except RefResolutionError:
+                return
+            yield from self.parts(resolved, refs | {ref})
+
+    def signature(self, schema: Any) -> _Signature:
+        signature = _Signature()
+        for part in self.parts(schema):
+            if part is False:
+                signature.restrict_types(set())
+            if not isinstance(part, Mapping):
+                continue
+            if self.applies(part, "type"):
+                signature.restrict_types(self.types(part))
+            if self.applies(part, "required"):
+                signature.required.update(self.required(part))
+            if self.applies(part, "properties"):
+                for name, subschema in part["properties"].items():
+                    constants = self.constants(subschema)
+                    if constants is None:
+                        continue
+                    if name in signature.constants:
+                        constants &= signature.constants[name]
+                    signature.constants[name] = constants
+            if self.discriminates(part):
+                name = part["discriminator"]["propertyName"]
+                signature.restrict_types({"object"})
+                signature.required.add(name)
+                values = self.discriminator_values(part["discriminator"])
+                if name in signature.discriminators:
+                    values &= signature.discriminators[name]
+                signature.discriminators[name] = values
+        return signature
+
+    def types(self, schema: Mapping[str, Any]) -> Set[str]:
+        types = schema["type"]
+        types = {types} if isinstance(types, str) else set(types)
+        if not types <= set(TYPES):
+            # types of custom type checkers
+            return set(TYPES)
+        if (
+            self.validator.VALIDATORS["type"] is oas_validators.type
+            and schema.get("nullable") is True
+        ):
+            types.add("null")
+        if "number" in types:
+            # every integer is a number too
+            types.add("integer")
+        return types
+
+    def required(self, schema: Mapping[str, Any]) -> Iterator[str]:
+        properties = schema.get("properties", {})
+        skipping = self.validator.VALIDATORS["required"] is (
+            oas_validators.required
+        )
+        read = getattr(self.validator, "read", None)
+        write = getattr(self.validator, "write", None)
+        for name in schema["required"]:
+            subschema = properties.get(name)
+            # properties skipped in the read or write context
+            if (
+                skipping
+                and isinstance(subschema, Mapping)
+                and (
+                    write
+                    and subschema.get("readOnly", False)
+                    or read
+                    and subschema.get("writeOnly", False)
+                )
+            ):
+                continue
+            yield name
+
+    def constants(self, schema: Any) -> Optional[FrozenSet[Any]]:
+        constants: Optional[FrozenSet[Any]] = None
+        for part in self.parts(schema):
+            if not isinstance(part, Mapping):
+                continue
+            for keyword in ("const", "enum"):
+                if not self.applies(part, keyword):
+                    continue
+                values = (
+                    [part["const"]] if keyword == "const" else part["enum"]
+                )
+                try:
+                    keys = frozenset(canonical(value) for value in values)
+                except TypeError:
+                    continue
+                constants = keys if constants is None else constants & keys
+        return constants
+
+    def discriminator_values(
+        self, discriminator: Mapping[str, Any]
+    ) -> FrozenSet[str]:
+        values = {str(value) for value in discriminator.get("mapping", {})}
+        # values without a mapping name component schemas
+        try:
+            _, schemas = self.validator.resolver.resolve(
+                "#/components/schemas"
+            )
+        except RefResolutionError:
+            pass
+        else:
+            if isinstance(schemas, Mapping):
+                values.update(str(name) for name in schemas)
+        return frozenset(values)
+
+
+class SchemaMatcher:
+    """Finds which of many schemas an instance matches.
+
+    Instances are validated only against candidate schemas, found with
+    an index built from what the schemas require of instances: their
+    type, required properties, ``const`` and ``enum`` of properties and
+    discriminator values. Only keywords applying unconditionally are
+    indexed, those of schemas, local references and ``allOf`` members,
+    so candidates are a superset of matches.
+
+    ``validators`` maps keys, such as schema names, to validators of
+    the schemas; matches are returned in its order.
+    """
+
+    def __init__(self, validators: Mapping[Hashable, Validator]):
+        self.keys = list(validators)
+        self.validators = list(validators.values())
+        self._types = dict.fromkeys(TYPES, 0)
+        self._required: Dict[str, int] = {}
+        # per property, the schemas constraining its value and the
+        # schemas allowing each value
+        self._constants: Dict[str, Tuple[int, Dict[Any, int]]] = {}
+        self._discriminators: Dict[str, Tuple[int, Dict[str, int]]] = {}
+        for index, validator in enumerate(self.validators):
+            bit = 1 << index
+            signature = _Analyzer(validator).signature(validator.schema)
+            for type in (
+                signature.types if signature.types is not None else (TYPES)
+            ):
+                self._types[type] |= bit
+            for name in signature.required:
+                self._required[name] = self._required.get(name, 0) | bit
+            self._add(self._constants, signature.constants, bit)
+            self._add(self._discriminators, signature.discriminators, bit)
+
+    def _add(
+        self,
+        index: Dict[str, Tuple[int, Dict[Any, int]]],
+        constraints: Mapping[str, FrozenSet[Any]],
+        bit: int,
+    ) -> None:
+        for name, values in constraints.items():
+            constrained, allowing = index.get(name, (0, {}))
+            for value in values:
+                allowing[value] = allowing.get(value, 0) | bit
+            index[name] = (constrained | bit, allowing)
+
+    def _candidates(self, instance: Any) -> int:
+        candidates = 0
+        for kind in _kinds(instance):
+            candidates |= self._types[kind]
+        if not isinstance(instance, dict):
+            return candidates
+        for name, requiring in self._required.items():
+            if name not in instance:
+                candidates &= ~requiring
+        for name, value in instance.items():
+            if not candidates:
+                break
+            if name in self._constants:
+                constrained, allowing = self._constants[name]
+                try:
+                    key = canonical(value)
+                except TypeError:
+                    pass
+                else:
+                    candidates &= ~constrained | allowing.get(key, 0)
+            if name in self._discriminators:
+                constrained, allowing = self._discriminators[name]
+                candidates &= ~constrained | allowing.get(str(value), 0)
+        return candidates
+
+    def _iter_indexes(self, candidates: int) -> Iterator[int]:
+        while candidates:
+            lowest = candidates & -candidates
+            candidates ^= lowest
+            yield lowest.bit_length() - 1
+
+    def candidates(self, instance: Any) -> List[Hashable]:
+        """Keys of schemas the instance may match."""
+        return [
+            self.keys[index]
+            for index in self._iter_indexes(self._candidates(instance))
+        ]
+
+    def iter_matches(self, instance: Any) -> Iterator[Hashable]:
+        for index in self._iter_indexes(self._candidates(instance)):
+            if self.validators[index].is_valid(instance):
+                yield self.keys[index]
+
+    def matches(self, instance: Any) -> List[Hashable]:
+        """Keys of schemas the instance is valid against."""
+        return list(self.iter_matches(instance))
+
+    def first_match(self, instance: Any) -> Optional[Hashable]:
+        """Key of the first schema the instance is valid against."""
+        return next(self.iter_matches(instance), None)
@@ -0,0 +1,459 @@
+import argparse
+import codecs
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from itertools import islice
+from multiprocessing import Pool
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import TextIO
+from typing import Tuple
+
+from jsonschema.exceptions import RefResolutionError
+from jsonschema.exceptions import SchemaError
+from jsonschema.protocols import Validator
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator._format import oas30_format_checker
+from openapi_schema_validator._format import oas31_format_checker
+from openapi_schema_validator._utils import format_pointer
+from openapi_schema_validator.validators import OAS30Validator
+from openapi_schema_validator.validators import OAS31Validator
+
+try:
+    import yaml
+except ImportError:
+    HAS_YAML = False
+else:
+    HAS_YAML = True
+
+INPUT_FORMATS = ("auto", "json", "array", "ndjson")
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+MIN_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+# bytes of arrays decoded at a time
+READ_SIZE = 64 * 1024
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class CliError(Exception):
+    pass
+
+
+class Task(NamedTuple):
+    """Part of an input file validated by a single worker."""
+
+    path: str
+    input_format: str
+    start: int
+    end: int
+    # number of lines before start
+    line: int
+    max_errors: Optional[int]
+
+
+class TaskResult(NamedTuple):
+    records: int
+    invalid: int
+    size: int
+    errors: List[Dict[str, Any]]
+
+
+def load_spec(path: str) -> Any:
+    with open(path, "rb") as spec_file:
+        content = spec_file.read()
+    if path.endswith((".yaml", ".yml")):
+        if not HAS_YAML:
+            raise CliError("PyYAML is required to load YAML specs")
+        return yaml.safe_load(content)
+    return json.loads(content)
+
+
+def build_validator(
+    spec_path: str, pointer: str, format_check: bool = True
+) -> Validator:
+    """Build validator for the schema at pointer of the spec.
+
+    References are resolved against the spec. OpenAPI 3.0 specs get
+    OAS30Validator, others OAS31Validator.
+    """
+    spec = load_spec(spec_path)
+    resolver = RefResolver("", spec)
+    try:
+        _, schema = resolver.resolve(pointer)
+    except RefResolutionError as exc:
+        raise CliError(f"Schema {pointer!r} not found: {exc}")
+    cls, format_checker = OAS31Validator, oas31_format_checker
+    if isinstance(spec, dict) and str(spec.get("openapi", "")).startswith(
+        "3.0"
+    ):
+        cls, format_checker = OAS30Validator, oas30_format_checker
+    cls.check_schema(schema)
+    return cls(
+        schema,
+        resolver=resolver,
+        format_checker=format_checker if format_check else None,
+    )
+
+
+def detect_format(path: str, content: bytes) -> str:
+    if path.endswith(NDJSON_EXTENSIONS):
+        return "ndjson"
+    if content.lstrip()[:1] == b"[":
+        return "array"
+    return "json"
+
+
+def iter_tasks(
+    paths: Sequence[str],
+    input_format: str,
+    jobs: int,
+    max_errors: Optional[int],
+) -> Iterator[Task]:
+    """Split NDJSON inputs at line boundaries, one task per other input."""
+    for path in paths:
+        size = os.path.getsize(path)
+        if not size:
+            continue
+        with open(path, "rb") as input_file:
+            with mmap.mmap(
+                input_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as content:
+                file_format = input_format
+                if file_format == "auto":
+                    file_format = detect_format(path, content[:4096])
+                if file_format != "ndjson" or jobs == 1:
+                    yield Task(path, file_format, 0, size, 0, max_errors)
+                    continue
+                # errors of a chunk are sent back at once
+                chunk_size = min(
+                    max(MIN_CHUNK_SIZE, size // (jobs * 4)), MAX_CHUNK_SIZE
+                )
+                start, line = 0, 0
+                while start < size:
+                    end = content.find(b"\n", start + chunk_size)
+                    end = size if end == -1 else end + 1
+                    yield Task(path, file_format, start, end, line, max_errors)
+                    line += content[start:end].count(b"\n")
+                    start = end
+
+
+class _Reader:
+    """Text of part of a file, decoded as it's consumed."""
+
+    def __init__(self, content: Any, start: int, end: int):
+        self.content = content
+        self.offset = start
+        self.end = end
+        self.text = ""
+        self.position = 0
+        encoding = json.detect_encoding(content[start : start + 4])
+        self._decode = codecs.getincrementaldecoder(encoding)().decode
+
+    def read(self, size: int) -> bool:
+        """Decode size more bytes, dropping consumed text."""
+        if self.offset >= self.end:
+            return False
+        stop = min(self.offset + size, self.end)
+        decoded = self._decode(
+            self.content[self.offset : stop], final=stop == self.end
+        )
+        self.text = self.text[self.position :] + decoded
+        self.position = 0
+        self.offset = stop
+        return True
+
+    def peek(self) -> str:
+        """Next character that isn't whitespace, empty at the end."""
+        while True:
+            match = WHITESPACE.match(self.text, self.position)
+            assert match is not None
+            self.position = match.end()
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read(READ_SIZE):
+                return ""
+
+    def value(self) -> Any:
+        self.peek()
+        size = READ_SIZE
+        while True:
+            try:
+                value, position = _DECODER.raw_decode(self.text, self.position)
+            except ValueError:
+                if not self.read(size):
+                    raise
+            else:
+                # numbers cut at the end of the text parse as shorter ones
+                if len(self.text) - position > 2 or not self.read(size):
+                    self.position = position
+                    return value
+            size *= 2
+
+
+_DECODER = json.JSONDecoder()
+
+
+def _iter_array(
+    reader: _Reader,
+) -> Iterator[Tuple[Optional[int], Any, Optional[Exception]]]:
+    index = 0
+    reader.position += 1
+    try:
+        if reader.peek() == "]":
+            reader.position += 1
+        else:
+            while True:
+                record = reader.value()
+                yield index, record, None
+                index += 1
+                delimiter = reader.peek()
+                reader.position += 1
+                if delimiter == "]":
+                    break
+                if delimiter != ",":
+                    raise ValueError(
+                        f"Expecting ',' delimiter after record {index - 1}"
+                    )
+        if reader.peek():
+            raise ValueError("Extra data after the array")
+    except ValueError as exc:
+        yield None, None, exc
+
+
+def iter_records(
+    content: Any, task: Task
+) -> Iterator[Tuple[Optional[int], Any, Optional[Exception]]]:
+    """Iterate over records of task with their number and parse error.
+
+    Records of NDJSON are numbered by line, of arrays by index. Arrays
+    are parsed a record at a time.
+    """
+    if task.input_format != "ndjson":
+        reader = _Reader(content, task.start, task.end)
+        if task.input_format == "array" and reader.peek() == "[":
+            yield from _iter_array(reader)
+            return
+        try:
+            # decoded in place, without copying the file's bytes
+            with memoryview(content) as view:
+                encoding = json.detect_encoding(
+                    view[task.start : task.start + 4].tobytes()
+                )
+                text = codecs.decode(view[task.start : task.end], encoding)
+            document = json.loads(text)
+        except ValueError as exc:
+            yield None, None, exc
+            return
+        yield None, document, None
+        return
+
+    start, line = task.start, task.line
+    while start < task.end:
+        end = content.find(b"\n", start, task.end)
+        if end == -1:
+            end = task.end
+        line += 1
+        raw = content[start:end]
+        start = end + 1
+        if not raw.strip():
+            continue
+        try:
+            yield line, json.loads(raw), None
+        except ValueError as exc:
+            yield line, None, exc
+
+
+_validator: Optional[Validator] = None
+
+
+def _init_worker(validator: Validator) -> None:
+    global _validator
+    _validator = validator
+
+
+def iter_results(task: Task) -> Iterator[TaskResult]:
+    """Validate records of task, yielding errors as they are found.
+
+    Results are yielded for every invalid record and once the task is
+    done, with the records validated since the previous result. Only
+    the last result counts the size of the task.
+    """
+    assert _validator is not None
+    records = found = 0
+    with open(task.path, "rb") as input_file:
+        with mmap.mmap(
+            input_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as content:
+            for number, record, exc in iter_records(content, task):
+                if task.max_errors is not None:
+                    remaining = task.max_errors - found
+                    if remaining <= 0:
+                        break
+                records += 1
+                location = {"file": task.path, "record": number}
+                if exc is not None:
+                    found += 1
+                    yield TaskResult(
+                        records,
+                        1,
+                        0,
+                        [
+                            dict(
+                                location,
+                                path="",
+                                message=f"Invalid JSON: {exc}",
+                            )
+                        ],
+                    )
+                    records = 0
+                    continue
+                record_errors = _validator.iter_errors(record)
+                if task.max_errors is not None:
+                    record_errors = islice(record_errors, remaining)
+                errors = [
+                    dict(
+                        location,
+                        path=format_pointer(error.absolute_path),
+                        schema_path=format_pointer(error.absolute_schema_path),
+                        message=error.message,
+                    )
+                    for error in record_errors
+                ]
+                if errors:
+                    found += len(errors)
+                    yield TaskResult(records, 1, 0, errors)
+                    records = 0
+    yield TaskResult(records, 0, task.end - task.start, [])
+
+
+def validate_task(task: Task) -> TaskResult:
+    records = invalid = 0
+    errors: List[Dict[str, Any]] = []
+    for result in iter_results(task):
+        records += result.records
+        invalid += result.invalid
+        errors.extend(result.errors)
+    return TaskResult(records, invalid, task.end - task.start, errors)
+
+
+def validate(args: argparse.Namespace, out: TextIO, err: TextIO) -> int:
+    max_errors = 1 if args.fail_fast else args.max_errors
+    started = time.perf_counter()
+    tasks = list(
+        iter_tasks(args.files, args.input_format, args.jobs, max_errors)
+    )
+    validator = build_validator(
+        args.spec, args.schema, not args.no_format_check
+    )
+    _init_worker(validator)
+
+    records = invalid = size = written = 0
+    pool = None
+    if args.jobs > 1:
+        # workers get the validator ready, the spec isn't loaded again
+        pool = Pool(args.jobs, _init_worker, (validator,))
+        results: Iterator[TaskResult] = pool.imap(validate_task, tasks)
+    else:
+        results = (result for task in tasks for result in iter_results(task))
+    try:
+        for result in results:
+            records += result.records
+            invalid += result.invalid
+            size += result.size
+            errors = result.errors
+            if max_errors is not None:
+                errors = errors[: max_errors - written]
+            for error in errors:
+                out.write(json.dumps(error) + "\n")
+            written += len(errors)
+            if max_errors is not None and written >= max_errors:
+                break
+            # once per task
+            if result.size:
+                out.flush()
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    err.write(
+        f"{records} records ({invalid} invalid, {written} errors) "
+        f"in {elapsed:.2f}s: {records / elapsed:.0f} records/s, "
+        f"{size / elapsed / 1e6:.1f} MB/s\n"
+    )
+    return 1 if invalid else 0
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="openapi-schema-validator")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser(
+        "validate",
+        help="validate JSON documents against a schema of an OpenAPI spec",
+    )
+    command.add_argument("--spec", required=True, help="JSON or YAML spec")
+    command.add_argument(
+        "--schema",
+        default="#",
+        help="reference to the schema in spec, e.g. #/components/schemas/Pet",
+    )
+    command.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default="auto",
+        help=(
+            "json for one document per file, array for an array of "
+            "records, ndjson for one record per line; auto detects ndjson "
+            "from .ndjson and .jsonl extensions and array from a leading ["
+        ),
+    )
+    command.add_argument(
+        "--jobs", type=int, default=1, help="number of worker processes"
+    )
+    command.add_argument(
+        "--max-errors", type=int, help="stop after writing this many errors"
+    )
+    command.add_argument(
+        "--fail-fast", action="store_true", help="stop at the first error"
+    )
+    command.add_argument(
+        "--no-format-check", action="store_true", help="don't check formats"
+    )
+    command.add_argument("files", nargs="+", help="files to validate")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be a positive integer")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Validate files and write errors as JSON lines.
+
+    Returns 0 if all records are valid, 1 if any is not and 2 if the
+    spec or the files can't be read.
+    """
+    args = parse_args(argv)
+    try:
+        return validate(args, sys.stdout, sys.stderr)
+    except (CliError, OSError, ValueError) as exc:
+        sys.stderr.write(f"openapi-schema-validator: {exc}\n")
+        return 2
+    except SchemaError as exc:
+        sys.stderr.write(f"openapi-schema-validator: {exc.message}\n")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+from itertools import repeat
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
+from jsonschema import _legacy_validators
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._format import INT32_MAX
+from openapi_schema_validator._format import INT32_MIN
+from openapi_schema_validator._format import INT64_MAX
+from openapi_schema_validator._format import INT64_MIN
+from openapi_schema_validator._format import OASFormatChecker
+from openapi_schema_validator._format import is_double
+from openapi_schema_validator._format import is_float
+from openapi_schema_validator._format import is_int32
+from openapi_schema_validator._format import is_int64
+from openapi_schema_validator._format import is_password
+from openapi_schema_validator.validators import OAS31Validator
+
+try:
+    import numpy as np
+except ImportError:
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
+# kinds of cell values, by exact Python type
+MISSING, NONE, BOOL, INT, FLOAT, STR, OTHER = range(7)
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+KINDS = {
+    _Missing: MISSING,
+    type(None): NONE,
+    bool: BOOL,
+    int: INT,
+    float: FLOAT,
+    str: STR,
+}
+# values a kind is probed with to find out if the type keyword accepts it
+REPRESENTATIVES = {
+    NONE: (None,),
+    BOOL: (True, False),
+    INT: (1,),
+    FLOAT: (1.0, 1.5),
+    STR: ("a",),
+}
+# integers float64 holds exactly
+MAX_SAFE_INTEGER = 2**53
+
+ANNOTATION_KEYWORDS = frozenset(
+    ["default", "deprecated", "description", "example", "examples"]
+    + ["externalDocs", "title", "xml"]
+)
+COLUMN_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "enum",
+    "exclusiveMaximum",
+    "exclusiveMinimum",
+    "format",
+    "maxLength",
+    "maximum",
+    "minLength",
+    "minimum",
+    "multipleOf",
+    "nullable",
+    "type",
+}
+RECORD_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "additionalProperties",
+    "nullable",
+    "properties",
+    "required",
+    "type",
+}
+FORMATS = {
+    "int32": (is_int32, INT32_MIN, INT32_MAX),
+    "int64": (is_int64, INT64_MIN, INT64_MAX),
+    "float": (is_float, None, None),
+    "double": (is_double, None, None),
+    "password": (is_password, None, None),
+}
+
+
+class _Column:
+    """Vectorized checks of a single property schema."""
+
+    def __init__(
+        self,
+        validator: Validator,
+        name: str,
+        schema: Mapping[Hashable, Any],
+    ):
+        self.name = name
+        self.schema = schema
+        self.vectorized = self._is_vectorizable(validator, schema)
+        if not self.vectorized:
+            return
+
+        type_schema = {
+            keyword: schema[keyword]
+            for keyword in ("type", "nullable")
+            if keyword in schema
+        }
+        type_validator = validator.evolve(schema=type_schema)
+        self.bad_kinds = [MISSING, OTHER] + [
+            kind
+            for kind, values in REPRESENTATIVES.items()
+            if not all(type_validator.is_valid(value) for value in values)
+        ]
+
+        self.bounds: List[Tuple[Any, bool, bool]] = []
+        legacy = (
+            validator.VALIDATORS.get("minimum")
+            is _legacy_validators.minimum_draft3_draft4
+        )
+        if "minimum" in schema:
+            exclusive = legacy and bool(schema.get("exclusiveMinimum"))
+            self.bounds.append((schema["minimum"], True, exclusive))
+        if "maximum" in schema:
+            exclusive = legacy and bool(schema.get("exclusiveMaximum"))
+            self.bounds.append((schema["maximum"], False, exclusive))
+        if not legacy and "exclusiveMinimum" in schema:
+            self.bounds.append((schema["exclusiveMinimum"], True, True))
+        if not legacy and "exclusiveMaximum" in schema:
+            self.bounds.append((schema["exclusiveMaximum"], False, True))
+
+        self.multiple_of = schema.get("multipleOf")
+        self.min_length = schema.get("minLength")
+        self.max_length = schema.get("maxLength")
+
+        self.format = None
+        if "format" in schema and validator.format_checker is not None:
+            self.format = schema["format"]
+
+        self.enum: Optional[Tuple[Any, Any, List[Any]]] = None
+        if "enum" in schema:
+            numbers = [
+                each
+                for each in schema["enum"]
+                if isinstance(each, (int, float))
+                and not isinstance(each, bool)
+                and abs(each) < MAX_SAFE_INTEGER
+            ]
+            strings = [
+                each for each in schema["enum"] if isinstance(each, str)
+            ]
+            singletons = [
+                singleton
+                for singleton in (None, True, False)
+                if any(each is singleton for each in schema["enum"])
+            ]
+            self.enum = (
+                np.array(numbers, dtype=np.float64),
+                frozenset(strings),
+                singletons,
+            )
+
+        self.numeric = bool(
+            self.bounds
+            or self.multiple_of is not None
+            or self.enum is not None
+            or self.format in ("int32", "int64")
+        )
+
+    @staticmethod
+    def _is_vectorizable(
+        validator: Validator, schema: Mapping[Hashable, Any]
+    ) -> bool:
+        if not isinstance(schema, dict) or not COLUMN_KEYWORDS.issuperset(
+            schema
+        ):
+            return False
+        if not all(
+            isinstance(schema.get(keyword, 0), (int, float))
+            and not isinstance(schema.get(keyword), bool)
+            for keyword in ("maximum", "minimum", "multipleOf")
+        ):
+            return False
+        if any(
+            isinstance(schema.get(keyword), (int, float))
+            and abs(schema[keyword]) >= MAX_SAFE_INTEGER
+            for keyword in (
+                "maximum",
+                "minimum",
+                "exclusiveMaximum",
+                "exclusiveMinimum",
+                "multipleOf",
+            )
+        ):
+            return False
+        if "format" in schema and validator.format_checker is not None:
+            format_checker = validator.format_checker
+            format = schema["format"]
+            if (
+                not isinstance(format_checker, OASFormatChecker)
+                or format not in FORMATS
+                or format_checker.checkers.get(format, (None,))[0]
+                is not FORMATS[format][0]
+            ):
+                return False
+        return True
+
+    def bad(self, values: List[Any]) -> "np.ndarray":
+        """Mask of cells that may be invalid.
+
+        The mask is conservative: cells it doesn't flag are valid, cells
+        it flags still need to be checked one by one.
+        """
+        count = len(values)
+        kinds = np.fromiter(
+            map(KINDS.get, map(type, values), repeat(OTHER)),
+            dtype=np.int8,
+            count=count,
+        )
+        bad = np.isin(kinds, self.bad_kinds)
+        cells = np.fromiter(values, dtype=object, count=count)
+        ints = kinds == INT
+        numeric = ints | (kinds == FLOAT)
+        strings = kinds == STR
+        numbers = np.zeros(count, dtype=np.float64)
+
+        if self.numeric and numeric.any():
+            try:
+                numbers[numeric] = cells[numeric].astype(np.float64)
+            except OverflowError:
+                bad |= numeric
+                numeric = np.zeros(count, dtype=bool)
+            bad |= ints & (np.abs(numbers) >= MAX_SAFE_INTEGER)
+            bad |= numeric & self._numbers_bad(numbers, ints)
+
+        if strings.any() and (
+            self.min_length is not None or self.max_length is not None
+        ):
+            lengths = np.zeros(count, dtype=np.int64)
+            lengths[strings] = np.fromiter(
+                map(len, cells[strings]),
+                dtype=np.int64,
+                count=int(strings.sum()),
+            )
+            if self.min_length is not None:
+                bad |= strings & (lengths < self.min_length)
+            if self.max_length is not None:
+                bad |= strings & (lengths > self.max_length)
+
+        if self.enum is not None:
+            enum_numbers, enum_strings, singletons = self.enum
+            if numeric.any():
+                bad[numeric] |= ~np.isin(numbers[numeric], enum_numbers)
+            if strings.any():
+                # numpy strings drop trailing NULs, so cells are looked
+                # up as Python strings
+                bad[strings] |= ~np.fromiter(
+                    (cell in enum_strings for cell in cells[strings]),
+                    dtype=bool,
+                    count=int(strings.sum()),
+                )
+            if None not in singletons:
+                bad |= kinds == NONE
+            for singleton in (True, False):
+                if singleton not in singletons:
+                    bad |= (kinds == BOOL) & (cells == singleton)
+
+        if self.format is not None:
+            _, minimum, maximum = FORMATS[self.format]
+            if minimum is not None and maximum is not None:
+                bad |= ~np.isin(kinds, [MISSING, NONE, BOOL, INT])
+                bad |= ints & ((numbers < minimum) | (numbers > maximum))
+            elif self.format != "password":
+                bad |= ~np.isin(kinds, [MISSING, NONE, FLOAT])
+
+        bad &= kinds != MISSING
+        return bad
+
+    def _numbers_bad(
+        self, numbers: "np.ndarray", ints: "np.ndarray"
+    ) -> "np.ndarray":
+        bad = np.zeros(len(numbers), dtype=bool)
+        for bound, lower, exclusive in self.bounds:
+            if lower:
+                bad |= numbers <= bound if exclusive else numbers < bound
+            else:
+                bad |= numbers >= bound if exclusive else numbers > bound
+
+        multiple_of = self.multiple_of
+        if multiple_of is not None:
+            with np.errstate(all="ignore"):
+                if isinstance(multiple_of, float):
+                    quotient = numbers / multiple_of
+                    bad |= ~np.isfinite(quotient)
+                    bad |= np.trunc(quotient) != quotient
+                else:
+                    bad |= ints & (numbers.astype(np.int64) % multiple_of != 0)
+                    bad |= ~ints & (np.fmod(numbers, multiple_of) != 0)
+        return bad
+
+
+class ColumnarValidator:
+    """Validates batches of flat records against a single object schema.
+
+    Each property is converted to a column and checked with vectorized
+    NumPy operations. Only cells and records flagged by those checks
+    are validated one by one, so reported errors are the same as those
+    of the underlying validator. Error paths start with the record index.
+
+    Property schemas with keywords other than type, nullable, format,
+    enum, numeric and string length constraints are validated cell by
+    cell. Record schemas with keywords other than type, properties,
+    required and additionalProperties are validated record by record.
+    """
+
+    def __init__(
+        self,
+        schema: Mapping[Hashable, Any],
+        cls: Type[Validator] = OAS31Validator,
+        *args: Any,
+        **kwargs: Any,
+    ):
+        if not HAS_NUMPY:
+            raise ImportError("ColumnarValidator requires numpy")
+
+        self.schema = schema
+        self.validator = cls(schema, *args, **kwargs)
+        self.columns: Optional[List[_Column]] = None
+        if isinstance(schema, dict) and RECORD_KEYWORDS.issuperset(schema):
+            properties = schema.get("properties", {})
+            self.columns = [
+                _Column(self.validator, name, subschema)
+                for name, subschema in properties.items()
+            ]
+
+    def iter_errors(self, records: Sequence[Any]) -> Iterator[ValidationError]:
+        if self.columns is None:
+            for index, record in enumerate(records):
+                yield from self._record_errors(index, record)
+            return
+
+        count = len(records)
+        rows = [record if type(record) is dict else {} for record in records]
+        records_bad = np.fromiter(
+            (type(record) is not dict for record in records),
+            dtype=bool,
+            count=count,
+        )
+        for name in self.schema.get("required", ()):
+            records_bad |= ~np.fromiter(
+                map(dict.__contains__, rows, repeat(name)),
+                dtype=bool,
+                count=count,
+            )
+        if self.schema.get("additionalProperties", True) is not True:
+            known = frozenset(self.schema.get("properties", {}))
+            records_bad |= ~np.fromiter(
+                map(known.issuperset, rows), dtype=bool, count=count
+            )
+
+        cells: Dict[int, List[_Column]] = {}
+        for column in self.columns:
+            values = [row.get(column.name, _MISSING) for row in rows]
+            if column.vectorized:
+                bad = column.bad(values)
+            else:
+                bad = np.fromiter(
+                    (value is not _MISSING for value in values),
+                    dtype=bool,
+                    count=count,
+                )
+            for index in np.flatnonzero(bad & ~records_bad).tolist():
+                cells.setdefault(index, []).append(column)
+
+        flagged = set(np.flatnonzero(records_bad).tolist()) | set(cells)
+        for index in sorted(flagged):
+            if records_bad[index]:
+                yield from self._record_errors(index, records[index])
+                continue
+            for column in cells[index]:
+                yield from self._cell_errors(index, records[index], column)
+
+    def is_valid(self, records: Sequence[Any]) -> bool:
+        error = next(self.iter_errors(records), None)
+        return error is None
+
+    def _record_errors(
+        self, index: int, record: Any
+    ) -> Iterator[ValidationError]:
+        for error in self.validator.iter_errors(record):
+            error.path.appendleft(index)
+            yield error
+
+    def _cell_errors(
+        self, index: int, record: Any, column: _Column
+    ) -> Iterator[ValidationError]:
+        for error in self.validator.descend(
+            record[column.name],
+            column.schema,
+            path=column.name,
+            schema_path=column.name,
+        ):
+            error.schema_path.appendleft("properties")
+            error.path.appendleft(index)
+            yield error
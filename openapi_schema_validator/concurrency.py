@@ -0,0 +1,90 @@
+import threading
+from copy import copy
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterator
+from typing import Mapping
+from typing import Type
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator.validators import OAS31Validator
+
+
+def _thread_resolver(resolver: RefResolver) -> RefResolver:
+    """Copy resolver with its own scope stack.
+
+    The store and the URL caches are shared, so documents resolved
+    by any thread are available to all of them.
+    """
+    thread_resolver = copy(resolver)
+    thread_resolver._scopes_stack = resolver._scopes_stack[:1]
+    return thread_resolver
+
+
+class ThreadSafeValidator:
+    """Validator that can be shared between threads.
+
+    Validators keep reference resolution scope in a mutable stack on
+    their resolver, so concurrent validations with one validator can
+    resolve references against a wrong scope. Each thread validates
+    with its own validator, created on first use from a prototype.
+    Schema, format checker, read/write context and keyword cache are
+    shared, so the per thread copy is cheap.
+
+    Patterns are compiled when the prototype is built, but enum indexes
+    and patterns of schemas reached through remote references are added
+    to the keyword cache while validating. Each entry is built first and
+    then stored with a single dictionary assignment, so threads never
+    see a partial entry; at worst two threads build the same entry and
+    one of them is kept.
+
+    Errors are iterated lazily; consume them on the thread that
+    requested them.
+    """
+
+    def __init__(
+        self,
+        schema: Mapping[Hashable, Any],
+        cls: Type[Validator] = OAS31Validator,
+        *args: Any,
+        **kwargs: Any,
+    ):
+        self.schema = schema
+        self.cls = cls
+        self._prototype = cls(schema, *args, **kwargs)
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def validator(self) -> Validator:
+        """Validator of the current thread."""
+        try:
+            validator: Validator = self._local.validator
+        except AttributeError:
+            validator = self._local.validator = self._prototype.evolve(
+                resolver=_thread_resolver(self._prototype.resolver)
+            )
+        return validator
+
+    def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        errors: Iterator[ValidationError]
+        errors = self.validator.iter_errors(instance)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        return bool(self.validator.is_valid(instance))
+
+    def validate(self, instance: Any) -> None:
+        self.validator.validate(instance)
@@ -0,0 +1,634 @@
+import string
+from base64 import b64encode
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from math import ceil
+from math import floor
+from random import Random
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from uuid import UUID
+
+from jsonschema.exceptions import RefResolutionError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._format import INT32_MAX
+from openapi_schema_validator._format import INT32_MIN
+from openapi_schema_validator._format import INT64_MAX
+from openapi_schema_validator._format import INT64_MIN
+
+try:
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+TYPES = ("object", "array", "string", "integer", "number", "boolean")
+# values of a type, to put where it isn't allowed
+SAMPLES: Dict[str, Any] = {
+    "null": None,
+    "boolean": True,
+    "integer": 7,
+    "number": 1.5,
+    "string": "text",
+    "array": [],
+    "object": {},
+}
+ALPHABET = string.ascii_letters + string.digits
+# characters of escapes like \d in patterns
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: string.digits,
+    sre_constants.CATEGORY_SPACE: " ",
+    sre_constants.CATEGORY_WORD: ALPHABET + "_",
+}
+# repeats of unbounded quantifiers beyond their minimum
+MAX_REPEAT = 8
+REPEATS = tuple(
+    getattr(sre_constants, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_constants, name)
+)
+GROUPS = tuple(
+    getattr(sre_constants, name)
+    for name in ("SUBPATTERN", "ATOMIC_GROUP")
+    if hasattr(sre_constants, name)
+)
+EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# object or array holding a generated value, its key there and the
+# schema it was generated from
+Site = Tuple[Any, Any, Dict[str, Any]]
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, dict):
+        return 1 + sum(_size(member) for member in value.values())
+    if isinstance(value, list):
+        return 1 + sum(_size(item) for item in value)
+    return 1
+
+
+class PayloadGenerator:
+    """Generates instances of the schema of a validator.
+
+    ``valid`` returns instances the validator accepts, ``invalid`` ones
+    it rejects, made by breaking one keyword of a valid instance: a
+    type, a bound, a format, a required or unexpected property and so
+    on. Generation follows types, ``nullable``, the formats of
+    ``OASFormatChecker``, ``enum``, ``pattern``, size keywords,
+    references, compositions and discriminator mappings, and leaves
+    out ``readOnly`` properties in the validator's write context and
+    ``writeOnly`` ones in its read context. Every instance is checked
+    with the validator, so keywords that aren't followed, like ``not``,
+    are met by retrying.
+
+    ``size`` is the number of values instances aim for, which sets the
+    length of arrays and how many optional properties are included;
+    nesting stops at ``max_depth``. The same ``seed`` generates the
+    same instances.
+    """
+
+    def __init__(
+        self,
+        validator: Validator,
+        seed: Optional[int] = None,
+        size: int = 10,
+        max_depth: int = 8,
+        attempts: int = 100,
+    ):
+        if size < 1:
+            raise ValueError("size must be positive")
+        self.validator = validator
+        self.seed = seed
+        self.size = size
+        self.max_depth = max_depth
+        self.attempts = attempts
+        self._random = Random(seed)
+        self._sites: List[Site] = []
+
+    def valid(self) -> Any:
+        """Instance the validator accepts.
+
+        Raises ValueError if none was found in ``attempts`` tries.
+        """
+        for _ in range(self.attempts):
+            (instance,) = self._instance()
+            if self.validator.is_valid(instance):
+                return instance
+        raise ValueError("no valid instance found")
+
+    def invalid(self) -> Any:
+        """Instance the validator rejects.
+
+        Raises ValueError if none was found in ``attempts`` tries.
+        """
+        for _ in range(self.attempts):
+            root = self._instance()
+            parent, key, schema = self._random.choice(self._sites)
+            violations = self._violations(schema, parent[key])
+            if not violations:
+                continue
+            parent[key] = self._random.choice(violations)(parent[key])
+            if not self.validator.is_valid(root[0]):
+                return root[0]
+        raise ValueError("no invalid instance found")
+
+    def _instance(self) -> List[Any]:
+        self._sites = []
+        root: List[Any] = []
+        root.append(self._value(self.validator.schema, 0, self.size, root, 0))
+        return root
+
+    # schemas
+
+    def _resolve(self, ref: str) -> Any:
+        try:
+            _, resolved = self.validator.resolver.resolve(ref)
+        except RefResolutionError:
+            return {}
+        return resolved
+
+    def _effective(self, schema: Any, depth: int = 0) -> Dict[str, Any]:
+        # schema with references and allOf merged in
+        if not isinstance(schema, Mapping) or depth > 32:
+            return {}
+        effective = {
+            keyword: value
+            for keyword, value in schema.items()
+            if keyword not in ("$ref", "allOf")
+        }
+        if isinstance(schema.get("$ref"), str):
+            target = self._effective(self._resolve(schema["$ref"]), depth + 1)
+            effective = self._combine(effective, target)
+        for member in schema.get("allOf", ()):
+            effective = self._combine(
+                effective, self._effective(member, depth + 1)
+            )
+        return effective
+
+    def _combine(
+        self, first: Dict[str, Any], second: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        combined = dict(first)
+        for keyword, value in second.items():
+            if keyword not in combined:
+                combined[keyword] = value
+            elif keyword == "properties":
+                properties = dict(combined[keyword])
+                for name, subschema in value.items():
+                    if name in properties:
+                        subschema = {"allOf": [properties[name], subschema]}
+                    properties[name] = subschema
+                combined[keyword] = properties
+            elif keyword == "required":
+                combined[keyword] = list(combined[keyword]) + [
+                    name for name in value if name not in combined[keyword]
+                ]
+            elif keyword == "type":
+                types = [
+                    type
+                    for type in self._listed(combined[keyword])
+                    if type in self._listed(value)
+                ]
+                combined[keyword] = types[0] if len(types) == 1 else types
+            elif keyword == "enum":
+                combined[keyword] = [
+                    item for item in combined[keyword] if item in value
+                ]
+            elif keyword in ("minimum", "minLength", "minItems"):
+                combined[keyword] = max(combined[keyword], value)
+            elif keyword in ("maximum", "maxLength", "maxItems"):
+                combined[keyword] = min(combined[keyword], value)
+            elif keyword in ("readOnly", "writeOnly"):
+                combined[keyword] = combined[keyword] or value
+            elif keyword == "additionalProperties" and value is False:
+                combined[keyword] = value
+        if "type" in first and "type" in second:
+            # null is accepted only if every typed schema accepts it
+            combined["nullable"] = first.get("nullable") is True and (
+                second.get("nullable") is True
+            )
+        return combined
+
+    def _listed(self, types: Any) -> List[str]:
+        return [types] if isinstance(types, str) else list(types)
+
+    def _types(self, schema: Mapping[str, Any]) -> List[str]:
+        if "type" in schema:
+            types = self._listed(schema["type"])
+            if schema.get("nullable") is True and "null" not in types:
+                types.append("null")
+            return types
+        for type, keywords in (
+            ("object", ("properties", "required", "additionalProperties")),
+            ("array", ("items", "prefixItems", "minItems", "maxItems")),
+            ("string", ("pattern", "format", "minLength", "maxLength")),
+            ("number", ("minimum", "maximum", "multipleOf")),
+        ):
+            if any(keyword in schema for keyword in keywords):
+                return [type]
+        return list(TYPES)
+
+    # valid values
+
+    def _value(
+        self, schema: Any, depth: int, budget: int, parent: Any, key: Any
+    ) -> Any:
+        # value of schema, of about budget values, for parent[key]
+        effective = self._effective(schema)
+        discriminated = None
+        for keyword in ("oneOf", "anyOf"):
+            branches = effective.pop(keyword, None)
+            if branches:
+                branch, discriminated = self._branch(effective, branches)
+                effective = self._combine(effective, self._effective(branch))
+        value = self._generate(effective, depth, budget)
+        if discriminated is not None and isinstance(value, dict):
+            name, mapped = discriminated
+            value[name] = mapped
+        self._sites.append((parent, key, effective))
+        return value
+
+    def _branch(
+        self, schema: Mapping[str, Any], branches: List[Any]
+    ) -> Tuple[Any, Optional[Tuple[str, str]]]:
+        discriminator = schema.get("discriminator")
+        if not isinstance(discriminator, Mapping):
+            return self._random.choice(branches), None
+        name = discriminator["propertyName"]
+        mapping = dict(discriminator.get("mapping", {}))
+        for branch in branches:
+            ref = branch.get("$ref") if isinstance(branch, Mapping) else None
+            if isinstance(ref, str) and ref not in mapping.values():
+                # implicit mappings are by component name
+                mapping[ref.rsplit("/", 1)[-1]] = ref
+        value = self._random.choice(sorted(mapping))
+        return {"$ref": mapping[value]}, (name, value)
+
+    def _generate(
+        self, schema: Dict[str, Any], depth: int, budget: int
+    ) -> Any:
+        if "const" in schema:
+            return schema["const"]
+        if schema.get("enum"):
+            return self._random.choice(schema["enum"])
+        types = self._types(schema)
+        if "null" in types and (
+            len(types) == 1 or self._random.random() < 0.1
+        ):
+            return None
+        if "null" in types and depth >= self.max_depth:
+            return None
+        types = [type for type in types if type != "null"] or list(TYPES)
+        if depth >= self.max_depth:
+            # containers would nest deeper
+            types = [
+                type for type in types if type not in ("object", "array")
+            ] or types
+        type = self._random.choice(types)
+        if type == "object":
+            return self._object(schema, depth, budget)
+        if type == "array":
+            return self._array(schema, depth, budget)
+        if type == "string":
+            return self._string(schema)
+        if type in ("integer", "number"):
+            return self._number(schema, type == "integer")
+        return self._random.random() < 0.5
+
+    def _skipped(self, schema: Any) -> bool:
+        # properties left out in the validator's context; required
+        # looks at the property schema only, not at what it references
+        if not isinstance(schema, Mapping):
+            return False
+        return bool(
+            getattr(self.validator, "write", None)
+            and schema.get("readOnly")
+            or getattr(self.validator, "read", None)
+            and schema.get("writeOnly")
+        )
+
+    def _object(
+        self, schema: Mapping[str, Any], depth: int, budget: int
+    ) -> Dict[str, Any]:
+        properties = schema.get("properties", {})
+        required = [
+            name
+            for name in schema.get("required", [])
+            if not self._skipped(properties.get(name))
+        ]
+        optional = [
+            name
+            for name in properties
+            if name not in schema.get("required", [])
+            and not self._skipped(self._effective(properties[name]))
+        ]
+        self._random.shuffle(optional)
+        count = len(required)
+        if depth < self.max_depth:
+            count += min(len(optional), max(0, budget - 1 - count))
+            count = self._random.randint(len(required), count)
+        count = max(count, schema.get("minProperties", 0))
+        if "maxProperties" in schema:
+            count = max(len(required), min(count, schema["maxProperties"]))
+        names = required + optional[: count - len(required)]
+        additional = schema.get("additionalProperties", True)
+        while len(names) < count and additional is not False:
+            names.append(f"property{len(names)}")
+        share = max(1, (budget - 1) // max(1, len(names)))
+        value: Dict[str, Any] = {}
+        for name in names:
+            subschema = properties.get(name, additional)
+            value[name] = self._value(subschema, depth + 1, share, value, name)
+        return value
+
+    def _array(
+        self, schema: Mapping[str, Any], depth: int, budget: int
+    ) -> List[Any]:
+        prefix = []
+        items = schema.get("items", {})
+        if "prefixItems" in self.validator.VALIDATORS:
+            prefix = list(schema.get("prefixItems", []))
+        elif isinstance(items, list):
+            prefix, items = items, schema.get("additionalItems", {})
+        low = schema.get("minItems", 0)
+        high = schema.get("maxItems", 2**31)
+        if items is False:
+            high = min(high, len(prefix))
+        value: List[Any] = []
+        count = low
+        if depth < self.max_depth and high > 0:
+            # length is set from the size of the first item
+            self._item(schema, prefix, items, depth, budget - 1, value)
+            count = max(1, (budget - 1) // _size(value[0]))
+            count = self._random.randint(ceil(count / 2), count)
+        count = max(low, min(count, high))
+        share = max(1, (budget - 1) // max(1, count))
+        while len(value) < count:
+            self._item(schema, prefix, items, depth, share, value)
+        return value
+
+    def _item(
+        self,
+        schema: Mapping[str, Any],
+        prefix: List[Any],
+        items: Any,
+        depth: int,
+        budget: int,
+        value: List[Any],
+    ) -> None:
+        index = len(value)
+        subschema = prefix[index] if index < len(prefix) else items
+        sites = len(self._sites)
+        for _ in range(self.attempts):
+            item = self._value(subschema, depth + 1, budget, value, index)
+            if not schema.get("uniqueItems") or item not in value:
+                break
+            del self._sites[sites:]
+        value.append(item)
+
+    def _number(self, schema: Mapping[str, Any], integer: bool) -> Any:
+        low, high = schema.get("minimum"), schema.get("maximum")
+        low_open = schema.get("exclusiveMinimum")
+        high_open = schema.get("exclusiveMaximum")
+        # exclusive bounds are flags in OAS 3.0 and numbers in 3.1
+        if not isinstance(low_open, bool) and low_open is not None:
+            low, low_open = low_open, True
+        if not isinstance(high_open, bool) and high_open is not None:
+            high, high_open = high_open, True
+        format = schema.get("format")
+        if format in ("int32", "int64"):
+            integer = True
+            bounds = (
+                (INT32_MIN, INT32_MAX)
+                if format == "int32"
+                else (INT64_MIN, INT64_MAX)
+            )
+            low = bounds[0] if low is None else max(low, bounds[0])
+            high = bounds[1] if high is None else min(high, bounds[1])
+        if low is None:
+            low = 0 if high is None or high > 0 else high - 1000
+        if high is None:
+            high = low + 1000
+        multiple = schema.get("multipleOf")
+        if integer or multiple is not None:
+            step = multiple or 1
+            first = ceil(low / step) + (
+                1 if low_open and low % step == 0 else 0
+            )
+            last = floor(high / step) - (
+                1 if high_open and high % step == 0 else 0
+            )
+            value = self._random.randint(first, max(first, last)) * step
+            if not integer and format in ("float", "double"):
+                return float(value)
+            return int(value) if integer else value
+        number = low + (high - low) * self._random.random()
+        if low_open and number == low or high_open and number == high:
+            number = (low + high) / 2
+        return float(number)
+
+    def _string(self, schema: Mapping[str, Any]) -> Any:
+        format = schema.get("format")
+        generate = FORMATS.get(format) if isinstance(format, str) else None
+        if generate is not None:
+            value = generate(self._random)
+            if format == "binary" and not self.validator.is_type(
+                value, "string"
+            ):
+                return value.decode("latin-1")
+            return value
+        low = schema.get("minLength", 0)
+        high = schema.get("maxLength", max(low, 10))
+        if isinstance(schema.get("pattern"), str):
+            for _ in range(self.attempts):
+                value = self._pattern(schema["pattern"])
+                if low <= len(value) <= high:
+                    return value
+            return value
+        length = self._random.randint(low, max(low, min(high, low + 10)))
+        return "".join(self._random.choice(ALPHABET) for _ in range(length))
+
+    def _pattern(self, pattern: str) -> str:
+        # a string matched by pattern; lookarounds are left to retries
+        groups: Dict[int, str] = {}
+        return self._items(sre_parse.parse(pattern), groups)
+
+    def _items(self, items: Any, groups: Dict[int, str]) -> str:
+        random = self._random
+        chars = []
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                chars.append(chr(av))
+            elif op is sre_constants.NOT_LITERAL:
+                chars.append(
+                    random.choice(ALPHABET.replace(chr(av), "") or "_")
+                )
+            elif op is sre_constants.ANY:
+                chars.append(random.choice(ALPHABET))
+            elif op is sre_constants.IN:
+                chars.append(self._charset(av))
+            elif op is sre_constants.BRANCH:
+                chars.append(self._items(random.choice(av[1]), groups))
+            elif op in GROUPS:
+                group, body = av[0], av[-1]
+                text = self._items(body, groups)
+                if group is not None:
+                    groups[group] = text
+                chars.append(text)
+            elif op in REPEATS:
+                low, high, body = av
+                if high is sre_constants.MAXREPEAT:
+                    high = low + MAX_REPEAT
+                for _ in range(random.randint(low, high)):
+                    chars.append(self._items(body, groups))
+            elif op is sre_constants.GROUPREF:
+                chars.append(groups.get(av, ""))
+        return "".join(chars)
+
+    def _charset(self, members: Any) -> str:
+        negate = False
+        choices: List[str] = []
+        for op, av in members:
+            if op is sre_constants.NEGATE:
+                negate = True
+            elif op is sre_constants.LITERAL:
+                choices.append(chr(av))
+            elif op is sre_constants.RANGE:
+                low, high = av
+                choices.extend(
+                    chr(code) for code in range(low, min(high, low + 256) + 1)
+                )
+            elif op is sre_constants.CATEGORY:
+                choices.extend(CATEGORIES.get(av, ""))
+        if negate:
+            choices = [char for char in ALPHABET if char not in choices]
+        return self._random.choice(choices or ALPHABET)
+
+    # invalid values
+
+    def _violations(
+        self, schema: Mapping[str, Any], value: Any
+    ) -> List[Callable[[Any], Any]]:
+        random = self._random
+        violations: List[Callable[[Any], Any]] = []
+        types = self._types(schema) if "type" in schema else list(SAMPLES)
+        if "number" in types:
+            types.append("integer")
+        others = [type for type in SAMPLES if type not in types]
+        # discriminators don't check the type of instances first
+        if others and "discriminator" not in schema:
+            violations.append(lambda _: SAMPLES[random.choice(others)])
+        if schema.get("enum"):
+            violations.append(lambda _: f"not one of {len(schema['enum'])}")
+        if "const" in schema:
+            violations.append(lambda _: [schema["const"]])
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if isinstance(schema.get("minimum"), (int, float)):
+                violations.append(lambda _: schema["minimum"] - 1)
+            if isinstance(schema.get("maximum"), (int, float)):
+                violations.append(lambda _: schema["maximum"] + 1)
+            if schema.get("multipleOf"):
+                violations.append(lambda v: v + schema["multipleOf"] / 2)
+            if schema.get("format") == "int32":
+                violations.append(lambda _: INT32_MAX + 1)
+            if schema.get("format") == "int64":
+                violations.append(lambda _: INT64_MAX + 1)
+            if schema.get("format") in ("float", "double"):
+                violations.append(lambda v: int(v))
+        if isinstance(value, str):
+            if schema.get("minLength"):
+                violations.append(lambda v: v[: schema["minLength"] - 1])
+            if "maxLength" in schema:
+                violations.append(
+                    lambda v: v + "x" * (schema["maxLength"] - len(v) + 1)
+                )
+            if isinstance(schema.get("pattern"), str):
+                violations.append(lambda _: " ")
+            if schema.get("format") in FORMATS:
+                violations.append(lambda _: f"not a {schema['format']}")
+        if isinstance(value, dict):
+            properties = schema.get("properties", {})
+            required = [
+                name
+                for name in schema.get("required", [])
+                if name in value and not self._skipped(properties.get(name))
+            ]
+            if required:
+                name = random.choice(required)
+                violations.append(lambda v: {k: v[k] for k in v if k != name})
+            if schema.get("additionalProperties") is False:
+                violations.append(lambda v: {**v, "unexpected": 1})
+            if getattr(self.validator, "write", None):
+                read_only = [
+                    name
+                    for name, subschema in properties.items()
+                    if name not in value
+                    and self._effective(subschema).get("readOnly")
+                ]
+                if read_only:
+                    name = random.choice(read_only)
+                    violations.append(
+                        lambda v: {
+                            **v,
+                            name: self._value(
+                                properties[name], self.max_depth, 1, v, name
+                            ),
+                        }
+                    )
+            discriminator = schema.get("discriminator")
+            if isinstance(discriminator, Mapping):
+                violations.append(
+                    lambda v: {**v, discriminator["propertyName"]: "Unknown"}
+                )
+        if isinstance(value, list):
+            if schema.get("minItems"):
+                violations.append(lambda v: v[: schema["minItems"] - 1])
+            if "maxItems" in schema and value:
+                violations.append(
+                    lambda v: v + v[:1] * (schema["maxItems"] - len(v) + 1)
+                )
+            if schema.get("uniqueItems") and value:
+                violations.append(lambda v: v + v[:1])
+        return violations
+
+
+def _date(random: Random) -> str:
+    day = date(2000, 1, 1) + timedelta(days=random.randrange(20000))
+    return day.isoformat()
+
+
+def _datetime(random: Random) -> str:
+    moment = EPOCH + timedelta(seconds=random.randrange(10**9))
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _uuid(random: Random) -> str:
+    return str(UUID(int=random.getrandbits(128), version=4))
+
+
+def _bytes(random: Random) -> bytes:
+    return bytes(random.randrange(256) for _ in range(random.randint(1, 16)))
+
+
+def _password(random: Random) -> str:
+    return "".join(random.choice(ALPHABET) for _ in range(12))
+
+
+# string formats of OASFormatChecker
+FORMATS: Dict[str, Callable[[Random], Any]] = {
+    "binary": _bytes,
+    "byte": lambda random: b64encode(_bytes(random)).decode(),
+    "date": _date,
+    "date-time": _datetime,
+    "password": _password,
+    "uuid": _uuid,
+}
@@ -0,0 +1,374 @@
+from copy import deepcopy
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from jsonschema._utils import equal
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._utils import array_index
+from openapi_schema_validator._utils import parse_pointer
+from openapi_schema_validator._walk import Token
+from openapi_schema_validator._walk import discriminator_ref
+from openapi_schema_validator._walk import is_discriminated
+from openapi_schema_validator._walk import item_schemas
+from openapi_schema_validator._walk import locate
+from openapi_schema_validator._walk import property_schemas
+from openapi_schema_validator._walk import relocate
+
+# keywords applying subschemas to members of the instance
+CHILD_KEYWORDS = frozenset(["patternProperties", "prefixItems", "properties"])
+# keywords applying subschemas to members of the instance, unless boolean
+CHILD_SCHEMA_KEYWORDS = frozenset(["additionalProperties", "items"])
+# keywords applying subschemas to the instance itself
+IN_PLACE_KEYWORDS = frozenset(["$ref", "allOf", "anyOf", "oneOf"])
+# keywords whose result can't be derived from changed members only
+NON_LOCAL_KEYWORDS = frozenset(
+    [
+        "$dynamicRef",
+        "additionalItems",
+        "contains",
+        "dependencies",
+        "dependentSchemas",
+        "else",
+        "if",
+        "not",
+        "then",
+        "unevaluatedItems",
+        "unevaluatedProperties",
+    ]
+)
+
+
+class JsonPatchError(ValueError):
+    pass
+
+
+class Changes:
+    """Tree of document locations changed by a patch.
+
+    A replaced node was added, replaced or removed as a whole. A resized
+    node is a container that had members added or removed.
+    """
+
+    def __init__(self) -> None:
+        self.replaced = False
+        self.resized = False
+        self.children: Dict[Token, "Changes"] = {}
+
+    def node(self, path: Sequence[Token]) -> Optional["Changes"]:
+        """Get changes at path, None if an ancestor is replaced."""
+        node = self
+        for token in path:
+            if node.replaced:
+                return None
+            node = node.children.setdefault(token, Changes())
+        return None if node.replaced else node
+
+    def replace(self, path: Sequence[Token]) -> None:
+        if not path:
+            self.replaced = True
+            self.children.clear()
+            return
+        parent = self.node(path[:-1])
+        if parent is None:
+            return
+        child = parent.children.setdefault(path[-1], Changes())
+        child.replaced = True
+        child.children.clear()
+
+    def add(self, path: Sequence[Token]) -> None:
+        parent = self.node(path[:-1])
+        if parent is None:
+            return
+        parent.resized = True
+        if isinstance(path[-1], int):
+            parent._shift(path[-1], 1)
+        self.replace(path)
+
+    def remove(self, path: Sequence[Token]) -> None:
+        parent = self.node(path[:-1])
+        if parent is None:
+            return
+        parent.resized = True
+        if isinstance(path[-1], int):
+            parent.children.pop(path[-1], None)
+            parent._shift(path[-1] + 1, -1)
+        else:
+            # keep removed member, keywords such as discriminator check it
+            self.replace(path)
+
+    def _shift(self, start: int, offset: int) -> None:
+        self.children = {
+            token + offset
+            if isinstance(token, int) and token >= start
+            else token: child
+            for token, child in self.children.items()
+        }
+
+
+def apply_patch(
+    document: Any, patch: Iterable[Mapping[str, Any]]
+) -> Tuple[Any, Changes]:
+    """Apply JSON Patch (RFC 6902) to document in place.
+
+    Returns the patched document, which is a new object only if the
+    whole document was replaced, and the locations the patch changed.
+    """
+    changes = Changes()
+    for operation in patch:
+        try:
+            op = operation["op"]
+            path = parse_pointer(operation["path"])
+            if op == "add":
+                document = _add(document, path, operation["value"], changes)
+            elif op == "remove":
+                document, _ = _remove(document, path, changes)
+            elif op == "replace":
+                document = _replace(
+                    document, path, operation["value"], changes
+                )
+            elif op == "move":
+                from_path = parse_pointer(operation["from"])
+                if path[: len(from_path)] == from_path != path:
+                    raise JsonPatchError(
+                        f"Cannot move {operation['from']!r} into itself"
+                    )
+                document, value = _remove(document, from_path, changes)
+                document = _add(document, path, value, changes)
+            elif op == "copy":
+                from_path = parse_pointer(operation["from"])
+                value = deepcopy(locate(document, from_path)[0])
+                document = _add(document, path, value, changes)
+            elif op == "test":
+                value = locate(document, path)[0]
+                if not equal(value, operation["value"]):
+                    raise JsonPatchError(
+                        f"Test of {operation['path']!r} failed"
+                    )
+            else:
+                raise JsonPatchError(f"Unknown operation {op!r}")
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            if isinstance(exc, JsonPatchError):
+                raise
+            raise JsonPatchError(
+                f"Cannot apply {operation!r}: {exc!r}"
+            ) from exc
+    return document, changes
+
+
+def _add(document: Any, path: List[str], value: Any, changes: Changes) -> Any:
+    if not path:
+        changes.replace([])
+        return value
+    container, parent = locate(document, path[:-1])
+    token = path[-1]
+    if isinstance(container, list):
+        index = len(container) if token == "-" else array_index(token)
+        if index > len(container):
+            raise IndexError(index)
+        container.insert(index, value)
+        changes.add(parent + [index])
+    elif isinstance(container, dict):
+        container[token] = value
+        changes.add(parent + [token])
+    else:
+        raise KeyError(token)
+    return document
+
+
+def _remove(
+    document: Any, path: List[str], changes: Changes
+) -> Tuple[Any, Any]:
+    if not path:
+        raise JsonPatchError("Cannot remove the whole document")
+    container, parent = locate(document, path[:-1])
+    if isinstance(container, list):
+        index = array_index(path[-1])
+        value = container.pop(index)
+        changes.remove(parent + [index])
+    elif isinstance(container, dict):
+        value = container.pop(path[-1])
+        changes.remove(parent + [path[-1]])
+    else:
+        raise KeyError(path[-1])
+    return document, value
+
+
+def _replace(
+    document: Any, path: List[str], value: Any, changes: Changes
+) -> Any:
+    if not path:
+        changes.replace([])
+        return value
+    container, parent = locate(document, path[:-1])
+    if isinstance(container, list):
+        index = array_index(path[-1])
+        container[index] = value
+        changes.replace(parent + [index])
+    elif isinstance(container, dict):
+        if path[-1] not in container:
+            raise KeyError(path[-1])
+        container[path[-1]] = value
+        changes.replace(parent + [path[-1]])
+    else:
+        raise KeyError(path[-1])
+    return document
+
+
+def iter_errors(
+    validator: Validator, document: Any, changes: Changes
+) -> Iterator[ValidationError]:
+    """Revalidate locations of a previously valid document changed by patch.
+
+    Only changed subtrees are validated in full. Their ancestors are
+    checked with keywords that apply to the ancestor itself, such as
+    required, additionalProperties or uniqueItems. Ancestors with
+    keywords that need all members revalidated, such as oneOf without
+    a discriminator, are validated in full.
+    """
+    return _iter_errors(validator, document, validator.schema, changes, [], [])
+
+
+def _iter_errors(
+    validator: Validator,
+    instance: Any,
+    schema: Any,
+    changes: Changes,
+    path: List[Token],
+    schema_path: List[Token],
+) -> Iterator[ValidationError]:
+    if schema is True or not (
+        changes.replaced or changes.resized or changes.children
+    ):
+        return
+    if changes.replaced or not _is_local(validator, instance, schema, changes):
+        errors = validator.evolve(schema=schema).iter_errors(instance)
+        yield from relocate(errors, path, schema_path)
+        return
+
+    scope = validator.ID_OF(schema)
+    if scope:
+        validator.resolver.push_scope(scope)
+    try:
+        yield from _iter_node_errors(
+            validator, instance, schema, changes, path, schema_path
+        )
+    finally:
+        if scope:
+            validator.resolver.pop_scope()
+
+
+def _is_local(
+    validator: Validator, instance: Any, schema: Any, changes: Changes
+) -> bool:
+    if not isinstance(schema, Mapping):
+        return False
+    if not isinstance(instance, (dict, list)):
+        return False
+    if not NON_LOCAL_KEYWORDS.isdisjoint(schema):
+        return False
+    if is_discriminated(schema, instance):
+        prop_name = schema["discriminator"].get("propertyName")
+        if prop_name in changes.children:
+            return False
+        if discriminator_ref(validator, instance, schema) is None:
+            return False
+    elif "anyOf" in schema or "oneOf" in schema:
+        return False
+    if isinstance(instance, list):
+        if not isinstance(schema.get("items", {}), (dict, bool)):
+            return False
+        if changes.resized and "prefixItems" in schema:
+            return False
+    return True
+
+
+def _iter_node_errors(
+    validator: Validator,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+    changes: Changes,
+    path: List[Token],
+    schema_path: List[Token],
+) -> Iterator[ValidationError]:
+    evolved = validator.evolve(schema=schema)
+    for keyword, value in schema.items():
+        if (
+            keyword in CHILD_KEYWORDS
+            or keyword in IN_PLACE_KEYWORDS
+            or keyword in CHILD_SCHEMA_KEYWORDS
+            and isinstance(value, dict)
+        ):
+            continue
+        function = validator.VALIDATORS.get(keyword)
+        if function is None:
+            continue
+        for error in function(evolved, value, instance, schema) or ():
+            error._set(
+                validator=keyword,
+                validator_value=value,
+                instance=instance,
+                schema=schema,
+                type_checker=validator.TYPE_CHECKER,
+            )
+            error.schema_path.appendleft(keyword)
+            yield from relocate([error], path, schema_path)
+
+    if "$ref" in schema:
+        scope, resolved = validator.resolver.resolve(schema["$ref"])
+        validator.resolver.push_scope(scope)
+        try:
+            yield from _iter_errors(
+                validator, instance, resolved, changes, path, schema_path
+            )
+        finally:
+            validator.resolver.pop_scope()
+
+    if is_discriminated(schema, instance):
+        ref = discriminator_ref(validator, instance, schema)
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if keyword in schema:
+                yield from _iter_errors(
+                    validator,
+                    instance,
+                    {"$ref": ref},
+                    changes,
+                    path,
+                    schema_path + [keyword],
+                )
+    else:
+        for index, subschema in enumerate(schema.get("allOf", ())):
+            yield from _iter_errors(
+                validator,
+                instance,
+                subschema,
+                changes,
+                path,
+                schema_path + ["allOf", index],
+            )
+
+    for token, child in changes.children.items():
+        if isinstance(instance, dict) and token in instance:
+            subschemas = property_schemas(validator, schema, str(token))
+        elif isinstance(instance, list) and isinstance(token, int):
+            subschemas = item_schemas(validator, schema, token)
+        else:
+            continue
+        for subschema, subschema_path in subschemas:
+            yield from _iter_errors(
+                validator,
+                instance[token],
+                subschema,
+                child,
+                path + [token],
+                schema_path + subschema_path,
+            )
@@ -0,0 +1,126 @@
+from time import monotonic
+from typing import Any
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from jsonschema.exceptions import ValidationError
+
+
+class LimitExceededError(ValidationError):  # type: ignore[misc]
+    """Raised when validation exceeds one of the validator's limits.
+
+    Unlike other validation errors it's raised rather than yielded,
+    aborting the validation. ``limit`` is the name of the exceeded
+    limit and ``path`` the location in the instance where it was
+    exceeded.
+    """
+
+    def __init__(self, message: str, limit: str, **kwargs: Any):
+        super().__init__(message, validator="limits", **kwargs)
+        self.limit = limit
+
+
+class Limits(NamedTuple):
+    """Limits of the resources a validator may use for an instance.
+
+    ``max_depth`` limits nesting of arrays and objects, ``max_nodes``
+    the number of values visited, counting a value once for every
+    subschema it's validated against, ``max_array_length`` and
+    ``max_object_keys`` the size of arrays and objects and
+    ``max_string_length`` the length of strings checked with ``pattern``,
+    ``patternProperties`` or ``format``. ``timeout`` is the time in
+    seconds a validation may take. Limits that are None aren't checked.
+    """
+
+    max_depth: Optional[int] = None
+    max_nodes: Optional[int] = None
+    max_array_length: Optional[int] = None
+    max_object_keys: Optional[int] = None
+    max_string_length: Optional[int] = None
+    timeout: Optional[float] = None
+
+    def check_string(self, instance: Any) -> None:
+        """Check length of a string about to be matched or parsed."""
+        if (
+            self.max_string_length is not None
+            and isinstance(instance, str)
+            and len(instance) > self.max_string_length
+        ):
+            raise LimitExceededError(
+                f"String is longer than {self.max_string_length} characters",
+                "max_string_length",
+            )
+
+
+class Usage:
+    """Resources used by a single validation, checked against limits."""
+
+    def __init__(self, limits: Limits):
+        self.limits = limits
+        self.depth = 0
+        self.nodes = 0
+        self.deadline: Optional[float] = None
+        if limits.timeout is not None:
+            self.deadline = monotonic() + limits.timeout
+
+    def check(self, instance: Any) -> None:
+        """Check limits on visiting instance."""
+        limits = self.limits
+        self.nodes += 1
+        if limits.max_nodes is not None and self.nodes > limits.max_nodes:
+            raise LimitExceededError(
+                f"More than {limits.max_nodes} nodes visited", "max_nodes"
+            )
+        if self.deadline is not None and monotonic() > self.deadline:
+            raise LimitExceededError(
+                f"Validation took longer than {limits.timeout} seconds",
+                "timeout",
+            )
+        if isinstance(instance, list):
+            if (
+                limits.max_array_length is not None
+                and len(instance) > limits.max_array_length
+            ):
+                raise LimitExceededError(
+                    f"Array has more than {limits.max_array_length} items",
+                    "max_array_length",
+                )
+        elif isinstance(instance, dict):
+            if (
+                limits.max_object_keys is not None
+                and len(instance) > limits.max_object_keys
+            ):
+                raise LimitExceededError(
+                    f"Object has more than {limits.max_object_keys} keys",
+                    "max_object_keys",
+                )
+
+    def iter_errors(
+        self, instance: Any, errors: Iterator[ValidationError]
+    ) -> Iterator[ValidationError]:
+        self.check(instance)
+        yield from errors
+
+    def descend(
+        self, errors: Iterator[ValidationError], path: Union[str, int]
+    ) -> Iterator[ValidationError]:
+        # depth is left before every yield, so it's not stale if the
+        # consumer stops iterating; aborted validations aren't resumed
+        limits = self.limits
+        self.depth += 1
+        try:
+            if limits.max_depth is not None and self.depth > limits.max_depth:
+                raise LimitExceededError(
+                    f"Nesting is deeper than {limits.max_depth} levels",
+                    "max_depth",
+                )
+            for error in errors:
+                self.depth -= 1
+                yield error
+                self.depth += 1
+        except LimitExceededError as exc:
+            exc.path.appendleft(path)
+            raise
+        self.depth -= 1
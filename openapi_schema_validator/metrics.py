@@ -0,0 +1,284 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from jsonschema.exceptions import ValidationError
+
+DURATION_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10_000, 100_000, 1_000_000)
+
+
+class HistogramSnapshot(NamedTuple):
+    buckets: Tuple[float, ...]
+    # observations per bucket, the last one above every bound
+    counts: Tuple[int, ...]
+    sum: float
+    observations: int
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            self.buckets, tuple(self.counts), self.sum, self.count
+        )
+
+
+class MetricsSnapshot(NamedTuple):
+    """Point in time copy of collected metrics.
+
+    Counters are keyed by schema label, ``errors`` by schema label and
+    keyword, ``format_checks`` by format and whether the value was
+    valid and ``cache_lookups`` by cache name and whether it was a hit.
+    """
+
+    validations: Dict[str, int]
+    failures: Dict[str, int]
+    errors: Dict[Tuple[str, str], int]
+    durations: Dict[str, HistogramSnapshot]
+    sizes: Dict[str, HistogramSnapshot]
+    format_checks: Dict[Tuple[str, bool], int]
+    cache_lookups: Dict[Tuple[str, bool], int]
+
+    def hit_rate(self, cache: str = "result") -> float:
+        hits = self.cache_lookups.get((cache, True), 0)
+        lookups = hits + self.cache_lookups.get((cache, False), 0)
+        return hits / lookups if lookups else 0.0
+
+
+def schema_label(schema: Any) -> str:
+    """Label of validations against schema: its title or id, if any."""
+    if isinstance(schema, Mapping):
+        for keyword in ("title", "$id", "id"):
+            if isinstance(schema.get(keyword), str):
+                label: str = schema[keyword]
+                return label
+    return ""
+
+
+def _size(instance: Any) -> int:
+    # number of values, including the instance itself
+    size = 0
+    stack = [instance]
+    while stack:
+        value = stack.pop()
+        size += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return size
+
+
+class Metrics:
+    """Collects metrics of validations.
+
+    Pass it to validators as ``metrics`` (or to ``validate``) to count
+    validations, failed validations and errors by keyword, and to
+    record histograms of validation durations. Instance sizes, in
+    number of values, are recorded only with ``size_buckets``, such as
+    ``SIZE_BUCKETS``, as counting them walks every instance.
+    Validations are labelled by the schema's title or id. Format checks
+    and result cache lookups made during validations are counted too.
+    A validation is recorded when its errors are exhausted or it's
+    abandoned, like ``is_valid`` does on the first error. Safe to share
+    between threads and validators.
+    """
+
+    def __init__(
+        self,
+        duration_buckets: Sequence[float] = DURATION_BUCKETS,
+        size_buckets: Optional[Sequence[float]] = None,
+        timer: Callable[[], float] = time.perf_counter,
+    ):
+        self.duration_buckets = tuple(sorted(duration_buckets))
+        self.size_buckets = (
+            None if size_buckets is None else tuple(sorted(size_buckets))
+        )
+        self.timer = timer
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # like result caches, unpickled collectors start empty
+        return self.__class__, (
+            self.duration_buckets,
+            self.size_buckets,
+            self.timer,
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._validations: "Counter[str]" = Counter()
+            self._failures: "Counter[str]" = Counter()
+            self._errors: "Counter[Tuple[str, str]]" = Counter()
+            self._durations: Dict[str, _Histogram] = {}
+            self._sizes: Dict[str, _Histogram] = {}
+            self._format_checks: "Counter[Tuple[str, bool]]" = Counter()
+            self._cache_lookups: "Counter[Tuple[str, bool]]" = Counter()
+
+    def observe(
+        self, schema: Any, instance: Any, errors: Iterable[ValidationError]
+    ) -> Iterator[ValidationError]:
+        """Record validation of instance while errors are iterated."""
+        label = schema_label(schema)
+        keywords: "Counter[str]" = Counter()
+        start = self.timer()
+        try:
+            for error in errors:
+                keywords[str(error.validator)] += 1
+                yield error
+        finally:
+            duration = self.timer() - start
+            size_buckets = self.size_buckets
+            size = None if size_buckets is None else _size(instance)
+            with self._lock:
+                self._validations[label] += 1
+                if keywords:
+                    self._failures[label] += 1
+                for keyword, count in keywords.items():
+                    self._errors[label, keyword] += count
+                if label not in self._durations:
+                    self._durations[label] = _Histogram(self.duration_buckets)
+                self._durations[label].observe(duration)
+                if size_buckets is not None and size is not None:
+                    if label not in self._sizes:
+                        self._sizes[label] = _Histogram(size_buckets)
+                    self._sizes[label].observe(size)
+
+    def format_checked(self, format: str, valid: bool) -> None:
+        with self._lock:
+            self._format_checks[format, valid] += 1
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        with self._lock:
+            self._cache_lookups[cache, hit] += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                dict(self._validations),
+                dict(self._failures),
+                dict(self._errors),
+                {
+                    label: histogram.snapshot()
+                    for label, histogram in self._durations.items()
+                },
+                {
+                    label: histogram.snapshot()
+                    for label, histogram in self._sizes.items()
+                },
+                dict(self._format_checks),
+                dict(self._cache_lookups),
+            )
+
+    def render_prometheus(self, prefix: str = "openapi_validation") -> str:
+        return render_prometheus(self.snapshot(), prefix)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(
+    snapshot: MetricsSnapshot, prefix: str = "openapi_validation"
+) -> str:
+    """Render snapshot in the Prometheus text exposition format."""
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help: str) -> str:
+        name = f"{prefix}_{name}"
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        return name
+
+    def histograms(
+        name: str, help: str, values: Dict[str, HistogramSnapshot]
+    ) -> None:
+        name = family(name, "histogram", help)
+        for label, histogram in sorted(values.items()):
+            cumulative = 0
+            bounds = histogram.buckets + (float("inf"),)
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                labels = _labels(schema=label, le=_number(bound))
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            labels = _labels(schema=label)
+            lines.append(f"{name}_sum{labels} {_number(histogram.sum)}")
+            lines.append(f"{name}_count{labels} {histogram.observations}")
+
+    name = family("total", "counter", "Validations.")
+    for label, count in sorted(snapshot.validations.items()):
+        lines.append(f"{name}{_labels(schema=label)} {count}")
+    name = family("failures_total", "counter", "Validations with errors.")
+    for label, count in sorted(snapshot.failures.items()):
+        lines.append(f"{name}{_labels(schema=label)} {count}")
+    name = family("errors_total", "counter", "Validation errors by keyword.")
+    for (label, keyword), count in sorted(snapshot.errors.items()):
+        labels = _labels(schema=label, keyword=keyword)
+        lines.append(f"{name}{labels} {count}")
+    histograms("duration_seconds", "Validation duration.", snapshot.durations)
+    histograms(
+        "instance_size", "Number of values in instances.", snapshot.sizes
+    )
+    name = family("format_checks_total", "counter", "Format checks.")
+    for (format, valid), count in sorted(snapshot.format_checks.items()):
+        labels = _labels(format=format, valid=str(valid).lower())
+        lines.append(f"{name}{labels} {count}")
+    name = family("cache_lookups_total", "counter", "Cache lookups.")
+    for (cache, hit), count in sorted(snapshot.cache_lookups.items()):
+        labels = _labels(cache=cache, hit=str(hit).lower())
+        lines.append(f"{name}{labels} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,67 @@
+import sys
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+
+def intern_schema(
+    schema: Any, interned: Optional[Dict[Hashable, Any]] = None
+) -> Any:
+    """Build a copy of schema with structurally equal parts shared.
+
+    Objects and arrays that are equal, including key order and the
+    types of numbers, are replaced with a single object, and strings
+    are interned. Anything validators precompute per schema object,
+    such as enum indexes, is then computed once for all copies. The
+    original schema isn't modified; the result should not be modified
+    either, as a change to a shared part affects every place it's used.
+
+    Share ``interned`` between calls to share parts between schemas.
+    """
+    if interned is None:
+        interned = {}
+    return _intern(schema, interned)[0]
+
+
+def _intern(value: Any, interned: Dict[Hashable, Any]) -> Tuple[Any, Any]:
+    # keys of objects and arrays are built from identities of interned
+    # members, so they stay shallow
+    if isinstance(value, dict):
+        members = {
+            _intern_key(name): _intern(member, interned)
+            for name, member in value.items()
+        }
+        key: Any = (
+            "object",
+            tuple(
+                (name, member_key) for name, (_, member_key) in members.items()
+            ),
+        )
+        if key not in interned:
+            interned[key] = {
+                name: member for name, (member, _) in members.items()
+            }
+    elif isinstance(value, list):
+        items = [_intern(item, interned) for item in value]
+        key = ("array", tuple(item_key for _, item_key in items))
+        if key not in interned:
+            interned[key] = [item for item, _ in items]
+    else:
+        if type(value) is str:
+            value = sys.intern(value)
+        try:
+            key = (type(value), value)
+            hash(key)
+        except TypeError:
+            key = ("unhashable", id(value))
+            interned.setdefault(key, value)
+        return value, key
+
+    shared = interned[key]
+    return shared, ("shared", id(shared))
+
+
+def _intern_key(key: Any) -> Any:
+    return sys.intern(key) if type(key) is str else key
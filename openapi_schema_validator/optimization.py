@@ -0,0 +1,881 @@
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from urllib.parse import unquote
+from urllib.parse import urldefrag
+
+from jsonschema._utils import equal
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._utils import SCHEMA_ARRAY_KEYWORDS
+from openapi_schema_validator._utils import SCHEMA_KEYWORDS
+from openapi_schema_validator._utils import SCHEMA_MAPPING_KEYWORDS
+from openapi_schema_validator._utils import parse_pointer
+from openapi_schema_validator._walk import Token
+from openapi_schema_validator._walk import locate
+from openapi_schema_validator._walk import object_paths
+
+Path = Tuple[Token, ...]
+# Locations of keywords of an optimized schema in the original schema,
+# relative to the original location of the optimized one. Subschemas
+# in objects and arrays are keyed by keyword and name or index, each
+# name of ``required`` by keyword and name. Unchanged keywords are left
+# out.
+Origins = Dict[Path, Path]
+
+ANNOTATIONS = frozenset(
+    [
+        "$comment",
+        "default",
+        "deprecated",
+        "description",
+        "example",
+        "examples",
+        "externalDocs",
+        "title",
+        "xml",
+    ]
+)
+# keywords that change the scope or the meaning of references
+SCOPED = frozenset(
+    [
+        "$anchor",
+        "$dynamicAnchor",
+        "$dynamicRef",
+        "$id",
+        "$recursiveAnchor",
+        "$recursiveRef",
+        "$ref",
+        "$schema",
+        "unevaluatedItems",
+        "unevaluatedProperties",
+    ]
+)
+# keywords that depend on each other within a schema
+COUPLED = [
+    frozenset(["maximum", "exclusiveMaximum"]),
+    frozenset(["minimum", "exclusiveMinimum"]),
+    frozenset(["properties", "patternProperties", "additionalProperties"]),
+    frozenset(
+        [
+            "items",
+            "prefixItems",
+            "additionalItems",
+            "contains",
+            "minContains",
+            "maxContains",
+        ]
+    ),
+    frozenset(["if", "then", "else"]),
+]
+_COUPLED = {keyword: group for group in COUPLED for keyword in group}
+# keywords seeing the annotations of subschemas, referenced or not
+UNEVALUATED = ("unevaluatedItems", "unevaluatedProperties")
+# values keywords have when they're left out
+DEFAULTS = {
+    "deprecated": False,
+    "minItems": 0,
+    "minLength": 0,
+    "minProperties": 0,
+    "nullable": False,
+    "readOnly": False,
+    "uniqueItems": False,
+    "writeOnly": False,
+}
+# keywords with a subschema that doesn't apply if it's always true
+TRUE_DEFAULTS = (
+    "additionalItems",
+    "additionalProperties",
+    "else",
+    "items",
+    "propertyNames",
+    "then",
+)
+# keywords checked in time independent of the size of the instance
+CONSTANT = frozenset(
+    [
+        "const",
+        "enum",
+        "exclusiveMaximum",
+        "exclusiveMinimum",
+        "maxItems",
+        "maxLength",
+        "maxProperties",
+        "maximum",
+        "minItems",
+        "minLength",
+        "minProperties",
+        "minimum",
+        "multipleOf",
+        "readOnly",
+        "required",
+        "type",
+        "writeOnly",
+    ]
+)
+_Required = List[Tuple[Any, Tuple[bool, bool]]]
+
+
+class _Conflict(Exception):
+    pass
+
+
+def _is_annotation(keyword: Any) -> bool:
+    return keyword in ANNOTATIONS or str(keyword).startswith("x-")
+
+
+def _is_container(keyword: Any, value: Any) -> bool:
+    # objects and arrays of subschemas
+    return (
+        keyword in SCHEMA_MAPPING_KEYWORDS and isinstance(value, dict)
+    ) or (keyword in SCHEMA_ARRAY_KEYWORDS and isinstance(value, list))
+
+
+def _is_reference(schema: Mapping[Any, Any]) -> bool:
+    return isinstance(schema.get("$ref"), str) and all(
+        keyword == "$ref" or _is_annotation(keyword) for keyword in schema
+    )
+
+
+def _subschemas(schema: Mapping[Any, Any]) -> Iterator[Any]:
+    for keyword, value in schema.items():
+        if keyword in SCHEMA_KEYWORDS and isinstance(value, dict):
+            yield value
+        elif _is_container(keyword, value):
+            yield from value.values() if isinstance(value, dict) else value
+
+
+def _access(schema: Mapping[Any, Any], name: Any) -> Tuple[bool, bool]:
+    # read and write access of a property as required sees it
+    properties = schema.get("properties")
+    if not isinstance(properties, Mapping):
+        return False, False
+    prop_schema = properties.get(name)
+    if not prop_schema or not isinstance(prop_schema, Mapping):
+        return False, False
+    return (
+        bool(prop_schema.get("readOnly", False)),
+        bool(prop_schema.get("writeOnly", False)),
+    )
+
+
+def _origin(origins: Origins, key: Path) -> Path:
+    if key in origins:
+        return origins[key]
+    if key[:1] in origins:
+        return origins[key[:1]] + key[1:]
+    return key
+
+
+def _ref_pointer(ref: Any) -> Optional[List[str]]:
+    if not isinstance(ref, str) or ref[:1] != "#":
+        return None
+    try:
+        return parse_pointer(unquote(urldefrag(ref)[1]))
+    except ValueError:
+        return None
+
+
+def _references(schema: Mapping[Any, Any]) -> Iterator[str]:
+    if "$ref" in schema:
+        yield schema["$ref"]
+    discriminator = schema.get("discriminator")
+    if isinstance(discriminator, Mapping) and isinstance(
+        discriminator.get("mapping"), Mapping
+    ):
+        yield from discriminator["mapping"].values()
+
+
+def _unevaluated(document: Any) -> bool:
+    # any object using the keywords, whether it's a schema or not
+    stack = [document]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if any(keyword in value for keyword in UNEVALUATED):
+                return True
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
+
+
+def _locate(document: Any, ref: Any) -> Optional[Tuple[Any, Path]]:
+    pointer = _ref_pointer(ref)
+    if pointer is None:
+        return None
+    try:
+        target, path = locate(document, pointer)
+    except (KeyError, IndexError, ValueError):
+        return None
+    return target, tuple(path)
+
+
+class OptimizedSchema:
+    """Schema rewritten for faster validation.
+
+    ``schema`` is valid for the same instances as the original schema
+    and ``referrer`` is the document its references are resolved
+    against. Errors of validators of the optimized schema point to
+    locations in it; ``relocate`` points them back to the original
+    schema. Errors may be produced in a different order.
+    """
+
+    def __init__(
+        self,
+        schema: Any,
+        referrer: Any,
+        origins: Dict[int, Tuple[Any, Origins]],
+    ):
+        self.schema = schema
+        self.referrer = referrer
+        self._origins = origins
+
+    def iter_errors(
+        self, validator: Validator, instance: Any
+    ) -> Iterator[ValidationError]:
+        """Iterate over errors of validator, relocated."""
+        for error in validator.iter_errors(instance):
+            yield self.relocate(error)
+
+    def relocate(self, error: ValidationError) -> ValidationError:
+        """Point schema paths of error and its context to the original
+        schema."""
+        self._relocate(error, ())
+        return error
+
+    def _relocate(self, error: ValidationError, parent: Path) -> None:
+        path = parent + tuple(error.relative_schema_path)
+        required = error.message if error.validator == "required" else None
+        original = self.original_path(path, required)
+        offset = len(self.original_path(parent))
+        for child in error.context:
+            self._relocate(child, path)
+        error.relative_schema_path.clear()
+        error.relative_schema_path.extend(original[offset:])
+
+    def original_path(
+        self, schema_path: Iterable[Token], required: Optional[str] = None
+    ) -> Path:
+        """Path in the original schema of a path in the optimized one.
+
+        ``required`` is the message of an error of ``required``, to tell
+        which of the joined ``required`` keywords the missing property
+        came from.
+        """
+        return self._walk(self.schema, tuple(schema_path), required)[0]
+
+    def _walk(
+        self, node: Any, tokens: Path, required: Optional[str]
+    ) -> Tuple[Path, bool]:
+        # original path and whether all of tokens were found
+        original: List[Token] = []
+        parent: Any = None
+        index = 0
+        # references aren't in schema paths, they're followed to the
+        # schema with the keyword
+        seen: Set[int] = set()
+        while index < len(tokens):
+            token = tokens[index]
+            if isinstance(node, list) and isinstance(token, int):
+                original.append(token)
+                node = node[token] if 0 <= token < len(node) else None
+                index += 1
+                continue
+            if isinstance(node, list) and isinstance(parent, dict):
+                # discriminators continue at the mapped schema
+                path, found = self._branch(
+                    parent, node, tokens[index:], required
+                )
+                return tuple(original) + path, found
+            if not isinstance(node, dict):
+                break
+            if token not in node and "$ref" in node:
+                if id(node) in seen:
+                    break
+                seen.add(id(node))
+                node = self._resolve(node["$ref"])
+                continue
+            seen.clear()
+            parent = node
+            origins = self._origins.get(id(node), (None, {}))[1]
+            if token == "required":
+                for name in node.get("required", []):
+                    if required == f"{name!r} is a required property":
+                        original.extend(
+                            origins.get(("required", name), ("required",))
+                        )
+                        break
+                else:
+                    original.append(token)
+                return tuple(original) + tokens[index + 1 :], True
+            key = tokens[index : index + 2]
+            if len(key) == 2 and key in origins:
+                container: Any = node[token]
+                node = container[key[1]]
+            else:
+                key = (token,)
+                node = node.get(token)
+            original.extend(origins.get(key, key))
+            index += len(key)
+        found = index == len(tokens) and node is not None
+        return tuple(original) + tokens[index:], found
+
+    def _branch(
+        self,
+        parent: Dict[Any, Any],
+        members: List[Any],
+        tokens: Path,
+        required: Optional[str],
+    ) -> Tuple[Path, bool]:
+        # the branch taken depends on the instance, it's used if all
+        # of them having the path agree on its original
+        discriminator = parent.get("discriminator")
+        refs: List[Any] = []
+        if isinstance(discriminator, dict):
+            mapping = discriminator.get("mapping")
+            if isinstance(mapping, dict):
+                refs.extend(mapping.values())
+        refs.extend(
+            member["$ref"]
+            for member in members
+            if isinstance(member, dict) and "$ref" in member
+        )
+        paths = set()
+        for ref in refs:
+            path, found = self._walk(self._resolve(ref), tokens, required)
+            if found:
+                paths.add(path)
+        if len(paths) == 1:
+            return paths.pop(), True
+        return tokens, False
+
+    def _resolve(self, ref: Any) -> Any:
+        located = _locate(self.referrer, ref)
+        return None if located is None else located[0]
+
+
+class Optimizer:
+    """State of a schema optimization, passed to its passes.
+
+    Schemas are optimized subschemas first. Every pass is called with
+    the optimizer and a schema whose subschemas are optimized already
+    and returns it rewritten, or the same schema if there's nothing to
+    do; passes must not modify the schema they're given.
+
+    ``unevaluated`` tells whether the schema or the document it's
+    resolved against use ``unevaluatedItems`` or
+    ``unevaluatedProperties``, which depend on annotations of
+    subschemas that passes would drop or move.
+    """
+
+    def __init__(self, referrer: Any, passes: Iterable["SchemaPass"]):
+        self.referrer = referrer
+        self.passes = tuple(passes)
+        self.paths = object_paths(referrer)
+        self.origins: Dict[int, Tuple[Any, Origins]] = {}
+        self.targets: Dict[Path, Any] = {}
+        self._optimized: Dict[int, Any] = {}
+        self._pending: Set[int] = set()
+        self._pinned: Set[Path] = set()
+        self._locked: Dict[int, Any] = {}
+        self.unevaluated = _unevaluated(referrer)
+
+    def pin(self, schema: Any) -> None:
+        """Keep structure of schemas with references into them."""
+        seen: Set[int] = set()
+        stack = [schema]
+        while stack:
+            current = stack.pop()
+            if not isinstance(current, dict) or id(current) in seen:
+                continue
+            seen.add(id(current))
+            if any(keyword in current for keyword in UNEVALUATED):
+                self.unevaluated = True
+            stack.extend(_subschemas(current))
+            for ref in _references(current):
+                located = _locate(self.referrer, ref)
+                if located is not None:
+                    target, path = located
+                    self._pinned.update(
+                        path[:length] for length in range(len(path))
+                    )
+                    stack.append(target)
+
+    def pinned(self, schema: Any) -> bool:
+        """Whether references point into schema, so its subschemas must
+        stay where they are."""
+        return id(schema) in self._locked
+
+    def origin(self, schema: Any, key: Path) -> Path:
+        """Location of keyword or member of a container of schema,
+        relative to where schema was originally."""
+        return _origin(self.origins.get(id(schema), (None, {}))[1], key)
+
+    def moved(self, source: Any, result: Any, moves: Dict[Path, Path]) -> None:
+        """Record result as a rewrite of source, with members of arrays
+        of subschemas at other indexes.
+
+        ``moves`` maps keyword and index in result to keyword and index
+        in source, for every member of an array that was changed.
+        """
+        previous = self.origins.get(id(source), (None, {}))[1]
+        keywords = {keyword for keyword, _ in moves}
+        origins = {
+            key: path
+            for key, path in previous.items()
+            if len(key) != 2 or key[0] not in keywords
+        }
+        for key, old in moves.items():
+            origins[key] = _origin(previous, old)
+        self.origins[id(result)] = (result, origins)
+        if self.pinned(source):
+            self._locked[id(result)] = result
+
+    def target(self, ref: Any) -> Optional[Any]:
+        """Optimized schema a local reference points to."""
+        located = _locate(self.referrer, ref)
+        if located is None or id(located[0]) in self._pending:
+            return None
+        optimized = self.schema(located[0])
+        self.targets[located[1]] = optimized
+        return optimized
+
+    def schema(self, schema: Any) -> Any:
+        if not isinstance(schema, dict):
+            return schema
+        try:
+            return self._optimized[id(schema)]
+        except KeyError:
+            pass
+        self._pending.add(id(schema))
+        try:
+            optimized = self._optimize(schema)
+        finally:
+            self._pending.discard(id(schema))
+        self._optimized[id(schema)] = optimized
+        return optimized
+
+    def _optimize(self, schema: Dict[Any, Any]) -> Any:
+        optimized = {}
+        for keyword, value in schema.items():
+            if keyword in SCHEMA_KEYWORDS and isinstance(value, dict):
+                value = self.schema(value)
+            elif _is_container(keyword, value):
+                if isinstance(value, list):
+                    value = [self.schema(member) for member in value]
+                else:
+                    value = {
+                        name: self.schema(member)
+                        for name, member in value.items()
+                    }
+            optimized[keyword] = value
+        for ref in _references(schema):
+            self.target(ref)
+        if self.paths.get(id(schema)) in self._pinned:
+            self._locked[id(optimized)] = optimized
+        for optimization in self.passes:
+            result = optimization(self, optimized)
+            if result is not optimized and id(result) not in self.origins:
+                self.moved(optimized, result, {})
+            optimized = result
+        if optimized == schema and list(optimized) == list(schema):
+            return schema
+        return optimized
+
+    def flatten(self, parts: List[Tuple[Path, Any]]) -> Dict[Any, Any]:
+        """Merge schemas an instance must all be valid against.
+
+        Parts are merged one by one, each at its path relative to the
+        merged schema; parts that can't be merged soundly are kept in
+        its ``allOf``.
+        """
+        merged: Dict[Any, Any] = {}
+        origins: Origins = {}
+        required: _Required = []
+        residual: List[Tuple[Path, Any]] = []
+        for position, (prefix, part) in enumerate(parts):
+            if part is True or part == {}:
+                continue
+            schema = part
+            if isinstance(part, dict) and _is_reference(part):
+                # schema paths don't include references
+                schema = self.target(part["$ref"])
+            if not isinstance(schema, dict):
+                residual.append((prefix, part))
+                continue
+            try:
+                merged, origins, required, nested = self._merge(
+                    merged, origins, required, prefix, schema, position == 0
+                )
+            except _Conflict:
+                residual.append((prefix, part))
+                continue
+            residual.extend(nested)
+        if residual:
+            merged["allOf"] = [member for _, member in residual]
+            for index, (prefix, _) in enumerate(residual):
+                if prefix != ("allOf", index):
+                    origins["allOf", index] = prefix
+        if origins:
+            self.origins[id(merged)] = (merged, origins)
+        return merged
+
+    def _merge(
+        self,
+        merged: Dict[Any, Any],
+        origins: Origins,
+        required: _Required,
+        prefix: Path,
+        schema: Dict[Any, Any],
+        base: bool,
+    ) -> Tuple[Dict[Any, Any], Origins, _Required, List[Tuple[Path, Any]]]:
+        if any(keyword in SCOPED for keyword in schema) or (
+            "discriminator" in schema
+            and any(key in schema for key in ("allOf", "anyOf", "oneOf"))
+        ):
+            raise _Conflict
+        part_origins = self.origins.get(id(schema), (None, {}))[1]
+
+        def origin(key: Path) -> Path:
+            return prefix + _origin(part_origins, key)
+
+        merged = dict(merged)
+        origins = dict(origins)
+        required = list(required)
+        nested: List[Tuple[Path, Any]] = []
+
+        def add(keyword: Any, value: Any) -> None:
+            merged[keyword] = value
+            path = origin((keyword,))
+            if path != (keyword,):
+                origins[(keyword,)] = path
+            if _is_container(keyword, value):
+                members = (
+                    range(len(value)) if isinstance(value, list) else value
+                )
+                for member in members:
+                    if origin((keyword, member)) != path + (member,):
+                        origins[keyword, member] = origin((keyword, member))
+
+        for keyword, value in schema.items():
+            if keyword == "allOf":
+                nested.extend(
+                    (origin(("allOf", index)), member)
+                    for index, member in enumerate(value)
+                )
+            elif keyword in ("discriminator", "nullable"):
+                # discriminator without compositions is an annotation,
+                # nullable is merged with type
+                continue
+            elif _is_annotation(keyword):
+                if keyword not in merged:
+                    add(keyword, value)
+            elif keyword == "required":
+                names = list(merged.get("required", []))
+                for name in value:
+                    required.append((name, _access(schema, name)))
+                    if name not in names:
+                        names.append(name)
+                        origins["required", name] = prefix + part_origins.get(
+                            ("required", name), ("required",)
+                        )
+                merged["required"] = names
+            elif keyword == "type":
+                if keyword in merged and not equal(merged[keyword], value):
+                    raise _Conflict
+                # the result is nullable only if every typed part is
+                nullable = schema.get("nullable") is True
+                if keyword not in merged:
+                    add(keyword, value)
+                    if nullable:
+                        add("nullable", True)
+                elif not nullable and merged.pop("nullable", None):
+                    # null is now rejected by this part's type
+                    origins.pop(("nullable",), None)
+                    origins.pop(("type",), None)
+                    add(keyword, value)
+            elif keyword in ("readOnly", "writeOnly") and not base:
+                # they're looked up by required of the parent schema
+                if keyword not in merged or not equal(merged[keyword], value):
+                    raise _Conflict
+            elif keyword == "properties" and keyword in merged:
+                self._merge_properties(merged, origins, value, origin)
+            elif keyword in merged:
+                if not equal(merged[keyword], value):
+                    raise _Conflict
+            else:
+                group = _COUPLED.get(keyword, ())
+                if any(other in merged for other in group):
+                    raise _Conflict
+                add(keyword, value)
+        if "nullable" in merged and "type" not in merged:
+            del merged["nullable"]
+            origins.pop(("nullable",), None)
+        for name, access in required:
+            if _access(merged, name) != access:
+                raise _Conflict
+        return merged, origins, required, nested
+
+    def _merge_properties(
+        self,
+        merged: Dict[Any, Any],
+        origins: Origins,
+        properties: Any,
+        origin: Callable[[Path], Path],
+    ) -> None:
+        if not isinstance(properties, dict) or any(
+            keyword in merged
+            for keyword in ("patternProperties", "additionalProperties")
+        ):
+            raise _Conflict
+        combined = dict(merged["properties"])
+        for name, subschema in properties.items():
+            key = ("properties", name)
+            path = origin(key)
+            if name not in combined:
+                combined[name] = subschema
+                if path != _origin(origins, key):
+                    origins[key] = path
+            elif combined[name] is not subschema:
+                # both apply to the property, as if in allOf
+                combined[name] = self.flatten(
+                    [
+                        (_origin(origins, key), combined[name]),
+                        (path, subschema),
+                    ]
+                )
+                origins[key] = ()
+        merged["properties"] = combined
+
+
+def _substitute(document: Any, replacements: Dict[Path, Any]) -> Any:
+    # copies objects and arrays on the paths to replaced values only
+    prefixes = {
+        path[:length] for path in replacements for length in range(len(path))
+    }
+
+    def rebuild(value: Any, path: Path) -> Any:
+        value = replacements.get(path, value)
+        if path not in prefixes:
+            return value
+        if isinstance(value, dict):
+            return {
+                name: rebuild(member, path + (name,))
+                for name, member in value.items()
+            }
+        return [
+            rebuild(member, path + (index,))
+            for index, member in enumerate(value)
+        ]
+
+    return rebuild(document, ())
+
+
+SchemaPass = Callable[[Optimizer, Dict[Any, Any]], Dict[Any, Any]]
+
+
+def _always_true(schema: Any) -> bool:
+    return schema is True or schema == {}
+
+
+def _default(keyword: Any, value: Any) -> bool:
+    default = DEFAULTS.get(keyword)
+    return type(value) is type(default) and value == default
+
+
+def strip_annotations(
+    optimizer: Optimizer, schema: Dict[Any, Any]
+) -> Dict[Any, Any]:
+    """Drop keywords that don't affect validation, such as
+    ``description`` and ``example``, and discriminators without a
+    composition to select from. ``title`` is kept to label metrics."""
+    composed = any(key in schema for key in ("allOf", "anyOf", "oneOf"))
+    stripped = {
+        keyword: value
+        for keyword, value in schema.items()
+        if keyword == "title"
+        or not _is_annotation(keyword)
+        and (keyword != "discriminator" or composed)
+    }
+    return schema if len(stripped) == len(schema) else stripped
+
+
+def fold_defaults(
+    optimizer: Optimizer, schema: Dict[Any, Any]
+) -> Dict[Any, Any]:
+    """Drop keywords with the value they default to, such as
+    ``nullable: false``."""
+    folded = {
+        keyword: value
+        for keyword, value in schema.items()
+        if not _default(keyword, value)
+    }
+    return schema if len(folded) == len(schema) else folded
+
+
+def fold_always_true(
+    optimizer: Optimizer, schema: Dict[Any, Any]
+) -> Dict[Any, Any]:
+    """Drop subschemas every instance is valid against, and keywords
+    left without effect, such as empty ``allOf``.
+
+    Nothing is dropped when ``unevaluated*`` keywords are used: always
+    true subschemas still mark properties and items as evaluated.
+    """
+    if optimizer.pinned(schema) or optimizer.unevaluated:
+        return schema
+    folded = dict(schema)
+    moves: Dict[Path, Path] = {}
+    for keyword in TRUE_DEFAULTS:
+        if keyword in folded and _always_true(folded[keyword]):
+            del folded[keyword]
+    if "if" in folded and "then" not in folded and "else" not in folded:
+        del folded["if"]
+    if "additionalProperties" not in folded:
+        for keyword in ("properties", "patternProperties"):
+            if isinstance(folded.get(keyword), dict):
+                folded[keyword] = {
+                    name: member
+                    for name, member in folded[keyword].items()
+                    if not _always_true(member)
+                }
+    for keyword in ("dependentSchemas", "dependencies"):
+        if isinstance(folded.get(keyword), dict):
+            folded[keyword] = {
+                name: member
+                for name, member in folded[keyword].items()
+                if not _always_true(member)
+            }
+    if "discriminator" not in folded:
+        # discriminators select among members themselves
+        if isinstance(folded.get("anyOf"), list) and any(
+            _always_true(member) for member in folded["anyOf"]
+        ):
+            del folded["anyOf"]
+        if isinstance(folded.get("allOf"), list):
+            kept = [
+                index
+                for index, member in enumerate(folded["allOf"])
+                if not _always_true(member)
+            ]
+            folded["allOf"] = [folded["allOf"][index] for index in kept]
+            moves.update(
+                (("allOf", new), ("allOf", old))
+                for new, old in enumerate(kept)
+                if new != old
+            )
+    for keyword in (
+        "properties",
+        "patternProperties",
+        "dependentSchemas",
+        "dependencies",
+        "allOf",
+    ):
+        if keyword in folded and not folded[keyword]:
+            del folded[keyword]
+    if folded == schema:
+        return schema
+    optimizer.moved(schema, folded, moves)
+    return folded
+
+
+def flatten_all_of(
+    optimizer: Optimizer, schema: Dict[Any, Any]
+) -> Dict[Any, Any]:
+    """Merge members of ``allOf``, referenced or not, into the schema
+    when that doesn't change which instances are valid.
+
+    Nothing is merged when ``unevaluated*`` keywords are used, since
+    merging can move keywords out of reach of those that see their
+    annotations.
+    """
+    if (
+        not isinstance(schema.get("allOf"), list)
+        or "discriminator" in schema
+        or optimizer.pinned(schema)
+        or optimizer.unevaluated
+    ):
+        return schema
+    base = {
+        keyword: value
+        for keyword, value in schema.items()
+        if keyword != "allOf"
+    }
+    optimizer.moved(schema, base, {})
+    return optimizer.flatten(
+        [((), base)]
+        + [
+            (optimizer.origin(schema, ("allOf", index)), member)
+            for index, member in enumerate(schema["allOf"])
+        ]
+    )
+
+
+def hoist_checks(
+    optimizer: Optimizer, schema: Dict[Any, Any]
+) -> Dict[Any, Any]:
+    """Move keywords checked in constant time ahead of the others, so
+    an invalid instance fails before its subschemas are validated when
+    only the first error is needed, like ``is_valid`` does."""
+    order = sorted(schema, key=lambda keyword: keyword not in CONSTANT)
+    if order == list(schema):
+        return schema
+    return {keyword: schema[keyword] for keyword in order}
+
+
+PASSES: Tuple[SchemaPass, ...] = (
+    strip_annotations,
+    fold_defaults,
+    fold_always_true,
+    flatten_all_of,
+    hoist_checks,
+)
+
+
+def optimize_schema(
+    schema: Any,
+    referrer: Any = None,
+    passes: Iterable[SchemaPass] = PASSES,
+) -> OptimizedSchema:
+    """Rewrite schema for faster validation.
+
+    The schema and what it references are rewritten by ``passes``, in
+    order, each schema after its subschemas. By default annotations
+    are stripped, keywords with default values and subschemas every
+    instance is valid against are dropped, ``allOf`` is flattened and
+    constant time checks come first.
+
+    Members of ``allOf`` are merged into the schema they're in when
+    that doesn't change which instances are valid, so an object of a
+    schema built by inheritance is checked once rather than once per
+    ancestor. Properties are combined, ``required`` lists joined and
+    equal keywords kept once. Members with conflicting or
+    interdependent keywords, such as ``additionalProperties`` next to
+    properties of other members, stay in ``allOf``, and so does
+    ``allOf`` of schemas with a discriminator or references into them.
+
+    ``referrer`` is the document references are resolved against,
+    schema itself by default; only local references are followed and
+    optimized. Neither is modified.
+    """
+    if referrer is None:
+        referrer = schema
+    optimizer = Optimizer(referrer, passes)
+    optimizer.pin(schema)
+    optimized = optimizer.schema(schema)
+    replacements = dict(optimizer.targets)
+    path = optimizer.paths.get(id(schema))
+    if path is not None:
+        replacements[path] = optimized
+    return OptimizedSchema(
+        optimized, _substitute(referrer, replacements), optimizer.origins
+    )
@@ -0,0 +1,346 @@
+import os
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from jsonschema.exceptions import RefResolutionError
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator import _validators as oas_validators
+from openapi_schema_validator._walk import Token
+from openapi_schema_validator._walk import relocate
+from openapi_schema_validator.metrics import Metrics
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# validator of the worker process, set when it starts
+_validator: Optional[Validator] = None
+
+
+def _initialize(validator: Validator) -> None:
+    global _validator
+    _validator = validator
+
+
+def _walk_errors(
+    errors: Iterable[ValidationError],
+) -> Iterator[ValidationError]:
+    for error in errors:
+        yield error
+        yield from _walk_errors(error.context)
+
+
+def _subschema(ref: Optional[str], pointer: List[Token]) -> Any:
+    # subschemas are looked up in the worker's copy of the schema, so
+    # keyword caches keyed by their identity don't grow with chunks
+    assert _validator is not None
+    if ref is None:
+        schema = _validator.schema
+    else:
+        _, schema = _validator.resolver.resolve(ref)
+    for token in pointer:
+        schema = schema[token]
+    return schema
+
+
+def _validate_chunk(
+    ref: Optional[str],
+    pointer: List[Token],
+    scope: str,
+    start: int,
+    items: List[Any],
+) -> List[ValidationError]:
+    assert _validator is not None
+    validator = _validator.evolve(schema=_subschema(ref, pointer))
+    validator.resolver.push_scope(scope)
+    try:
+        errors = []
+        for index, item in enumerate(items, start):
+            for error in validator.iter_errors(item):
+                error.path.appendleft(index)
+                errors.append(error)
+        # type checkers aren't always picklable, the parent process
+        # puts its own back
+        for error in _walk_errors(errors):
+            error._type_checker = None
+        return errors
+    finally:
+        validator.resolver.pop_scope()
+
+
+class _Split(NamedTuple):
+    path: List[Token]
+    schema_path: List[Token]
+    # location of the items schema: the reference it's under, or the
+    # root schema if None, and the pointer from there
+    ref: Optional[str]
+    pointer: List[Token]
+    scope: str
+    items: List[Any]
+
+
+class _Planner:
+    """Finds arrays whose items can be validated apart from the rest.
+
+    Only schemas applying to a node unconditionally are followed:
+    properties and references without validating siblings. A split
+    array's ``items`` is left out of the schema of the rest, called its
+    shell; keywords looking at the array as a whole, like
+    ``uniqueItems`` or ``contains``, stay there.
+    """
+
+    def __init__(self, validator: Validator, chunk_size: int):
+        self.validator = validator
+        self.chunk_size = chunk_size
+        self.splits: List[_Split] = []
+
+    def shell(
+        self,
+        schema: Any,
+        instance: Any,
+        path: List[Token],
+        schema_path: List[Token],
+        refs: Optional[Set[str]] = None,
+        ref: Optional[str] = None,
+        pointer: Optional[List[Token]] = None,
+    ) -> Any:
+        validator = self.validator
+        pointer = pointer or []
+        if (
+            not isinstance(schema, dict)
+            or validator.ID_OF(schema)
+            or "unevaluatedItems" in schema
+            or "unevaluatedProperties" in schema
+        ):
+            return schema
+        if "$ref" in schema:
+            return self._reference(schema, instance, path, schema_path, refs)
+
+        split = False
+        shells: Dict[str, Any] = {}
+        if isinstance(instance, list):
+            items = schema.get("items")
+            if (
+                isinstance(items, dict)
+                and "prefixItems" not in schema
+                and validator.sampling is None
+                and len(instance) >= self.chunk_size
+            ):
+                self.splits.append(
+                    _Split(
+                        path,
+                        schema_path + ["items"],
+                        ref,
+                        pointer + ["items"],
+                        validator.resolver.resolution_scope,
+                        instance,
+                    )
+                )
+                split = True
+        elif (
+            isinstance(instance, dict) and "properties" in validator.VALIDATORS
+        ):
+            properties = schema.get("properties")
+            if isinstance(properties, dict):
+                for name, subschema in properties.items():
+                    if not isinstance(instance.get(name), (dict, list)):
+                        continue
+                    shell = self.shell(
+                        subschema,
+                        instance[name],
+                        path + [name],
+                        schema_path + ["properties", name],
+                        ref=ref,
+                        pointer=pointer + ["properties", name],
+                    )
+                    if shell is not subschema:
+                        shells[name] = shell
+        if not split and not shells:
+            return schema
+        shell = dict(schema)
+        if split:
+            del shell["items"]
+        if shells:
+            shell["properties"] = {**schema["properties"], **shells}
+        return shell
+
+    def _reference(
+        self,
+        schema: Dict[str, Any],
+        instance: Any,
+        path: List[Token],
+        schema_path: List[Token],
+        refs: Optional[Set[str]],
+    ) -> Any:
+        # the target replaces the reference, which isn't in schema
+        # paths; siblings that validate would have to be kept with it
+        validator = self.validator
+        ref = schema["$ref"]
+        if (
+            not isinstance(ref, str)
+            or not ref.startswith("#")
+            or any(
+                validator.VALIDATORS.get(keyword)
+                not in (None, oas_validators.not_implemented)
+                for keyword in schema
+                if keyword != "$ref"
+            )
+        ):
+            return schema
+        refs = refs or set()
+        if ref in refs:
+            return schema
+        try:
+            _, resolved = validator.resolver.resolve(ref)
+        except RefResolutionError:
+            return schema
+        # required of the parent looks up readOnly and writeOnly
+        # of the reference, not of its target
+        if isinstance(resolved, dict) and (
+            "readOnly" in resolved or "writeOnly" in resolved
+        ):
+            return schema
+        shell = self.shell(
+            resolved, instance, path, schema_path, refs | {ref}, ref
+        )
+        return schema if shell is resolved else shell
+
+
+class ParallelValidator:
+    """Validates large arrays of an instance in worker processes.
+
+    Items of arrays with at least ``chunk_size`` items are validated
+    in chunks by a pool of ``max_workers`` processes, the rest of the
+    instance by the calling one, at the same time. Arrays are split
+    when their schema applies unconditionally, through properties and
+    references from the root; keywords checking an array as a whole,
+    such as ``uniqueItems``, are checked by the calling process. Only
+    chunks are sent to workers, the validator once per worker, so it
+    must be picklable.
+
+    Errors are the same as those of the validator, with paths relative
+    to the instance, though in a different order: errors of the rest
+    of the instance first, then those of chunks in document order.
+    Validators with resource limits validate sequentially, as limits
+    apply to whole validations.
+
+    Use it as a context manager, or call ``close``, to shut the pool
+    down.
+    """
+
+    def __init__(
+        self,
+        validator: Validator,
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        mp_context: Optional[BaseContext] = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.validator = validator
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelValidator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_initialize,
+                initargs=(self.validator,),
+            )
+        return self._executor
+
+    def iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        validator = self.validator
+        if validator.limits is not None:
+            errors: Iterator[ValidationError]
+            errors = validator.iter_errors(instance)
+            return errors
+        errors = self._iter_errors(instance)
+        if validator.metrics is None:
+            return errors
+        metrics: Metrics = validator.metrics
+        return metrics.observe(validator.schema, instance, errors)
+
+    def _iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        validator = self.validator
+        planner = _Planner(validator, self.chunk_size)
+        shell = planner.shell(validator.schema, instance, [], [])
+        if not planner.splits:
+            yield from validator.iter_errors(instance)
+            return
+
+        chunks = (
+            (split, start)
+            for split in planner.splits
+            for start in range(0, len(split.items), self.chunk_size)
+        )
+        # chunks are sent a few at a time, so they aren't all
+        # serialized at once
+        window = 2 * (self.max_workers or os.cpu_count() or 1)
+        pending: Deque[Tuple[_Split, "Future[List[ValidationError]]"]]
+        pending = deque()
+
+        def submit() -> None:
+            for split, start in chunks:
+                future = self.executor.submit(
+                    _validate_chunk,
+                    split.ref,
+                    split.pointer,
+                    split.scope,
+                    start,
+                    split.items[start : start + self.chunk_size],
+                )
+                pending.append((split, future))
+                if len(pending) >= window:
+                    return
+
+        try:
+            submit()
+            yield from validator.evolve(schema=shell).iter_errors(instance)
+            while pending:
+                split, future = pending.popleft()
+                chunk_errors: List[ValidationError] = future.result()
+                submit()
+                for error in _walk_errors(chunk_errors):
+                    error._type_checker = validator.TYPE_CHECKER
+                yield from relocate(
+                    chunk_errors, split.path, split.schema_path
+                )
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def is_valid(self, instance: Any) -> bool:
+        return next(self.iter_errors(instance), None) is None
+
+    def validate(self, instance: Any) -> None:
+        for error in self.iter_errors(instance):
+            raise error
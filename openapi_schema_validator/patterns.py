@@ -0,0 +1,491 @@
+import re
+from typing import Any
+from typing import Callable
+from typing import FrozenSet
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Pattern
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from openapi_schema_validator.limits import LimitExceededError
+
+try:
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+Node = Tuple[Any, Any]
+Predicate = Callable[[str], bool]
+
+MAXREPEAT = sre_constants.MAXREPEAT
+REPEATS = (
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+)
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: r"\d",
+    sre_constants.CATEGORY_NOT_DIGIT: r"\D",
+    sre_constants.CATEGORY_SPACE: r"\s",
+    sre_constants.CATEGORY_NOT_SPACE: r"\S",
+    sre_constants.CATEGORY_WORD: r"\w",
+    sre_constants.CATEGORY_NOT_WORD: r"\W",
+}
+# characters single character matchers are compared on
+SAMPLE = [chr(code) for code in range(0x250)] + [
+    chr(code) for code in (0x391, 0x430, 0x660, 0x2028, 0x3000, 0x4E00, 0xFF10)
+]
+# largest program of a linear pattern, counted repeats are expanded
+MAX_PROGRAM_SIZE = 10000
+
+CHAR, SPLIT, JMP, ASSERT, MATCH = range(5)
+
+
+def _predicate(op: Any, av: Any, flags: int) -> Optional[Predicate]:
+    """Predicate of a node matching a single character, None for others."""
+    if op is sre_constants.LITERAL or op is sre_constants.NOT_LITERAL:
+        char = chr(av)
+        if flags & re.IGNORECASE:
+            pattern = re.compile(re.escape(char), flags)
+            if op is sre_constants.LITERAL:
+                return lambda each: pattern.match(each) is not None
+            return lambda each: pattern.match(each) is None
+        if op is sre_constants.LITERAL:
+            return lambda each: each == char
+        return lambda each: each != char
+    if op is sre_constants.ANY:
+        if flags & re.DOTALL:
+            return lambda each: True
+        return lambda each: each != "\n"
+    if op is sre_constants.IN:
+        negate = bool(av) and av[0][0] is sre_constants.NEGATE
+        items = [
+            _item_predicate(item_op, item_av, flags)
+            for item_op, item_av in av[negate:]
+        ]
+        if negate:
+            return lambda each: not any(item(each) for item in items)
+        return lambda each: any(item(each) for item in items)
+    return None
+
+
+def _item_predicate(op: Any, av: Any, flags: int) -> Predicate:
+    if op is sre_constants.RANGE:
+        low, high = av
+        if flags & re.IGNORECASE:
+            pattern = re.compile(
+                f"[{re.escape(chr(low))}-{re.escape(chr(high))}]", flags
+            )
+            return lambda each: pattern.match(each) is not None
+        return lambda each: low <= ord(each) <= high
+    if op is sre_constants.CATEGORY:
+        try:
+            pattern = re.compile(CATEGORIES[av], flags & re.ASCII)
+        except KeyError:
+            raise ValueError(f"Category {av} is not supported")
+        return lambda each: pattern.match(each) is not None
+    predicate = _predicate(op, av, flags)
+    if predicate is None:
+        raise ValueError(f"Set item {op} is not supported")
+    return predicate
+
+
+def _charset(op: Any, av: Any, flags: int) -> Optional[FrozenSet[str]]:
+    """Sample characters matched by a single character node."""
+    try:
+        predicate = _predicate(op, av, flags)
+    except ValueError:
+        return None
+    if predicate is None:
+        return None
+    return frozenset(char for char in SAMPLE if predicate(char))
+
+
+def _nullable(items: Sequence[Node]) -> bool:
+    for op, av in items:
+        if op in REPEATS:
+            if av[0] and not _nullable(av[2]):
+                return False
+        elif op is sre_constants.SUBPATTERN:
+            if not _nullable(av[3]):
+                return False
+        elif op is sre_constants.BRANCH:
+            if not any(_nullable(branch) for branch in av[1]):
+                return False
+        elif op in (
+            sre_constants.LITERAL,
+            sre_constants.NOT_LITERAL,
+            sre_constants.ANY,
+            sre_constants.IN,
+            sre_constants.GROUPREF,
+        ):
+            return False
+    return True
+
+
+def _first(items: Sequence[Node], flags: int) -> Optional[FrozenSet[str]]:
+    """Sample characters a match of items can start with, None if unknown."""
+    chars: FrozenSet[str] = frozenset()
+    for op, av in items:
+        if op is sre_constants.AT:
+            continue
+        if op in REPEATS:
+            first = _first(av[2], flags)
+            nullable = not av[0] or _nullable(av[2])
+        elif op is sre_constants.SUBPATTERN:
+            first = _first(av[3], flags | av[1])
+            nullable = _nullable(av[3])
+        elif op is sre_constants.BRANCH:
+            firsts = [_first(branch, flags) for branch in av[1]]
+            if any(each is None for each in firsts):
+                return None
+            first = frozenset().union(*firsts)  # type: ignore[arg-type]
+            nullable = any(_nullable(branch) for branch in av[1])
+        else:
+            first = _charset(op, av, flags)
+            nullable = False
+        if first is None:
+            return None
+        chars |= first
+        if not nullable:
+            break
+    return chars
+
+
+def _flatten(items: Sequence[Node], flags: int) -> List[Tuple[Node, int]]:
+    """Items with groups replaced by their content."""
+    flat = []
+    for op, av in items:
+        if op is sre_constants.SUBPATTERN:
+            flat.extend(_flatten(av[3], flags | av[1]))
+        else:
+            flat.append(((op, av), flags))
+    return flat
+
+
+def _is_nested_quantifier(body: Sequence[Node], flags: int) -> bool:
+    """Whether iterations of body can be split between an inner repeat.
+
+    That's the case if body has a repeat of variable length and other
+    items of body are optional or could be matched by it.
+    """
+    flat = _flatten(body, flags)
+    for index, ((op, av), inner_flags) in enumerate(flat):
+        if op not in REPEATS or av[1] <= max(av[0], 1):
+            continue
+        inner = _first(av[2], inner_flags)
+        if all(
+            _absorbed(node, node_flags, inner)
+            for node, node_flags in flat[:index] + flat[index + 1 :]
+        ):
+            return True
+    return False
+
+
+def _absorbed(node: Node, flags: int, chars: Optional[FrozenSet[str]]) -> bool:
+    if chars is None or _nullable([node]):
+        return True
+    first = _first([node], flags)
+    return first is None or bool(first & chars)
+
+
+def _is_ambiguous_alternation(body: Sequence[Node], flags: int) -> bool:
+    """Whether branches of an alternation in body can start alike.
+
+    Branches sharing a prefix are parsed as the prefix followed by an
+    alternation of the rest, with an empty branch for a branch that is
+    the prefix, like ``(a|ab)`` as ``a(?:|b)``.
+    """
+    for index, ((op, av), branch_flags) in enumerate(_flatten(body, flags)):
+        if op is not sre_constants.BRANCH:
+            continue
+        if index and any(not branch for branch in av[1]):
+            return True
+        seen: FrozenSet[str] = frozenset()
+        for branch in av[1]:
+            first = _first(branch, branch_flags)
+            if first is None or first & seen:
+                return True
+            seen |= first
+    return False
+
+
+def _is_ambiguous_option(body: Sequence[Node], flags: int) -> bool:
+    """Whether an optional item of body can start like body, so a
+    character can be matched by it or by the next iteration."""
+    start = _first(body, flags)
+    for node, node_flags in _flatten(body, flags):
+        if node[0] is sre_constants.AT or not _nullable([node]):
+            continue
+        first = _first([node], node_flags)
+        if first is None or start is None or first & start:
+            return True
+    return False
+
+
+def _children(op: Any, av: Any) -> List[Tuple[Sequence[Node], int]]:
+    if op in REPEATS or op is getattr(
+        sre_constants, "POSSESSIVE_REPEAT", None
+    ):
+        return [(av[2], 0)]
+    if op is sre_constants.SUBPATTERN:
+        return [(av[3], av[1])]
+    if op is sre_constants.BRANCH:
+        return [(branch, 0) for branch in av[1]]
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [(av[1], 0)]
+    if op is sre_constants.GROUPREF_EXISTS:
+        return [(branch, 0) for branch in av[1:] if branch is not None]
+    if op is getattr(sre_constants, "ATOMIC_GROUP", None):
+        return [(av, 0)]
+    return []
+
+
+def _analyze(items: Sequence[Node], flags: int, issues: List[str]) -> None:
+    for op, av in items:
+        if op in REPEATS and av[1] == MAXREPEAT:
+            if _is_nested_quantifier(av[2], flags):
+                issues.append(
+                    "nested quantifier: a repeated group contains a "
+                    "repetition that can match the same input"
+                )
+            elif _is_ambiguous_alternation(av[2], flags):
+                issues.append(
+                    "ambiguous alternation: a repeated alternation has "
+                    "branches that can match the same input"
+                )
+            elif _is_ambiguous_option(av[2], flags):
+                issues.append(
+                    "ambiguous option: a repeated group has an optional "
+                    "part that can match the start of the group"
+                )
+        for children, add_flags in _children(op, av):
+            _analyze(children, flags | add_flags, issues)
+
+
+def analyze_pattern(pattern: str) -> List[str]:
+    """Find constructs of pattern prone to catastrophic backtracking.
+
+    Flags unbounded repetitions of groups that contain a repetition
+    which can match the same characters as the rest of the group, like
+    ``(a+)+`` or ``(\\w+\\s?)*``, of alternations with branches that
+    can start with the same character, like ``(a|ab)*``, and of groups
+    with an optional part that can start like the group, like
+    ``(a?a)*``. The analysis is conservative and may flag patterns that
+    are safe.
+
+    Raises re.error if pattern is not valid.
+    """
+    parsed = sre_parse.parse(pattern)
+    issues: List[str] = []
+    _analyze(list(parsed), parsed.state.flags, issues)
+    return issues
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.program: List[List[Any]] = []
+
+    def emit(self, kind: int, a: Any = None, b: Any = None) -> int:
+        if len(self.program) >= MAX_PROGRAM_SIZE:
+            raise ValueError("Pattern is too large")
+        self.program.append([kind, a, b])
+        return len(self.program) - 1
+
+    def items(self, items: Sequence[Node], flags: int) -> None:
+        for op, av in items:
+            self.node(op, av, flags)
+
+    def node(self, op: Any, av: Any, flags: int) -> None:
+        predicate = _predicate(op, av, flags)
+        if predicate is not None:
+            self.emit(CHAR, predicate)
+        elif op is sre_constants.AT:
+            self.emit(ASSERT, av, flags)
+        elif op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, items = av
+            self.items(items, (flags | add_flags) & ~del_flags)
+        elif op is sre_constants.BRANCH:
+            self.branch(av[1], flags)
+        elif op in REPEATS:
+            low, high, body = av
+            self.repeat(low, high, body, flags)
+        else:
+            raise ValueError(f"{op} is not supported")
+
+    def branch(self, branches: Sequence[Sequence[Node]], flags: int) -> None:
+        jumps = []
+        for branch in branches[:-1]:
+            split = self.emit(SPLIT, len(self.program) + 1)
+            self.items(branch, flags)
+            jumps.append(self.emit(JMP))
+            self.program[split][2] = len(self.program)
+        self.items(branches[-1], flags)
+        for jump in jumps:
+            self.program[jump][1] = len(self.program)
+
+    def repeat(
+        self, low: int, high: int, body: Sequence[Node], flags: int
+    ) -> None:
+        for _ in range(low):
+            self.items(body, flags)
+        if high == MAXREPEAT:
+            split = self.emit(SPLIT, len(self.program) + 1)
+            self.items(body, flags)
+            self.emit(JMP, split)
+            self.program[split][2] = len(self.program)
+            return
+        splits = []
+        for _ in range(high - low):
+            splits.append(self.emit(SPLIT, len(self.program) + 1))
+            self.items(body, flags)
+        for split in splits:
+            self.program[split][2] = len(self.program)
+
+
+def _is_word(char: str, flags: int) -> bool:
+    if flags & re.ASCII:
+        return char.isascii() and (char.isalnum() or char == "_")
+    return char.isalnum() or char == "_"
+
+
+def _at(code: Any, flags: int, string: str, pos: int) -> bool:
+    end = len(string)
+    multiline = flags & re.MULTILINE
+    if code is sre_constants.AT_BEGINNING:
+        return pos == 0 or bool(multiline) and string[pos - 1] == "\n"
+    if code is sre_constants.AT_BEGINNING_STRING:
+        return pos == 0
+    if code is sre_constants.AT_END:
+        if multiline:
+            return pos == end or string[pos] == "\n"
+        return pos == end or pos == end - 1 and string[pos] == "\n"
+    if code is sre_constants.AT_END_STRING:
+        return pos == end
+    before = pos > 0 and _is_word(string[pos - 1], flags)
+    after = pos < end and _is_word(string[pos], flags)
+    if code is sre_constants.AT_BOUNDARY:
+        return before != after
+    if code is sre_constants.AT_NON_BOUNDARY:
+        return before == after
+    raise ValueError(f"{code} is not supported")
+
+
+class LinearPattern:
+    """Regular expression matched in time linear in the string length.
+
+    Strings are matched by simulating a nondeterministic automaton of
+    the pattern, which never backtracks. Backreferences, lookarounds,
+    atomic groups and possessive repeats are not supported. A match
+    takes at most ``max_steps`` steps, proportional to the pattern size
+    times the string length, if given.
+
+    Raises ValueError if pattern is not supported and re.error if it's
+    not valid.
+    """
+
+    def __init__(self, pattern: str, max_steps: Optional[int] = None):
+        self.pattern = pattern
+        self.max_steps = max_steps
+        parsed = sre_parse.parse(pattern)
+        compiler = _Compiler()
+        compiler.items(list(parsed), parsed.state.flags)
+        compiler.emit(MATCH)
+        self._program = [tuple(each) for each in compiler.program]
+        first = list(parsed.data[:1])
+        self._anchored = first == [
+            (sre_constants.AT, sre_constants.AT_BEGINNING_STRING)
+        ] or (
+            first == [(sre_constants.AT, sre_constants.AT_BEGINNING)]
+            and not parsed.state.flags & re.MULTILINE
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.pattern!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # the program holds closures, it's compiled again instead
+        return self.__class__, (self.pattern, self.max_steps)
+
+    def search(self, string: str) -> bool:
+        """Whether pattern matches anywhere in string.
+
+        Raises LimitExceededError if matching takes more than
+        ``max_steps`` steps.
+        """
+        program = self._program
+        marks = [-1] * len(program)
+        steps = 0
+
+        def add(threads: List[int], pc: int, pos: int) -> bool:
+            nonlocal steps
+            stack = [pc]
+            while stack:
+                pc = stack.pop()
+                if marks[pc] == pos:
+                    continue
+                marks[pc] = pos
+                steps += 1
+                kind, a, b = program[pc]
+                if kind == CHAR:
+                    threads.append(pc)
+                elif kind == SPLIT:
+                    stack.append(b)
+                    stack.append(a)
+                elif kind == JMP:
+                    stack.append(a)
+                elif kind == ASSERT:
+                    if _at(a, b, string, pos):
+                        stack.append(pc + 1)
+                else:
+                    return True
+            return False
+
+        threads: List[int] = []
+        if add(threads, 0, 0):
+            return True
+        for pos, char in enumerate(string):
+            matched: List[int] = []
+            for pc in threads:
+                steps += 1
+                if program[pc][1](char) and add(matched, pc + 1, pos + 1):
+                    return True
+            if not self._anchored and add(matched, 0, pos + 1):
+                return True
+            if self.max_steps is not None and steps > self.max_steps:
+                raise LimitExceededError(
+                    f"Matching {self.pattern!r} took more than "
+                    f"{self.max_steps} steps",
+                    "max_pattern_steps",
+                )
+            if not matched and self._anchored:
+                return False
+            threads = matched
+        return False
+
+
+class PatternPolicy(NamedTuple):
+    """How validators match ``pattern`` and ``patternProperties``.
+
+    With ``linear="flagged"`` patterns flagged by ``analyze_pattern``
+    are matched with ``LinearPattern``, with ``linear="all"`` every
+    supported pattern is. Patterns the linear engine doesn't support
+    use ``re``. ``max_steps`` limits steps of each linear match.
+    """
+
+    linear: str = "flagged"
+    max_steps: Optional[int] = None
+
+    def compile(
+        self, pattern: str, issues: Sequence[str]
+    ) -> Union[Pattern[str], LinearPattern]:
+        if self.linear == "all" or issues:
+            try:
+                return LinearPattern(pattern, self.max_steps)
+            except ValueError:
+                pass
+        return re.compile(pattern)
@@ -0,0 +1,218 @@
+import threading
+import time
+from random import Random
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urldefrag
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._utils import format_pointer
+from openapi_schema_validator._walk import object_paths
+
+Stack = Tuple[str, ...]
+
+
+class LocationStats(NamedTuple):
+    visits: int
+    # seconds spent in the location itself and including its subschemas
+    self_time: float
+    total_time: float
+
+
+def _index(document: Any) -> Dict[int, str]:
+    # pointers of all objects in document, schemas or not
+    return {
+        key: format_pointer(path)
+        for key, path in object_paths(document).items()
+    }
+
+
+class _Trace:
+    """Time and visits of schema locations in a single validation."""
+
+    def __init__(self, timer: Callable[[], float]):
+        self.timer = timer
+        self.stacks: Dict[Stack, List[Any]] = {}
+        self._stack: List[Stack] = []
+        self._children: List[float] = []
+
+    def frame(
+        self, errors: Iterator[ValidationError], location: str
+    ) -> Iterator[ValidationError]:
+        # errors are produced lazily, so only time spent
+        # producing them is attributed to the location
+        timer = self.timer
+        stack = self._stack
+        children = self._children
+        stats = None
+        while True:
+            if stats is None:
+                key = (stack[-1] if stack else ()) + (location,)
+                stats = self.stacks.setdefault(key, [0, 0.0, 0.0])
+                stats[0] += 1
+            stack.append(key)
+            children.append(0.0)
+            start = timer()
+            try:
+                error = next(errors)
+            except StopIteration:
+                return
+            finally:
+                elapsed = timer() - start
+                stack.pop()
+                stats[1] += elapsed - children.pop()
+                stats[2] += elapsed
+                if children:
+                    children[-1] += elapsed
+            yield error
+
+
+class Profiler:
+    """Attributes validation time to schema locations.
+
+    Pass it to validators as ``profiler`` to record, for a ``rate`` of
+    validations chosen at random, how often every schema location was
+    visited and how long it took, by stack of locations it was reached
+    through. Locations are JSON pointers into the document the schema
+    was resolved from, e.g. ``#/components/schemas/Pet``; references,
+    including discriminator mappings, continue at their target. Time
+    of schemas without a location is attributed to their parent.
+    Safe to share between threads and validators.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        seed: Optional[int] = None,
+        timer: Callable[[], float] = time.perf_counter,
+    ):
+        if not 0 < rate <= 1:
+            raise ValueError("rate must be in (0, 1]")
+        self.rate = rate
+        self.seed = seed
+        self.timer = timer
+        self._random = Random(seed)
+        self._lock = threading.Lock()
+        self._documents: Dict[int, Tuple[Any, Dict[int, str]]] = {}
+        self.reset()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # unpickled profilers start empty
+        return self.__class__, (self.rate, self.seed, self.timer)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.validations = 0
+            self._stacks: Dict[Stack, List[Any]] = {}
+
+    def start(self) -> Optional[_Trace]:
+        """Trace of a validation, if it's sampled."""
+        if self.rate < 1 and self._random.random() >= self.rate:
+            return None
+        return _Trace(self.timer)
+
+    def finish(
+        self, trace: _Trace, errors: Iterator[ValidationError]
+    ) -> Iterator[ValidationError]:
+        try:
+            yield from errors
+        finally:
+            with self._lock:
+                self.validations += 1
+                for key, (visits, self_time, total) in trace.stacks.items():
+                    stats = self._stacks.setdefault(key, [0, 0.0, 0.0])
+                    stats[0] += visits
+                    stats[1] += self_time
+                    stats[2] += total
+
+    def location(self, validator: Validator, schema: Any) -> Optional[str]:
+        resolver = validator.resolver
+        url = urldefrag(resolver.resolution_scope)[0]
+        for base, document in (
+            ("", resolver.referrer),
+            (url, resolver.store.get(url)),
+        ):
+            if document is None:
+                continue
+            pointer = self._locations(document).get(id(schema))
+            if pointer is not None:
+                return f"{base}#{pointer}"
+        return None
+
+    def _locations(self, document: Any) -> Dict[int, str]:
+        # documents are kept, so their identity can't be reused
+        try:
+            return self._documents[id(document)][1]
+        except KeyError:
+            pass
+        locations = _index(document)
+        with self._lock:
+            self._documents[id(document)] = (document, locations)
+        return locations
+
+    def stacks(self) -> Dict[Stack, LocationStats]:
+        """Statistics by stack of locations."""
+        with self._lock:
+            return {
+                key: LocationStats(*stats)
+                for key, stats in self._stacks.items()
+            }
+
+    def stats(self) -> Dict[str, LocationStats]:
+        """Statistics by location, over all stacks it was reached by."""
+        totals: Dict[str, List[Any]] = {}
+        for key, stats in self.stacks().items():
+            location = key[-1]
+            total = totals.setdefault(location, [0, 0.0, 0.0])
+            total[0] += stats.visits
+            total[1] += stats.self_time
+            # time of recursive visits is included in the outermost one
+            if location not in key[:-1]:
+                total[2] += stats.total_time
+        return {
+            location: LocationStats(*total)
+            for location, total in totals.items()
+        }
+
+    def top(
+        self, n: int = 10, by: str = "self_time"
+    ) -> List[Tuple[str, LocationStats]]:
+        """Locations with the highest ``self_time``, ``total_time``
+        or ``visits``."""
+        stats = self.stats()
+        return sorted(
+            stats.items(),
+            key=lambda item: getattr(item[1], by),
+            reverse=True,
+        )[:n]
+
+    def report(self, n: int = 10, by: str = "self_time") -> str:
+        """Human readable table of the ``top`` locations."""
+        lines = [f"{'self ms':>10} {'total ms':>10} {'visits':>8}  location"]
+        for location, stats in self.top(n, by):
+            lines.append(
+                f"{stats.self_time * 1000:10.3f}"
+                f" {stats.total_time * 1000:10.3f}"
+                f" {stats.visits:8d}  {location}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format of flamegraph tools.
+
+        Every line is a stack of locations separated by semicolons and
+        the time spent in its last location in microseconds.
+        """
+        lines = []
+        for key, stats in sorted(self.stacks().items()):
+            frames = ";".join(location.replace(";", "%3B") for location in key)
+            lines.append(f"{frames} {round(stats.self_time * 1e6)}")
+        return "\n".join(lines) + "\n" if lines else ""
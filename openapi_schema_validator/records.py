@@ -0,0 +1,155 @@
+import sys
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from jsonschema.exceptions import ValidationError
+
+_SCALARS = (str, int, float, bool, type(None))
+_NOT_KEPT = object()
+
+PathElement = Union[str, int]
+
+
+class ErrorRecord:
+    """Compact record of a validation error.
+
+    Keywords, path elements and schema paths are interned, so records
+    of errors raised by the same schema location share them. Scalar
+    instances are kept, but arrays and objects aren't, so records
+    don't keep subtrees of validated documents alive; pass the
+    document to ``to_error`` to look them up again. Causes are
+    dropped along with their tracebacks.
+    """
+
+    __slots__ = (
+        "message",
+        "keyword",
+        "path",
+        "schema_path",
+        "context",
+        "validator_value",
+        "schema",
+        "_instance",
+    )
+
+    def __init__(
+        self,
+        message: str,
+        keyword: Optional[str],
+        path: Tuple[PathElement, ...],
+        schema_path: Tuple[PathElement, ...],
+        context: Tuple["ErrorRecord", ...],
+        validator_value: Any,
+        schema: Any,
+        instance: Any = _NOT_KEPT,
+    ):
+        self.message = message
+        self.keyword = keyword
+        self.path = path
+        self.schema_path = schema_path
+        self.context = context
+        self.validator_value = validator_value
+        self.schema = schema
+        self._instance = instance
+
+    @classmethod
+    def from_error(
+        cls,
+        error: ValidationError,
+        interned: Optional[Dict[Hashable, Any]] = None,
+    ) -> "ErrorRecord":
+        if interned is None:
+            interned = {}
+        instance = error.instance
+        if not isinstance(instance, _SCALARS):
+            instance = _NOT_KEPT
+        keyword = error.validator
+        if isinstance(keyword, str):
+            keyword = sys.intern(keyword)
+        return cls(
+            error.message,
+            keyword,
+            _intern_elements(error.path),
+            _intern_path(error.schema_path, interned),
+            tuple(cls.from_error(each, interned) for each in error.context),
+            error.validator_value,
+            error.schema,
+            instance,
+        )
+
+    @property
+    def has_instance(self) -> bool:
+        return self._instance is not _NOT_KEPT
+
+    def to_error(self, document: Any = _NOT_KEPT) -> ValidationError:
+        """Convert to ValidationError.
+
+        Instances that weren't kept are looked up in document, relative
+        to which the record's path is; otherwise they are left unset.
+        """
+        instance = self._instance
+        if instance is _NOT_KEPT and document is not _NOT_KEPT:
+            instance = document
+            for element in self.path:
+                instance = instance[element]
+        # context paths are relative to the instance of this error
+        context = [each.to_error(instance) for each in self.context]
+        if instance is _NOT_KEPT:
+            return ValidationError(
+                self.message,
+                validator=self.keyword,
+                path=self.path,
+                schema_path=self.schema_path,
+                context=context,
+                validator_value=self.validator_value,
+                schema=self.schema,
+            )
+        return ValidationError(
+            self.message,
+            validator=self.keyword,
+            path=self.path,
+            schema_path=self.schema_path,
+            context=context,
+            validator_value=self.validator_value,
+            instance=instance,
+            schema=self.schema,
+        )
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: {self.message!r}>"
+
+
+def _intern_elements(path: Iterable[PathElement]) -> Tuple[PathElement, ...]:
+    return tuple(
+        sys.intern(element) if type(element) is str else element
+        for element in path
+    )
+
+
+def _intern_path(
+    path: Iterable[PathElement], interned: Dict[Hashable, Any]
+) -> Tuple[PathElement, ...]:
+    elements = _intern_elements(path)
+    shared: Tuple[PathElement, ...] = interned.setdefault(elements, elements)
+    return shared
+
+
+def iter_records(
+    errors: Iterable[ValidationError],
+    interned: Optional[Dict[Hashable, Any]] = None,
+) -> Iterator[ErrorRecord]:
+    """Convert errors to records as they are produced.
+
+    Share ``interned`` between calls to share schema paths between
+    records of several documents.
+    """
+    if interned is None:
+        interned = {}
+    for error in errors:
+        yield ErrorRecord.from_error(error, interned)
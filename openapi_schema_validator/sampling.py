@@ -0,0 +1,106 @@
+from math import ceil
+from random import Random
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from jsonschema.exceptions import ValidationError
+
+Token = Union[str, int]
+
+
+class Sampling:
+    """Validate a sample of elements of arrays instead of all of them.
+
+    Pass it to a validator as ``sampling`` to make ``items`` and
+    ``prefixItems`` check only ``rate`` of the elements of each array,
+    or at most ``count`` of them. Other keywords, including those about
+    whole arrays such as ``minItems`` and ``uniqueItems``, are fully
+    validated.
+
+    Samples are chosen by a random generator seeded with ``seed`` and
+    the location of the array, so validating a document again checks
+    the same elements. Indexes checked in sampled arrays by the last
+    finished validation are in ``checked``, by path of the array;
+    arrays not in it were checked fully. Arrays reached without their
+    parent's keywords, e.g. by contains or propertyNames, are sampled
+    but their location is not tracked. Safe to share between threads,
+    as locations are tracked per validation.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        count: Optional[int] = None,
+        seed: int = 0,
+    ):
+        if (rate is None) == (count is None):
+            raise ValueError("Either rate or count is required")
+        if rate is not None and not 0 < rate <= 1:
+            raise ValueError(f"Rate must be in (0, 1], got {rate!r}")
+        if count is not None and count < 1:
+            raise ValueError(f"Count must be positive, got {count!r}")
+        self.rate = rate
+        self.count = count
+        self.seed = seed
+        self.checked: Dict[Tuple[Token, ...], List[int]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__}(rate={self.rate!r}, "
+            f"count={self.count!r}, seed={self.seed!r})>"
+        )
+
+    def iter_errors(
+        self, sample: "Sample", errors: Iterator[ValidationError]
+    ) -> Iterator[ValidationError]:
+        try:
+            yield from errors
+        finally:
+            self.checked = sample.checked
+
+
+class Sample:
+    """Array elements sampled by a single validation."""
+
+    def __init__(self, sampling: Sampling):
+        self.sampling = sampling
+        self.checked: Dict[Tuple[Token, ...], List[int]] = {}
+        self.path: List[Token] = []
+
+    def sample(self, instance: Sequence[object]) -> Sequence[int]:
+        """Indexes of elements of array instance to check, in order."""
+        sampling = self.sampling
+        total = len(instance)
+        if sampling.count is not None:
+            size = sampling.count
+        else:
+            assert sampling.rate is not None
+            size = ceil(total * sampling.rate)
+        if size >= total:
+            return range(total)
+        path = tuple(self.path)
+        random = Random(repr((sampling.seed, path)))
+        indexes = sorted(random.sample(range(total), size))
+        self.checked[path] = indexes
+        return indexes
+
+    def descend(
+        self, errors: Iterator[ValidationError], path: Token
+    ) -> Iterator[ValidationError]:
+        # location is left before every yield, so it's not stale if the
+        # consumer stops iterating
+        self.path.append(path)
+        try:
+            for error in errors:
+                self.path.pop()
+                try:
+                    yield error
+                finally:
+                    self.path.append(path)
+        finally:
+            self.path.pop()
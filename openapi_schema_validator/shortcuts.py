@@ -1,6 +1,8 @@
+from itertools import islice
 from typing import Any
 from typing import Hashable
 from typing import Mapping
+from typing import Optional
 from typing import Type
 
 from jsonschema.exceptions import best_match
@@ -14,10 +16,27 @@ def validate(
     schema: Mapping[Hashable, Any],
     cls: Type[Validator] = OAS31Validator,
     *args: Any,
+    fail_fast: bool = False,
+    best_match_window: Optional[int] = None,
     **kwargs: Any
 ) -> None:
+    """Validate instance against schema and raise the best matching error.
+
+    By default every error is ranked and the most relevant one is raised.
+    With ``fail_fast`` validation stops at the first error found. With
+    ``best_match_window`` it stops after that many errors and raises the
+    most relevant of them. Errors are ranked as they are produced, so
+    only the current best one is kept in memory.
+    """
     cls.check_schema(schema)
     validator = cls(schema, *args, **kwargs)
-    error = best_match(validator.iter_errors(instance))
+    errors = validator.iter_errors(instance)
+    if fail_fast:
+        best_match_window = 1
+    if best_match_window is not None:
+        if best_match_window < 1:
+            raise ValueError("best_match_window must be a positive integer")
+        errors = islice(errors, best_match_window)
+    error = best_match(errors)
     if error is not None:
         raise error
@@ -0,0 +1,184 @@
+from typing import Any
+from typing import Hashable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+from openapi_schema_validator._utils import parse_pointer
+from openapi_schema_validator._walk import Token
+from openapi_schema_validator._walk import discriminator_ref
+from openapi_schema_validator._walk import is_discriminated
+from openapi_schema_validator._walk import item_schemas
+from openapi_schema_validator._walk import locate
+from openapi_schema_validator._walk import property_schemas
+from openapi_schema_validator._walk import relocate
+
+
+def iter_errors(
+    validator: Validator, document: Any, pointer: str
+) -> Iterator[ValidationError]:
+    """Validate only the node of document at JSON pointer.
+
+    Subschemas applying to the node are found by following properties,
+    patternProperties, additionalProperties, prefixItems, items, $ref,
+    allOf and discriminator mappings of its ancestors, which are not
+    validated themselves. If no branch of an ancestor's oneOf or anyOf
+    without a discriminator accepts the node, a single error for the
+    node is reported with errors of all branches as context. Error
+    paths are relative to the document root.
+
+    Raises KeyError or IndexError if there's no node at pointer.
+    """
+    try:
+        _, tokens = locate(document, parse_pointer(pointer))
+    except ValueError as exc:
+        if not pointer or pointer[0] != "/":
+            raise
+        raise KeyError(pointer) from exc
+    return _iter_errors(validator, document, validator.schema, tokens, [], [])
+
+
+def _iter_errors(
+    validator: Validator,
+    instance: Any,
+    schema: Any,
+    tokens: List[Token],
+    path: List[Token],
+    schema_path: List[Token],
+) -> Iterator[ValidationError]:
+    if not tokens:
+        errors = validator.evolve(schema=schema).iter_errors(instance)
+        yield from relocate(errors, path, schema_path)
+        return
+    if not isinstance(schema, Mapping):
+        return
+
+    scope = validator.ID_OF(schema)
+    if scope:
+        validator.resolver.push_scope(scope)
+    try:
+        yield from _iter_ancestor_errors(
+            validator, instance, schema, tokens, path, schema_path
+        )
+    finally:
+        if scope:
+            validator.resolver.pop_scope()
+
+
+def _iter_ancestor_errors(
+    validator: Validator,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+    tokens: List[Token],
+    path: List[Token],
+    schema_path: List[Token],
+) -> Iterator[ValidationError]:
+    if "$ref" in schema:
+        scope, resolved = validator.resolver.resolve(schema["$ref"])
+        validator.resolver.push_scope(scope)
+        try:
+            yield from _iter_errors(
+                validator, instance, resolved, tokens, path, schema_path
+            )
+        finally:
+            validator.resolver.pop_scope()
+
+    if is_discriminated(schema, instance):
+        ref = discriminator_ref(validator, instance, schema)
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            if ref is not None and keyword in schema:
+                yield from _iter_errors(
+                    validator,
+                    instance,
+                    {"$ref": ref},
+                    tokens,
+                    path,
+                    schema_path + [keyword],
+                )
+    else:
+        for index, subschema in enumerate(schema.get("allOf", ())):
+            yield from _iter_errors(
+                validator,
+                instance,
+                subschema,
+                tokens,
+                path,
+                schema_path + ["allOf", index],
+            )
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                yield from _iter_branch_errors(
+                    validator,
+                    instance,
+                    schema,
+                    keyword,
+                    tokens,
+                    path,
+                    schema_path,
+                )
+
+    token, rest = tokens[0], tokens[1:]
+    if isinstance(instance, dict):
+        subschemas = property_schemas(validator, schema, str(token))
+    elif isinstance(instance, list) and isinstance(token, int):
+        subschemas = item_schemas(validator, schema, token)
+    else:
+        return
+    for subschema, subschema_path in subschemas:
+        yield from _iter_errors(
+            validator,
+            instance[token],
+            subschema,
+            rest,
+            path + [token],
+            schema_path + subschema_path,
+        )
+
+
+def _iter_branch_errors(
+    validator: Validator,
+    instance: Any,
+    schema: Mapping[Hashable, Any],
+    keyword: str,
+    tokens: List[Token],
+    path: List[Token],
+    schema_path: List[Token],
+) -> Iterator[ValidationError]:
+    context = []
+    for index, subschema in enumerate(schema[keyword]):
+        errors = list(
+            _iter_errors(
+                validator,
+                instance,
+                subschema,
+                tokens,
+                path,
+                schema_path + [keyword, index],
+            )
+        )
+        if not errors:
+            return
+        context.extend(errors)
+
+    node = instance
+    for token in tokens:
+        node = node[token]
+    # paths of context errors are relative to the node
+    for error in context:
+        for _ in range(len(path) + len(tokens)):
+            error.path.popleft()
+        for _ in range(len(schema_path) + 1):
+            error.schema_path.popleft()
+    yield ValidationError(
+        f"{node!r} is not valid under any of the given schemas",
+        validator=keyword,
+        validator_value=schema[keyword],
+        instance=node,
+        schema=schema,
+        path=path + tokens,
+        schema_path=schema_path + [keyword],
+        context=context,
+    )
@@ -0,0 +1,205 @@
+import re
+from base64 import b64decode
+from base64 import b64encode
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+from uuid import UUID
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+
+Token = Union[str, int]
+Converter = Callable[[Any], Any]
+
+RFC3339_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?"
+    r"(Z|[+-]\d{2}:\d{2})",
+    re.ASCII | re.IGNORECASE,
+)
+
+
+def to_date(instance: Any) -> date:
+    # parsed like the date format checker parses it
+    if not isinstance(instance, str):
+        instance = str(instance, "utf-8")
+    return datetime.strptime(instance, "%Y-%m-%d").date()
+
+
+def to_datetime(instance: Any) -> datetime:
+    match = RFC3339_DATETIME.fullmatch(instance)
+    if match is None:
+        raise ValueError(f"{instance!r} is not a RFC 3339 date-time")
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    if offset.upper() == "Z":
+        tzinfo = timezone.utc
+    else:
+        delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[4:]))
+        tzinfo = timezone(-delta if offset[0] == "-" else delta)
+    # datetime has no leap seconds, they are moved to the next minute
+    leap = second == "60"
+    value = datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        59 if leap else int(second),
+        int((fraction or "").ljust(6, "0")[:6]),
+        tzinfo=tzinfo,
+    )
+    return value + timedelta(seconds=1) if leap else value
+
+
+def to_uuid(instance: Any) -> UUID:
+    if not isinstance(instance, str):
+        raise TypeError(f"{instance!r} is not a string")
+    uuid = UUID(instance)
+    if str(uuid) != instance.lower():
+        raise ValueError(f"{instance!r} is not in canonical form")
+    return uuid
+
+
+def to_bytes(instance: Any) -> bytes:
+    encoded = instance.encode() if isinstance(instance, str) else instance
+    decoded = b64decode(encoded)
+    if b64encode(decoded) != encoded:
+        raise ValueError(f"{instance!r} is not canonical base64")
+    return decoded
+
+
+FORMAT_CONVERTERS: Dict[str, Converter] = {
+    "date": to_date,
+    "date-time": to_datetime,
+    "uuid": to_uuid,
+    "byte": to_bytes,
+}
+
+
+class Conversions:
+    """Values converted while validating, by location in the instance.
+
+    Validators track the location of the instance they validate as they
+    descend into it. Conversions made while validating against a
+    subschema that fails, such as a oneOf branch that doesn't match,
+    are discarded. Values not reached through their parent's keywords,
+    e.g. by contains or propertyNames, are checked but not converted.
+    """
+
+    def __init__(self, instance: Any, converters: Mapping[str, Converter]):
+        self.converters = converters
+        self.converted: List[Tuple[Tuple[Token, ...], Any]] = []
+        self._path: List[Token] = []
+        self._instances = [instance]
+
+    def convert(self, instance: Any, format: str) -> None:
+        """Convert instance the format checker accepted.
+
+        Values the converter rejects are left as they are.
+        """
+        if format not in self.converters:
+            return
+        try:
+            value = self.converters[format](instance)
+        except (TypeError, ValueError):
+            return
+        if instance is self._instances[-1]:
+            self.converted.append((tuple(self._path), value))
+
+    def descend(
+        self, errors: Iterator[ValidationError], instance: Any, path: Token
+    ) -> Iterator[ValidationError]:
+        # location is left before every yield, so it's not stale if the
+        # consumer stops iterating
+        self._path.append(path)
+        self._instances.append(instance)
+        for error in errors:
+            self._path.pop()
+            self._instances.pop()
+            yield error
+            self._path.append(path)
+            self._instances.append(instance)
+        self._path.pop()
+        self._instances.pop()
+
+    def iter_errors(
+        self, errors: Iterator[ValidationError]
+    ) -> Iterator[ValidationError]:
+        start = len(self.converted)
+        failed = False
+        for error in errors:
+            failed = True
+            del self.converted[start:]
+            yield error
+        if failed:
+            del self.converted[start:]
+
+    def apply(self, instance: Any) -> Any:
+        """Copy instance with converted values.
+
+        Only objects and arrays containing converted values are copied,
+        others are shared with instance.
+        """
+        copied: Set[Tuple[Token, ...]] = set()
+        result = instance
+        for path, value in self.converted:
+            if not path:
+                result = value
+                continue
+            if () not in copied:
+                result = _copy(result)
+                copied.add(())
+            parent = result
+            for index, token in enumerate(path[:-1]):
+                if path[: index + 1] not in copied:
+                    parent[token] = _copy(parent[token])
+                    copied.add(path[: index + 1])
+                parent = parent[token]
+            parent[path[-1]] = value
+        return result
+
+
+def _copy(container: Any) -> Any:
+    if isinstance(container, dict):
+        return dict(container)
+    return list(container)
+
+
+def unmarshal(
+    validator: Validator,
+    instance: Any,
+    converters: Optional[Mapping[str, Converter]] = None,
+) -> Any:
+    """Validate instance and return a copy with formatted values converted.
+
+    Strings with a format checked by the validator's format checker
+    and that has a converter are converted once the checker accepts
+    them, so instances are valid exactly when ``validate`` says so. By
+    default ``date`` is converted to date, ``date-time`` to datetime,
+    ``uuid`` to UUID and ``byte`` to bytes. Converters raise ValueError
+    or TypeError for values they can't convert, which are left as they
+    are; ``date-time`` is converted from RFC 3339 date-times only.
+
+    Raises the best matching ValidationError if instance is not valid.
+    """
+    if converters is None:
+        converters = FORMAT_CONVERTERS
+    conversions = Conversions(instance, converters)
+    # cached results would skip conversions
+    converting = validator.evolve(conversions=conversions, result_cache=None)
+    error = best_match(converting.iter_errors(instance))
+    if error is not None:
+        raise error
+    return conversions.apply(instance)
@@ -1,17 +1,32 @@
+import time
 from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Optional
 from typing import Type
 
 from jsonschema import _legacy_validators
 from jsonschema import _utils
 from jsonschema import _validators
+from jsonschema.exceptions import ValidationError
 from jsonschema.protocols import Validator
 from jsonschema.validators import Draft202012Validator
+from jsonschema.validators import RefResolver
 from jsonschema.validators import create
 from jsonschema.validators import extend
+from jsonschema.validators import validator_for
 
 from openapi_schema_validator import _types as oas_types
 from openapi_schema_validator import _validators as oas_validators
+from openapi_schema_validator._cache import KeywordCache
+from openapi_schema_validator._cache import ResultCache
 from openapi_schema_validator._types import oas31_type_checker
+from openapi_schema_validator.limits import Usage
+from openapi_schema_validator.metrics import Metrics
+from openapi_schema_validator.profiling import Profiler
+from openapi_schema_validator.profiling import _Trace
+from openapi_schema_validator.sampling import Sample
+from openapi_schema_validator.sampling import Sampling
 
 OAS30Validator = create(
     meta_schema=_utils.load_schema("draft4"),
@@ -21,15 +36,15 @@ OAS30Validator = create(
         "maximum": _legacy_validators.maximum_draft3_draft4,
         # exclusiveMinimum supported inside minimum_draft3_draft4
         "minimum": _legacy_validators.minimum_draft3_draft4,
-        "maxLength": _validators.maxLength,
-        "minLength": _validators.minLength,
-        "pattern": _validators.pattern,
+        "maxLength": oas_validators.maxLength,
+        "minLength": oas_validators.minLength,
+        "pattern": oas_validators.pattern,
         "maxItems": _validators.maxItems,
         "minItems": _validators.minItems,
-        "uniqueItems": _validators.uniqueItems,
+        "uniqueItems": oas_validators.uniqueItems,
         "maxProperties": _validators.maxProperties,
         "minProperties": _validators.minProperties,
-        "enum": _validators.enum,
+        "enum": oas_validators.enum,
         # adjusted to OAS
         "type": oas_validators.type,
         "allOf": oas_validators.allOf,
@@ -67,6 +82,12 @@ OAS31Validator = extend(
         "allOf": oas_validators.allOf,
         "oneOf": oas_validators.oneOf,
         "anyOf": oas_validators.anyOf,
+        "enum": oas_validators.enum,
+        "uniqueItems": oas_validators.uniqueItems,
+        "pattern": oas_validators.pattern,
+        "patternProperties": oas_validators.patternProperties,
+        "items": oas_validators.items,
+        "prefixItems": oas_validators.prefixItems,
         "description": oas_validators.not_implemented,
         "format": oas_validators.format,
         # fixed OAS fields
@@ -85,21 +106,239 @@ def _patch_validator_with_read_write_context(cls: Type[Validator]) -> None:
     # be part of their public API and will raise error
     # See https://github.com/p1c2u/openapi-schema-validator/issues/48
     original_init = cls.__init__
-    original_evolve = cls.evolve
 
     def __init__(self: Validator, *args: Any, **kwargs: Any) -> None:
         self.read = kwargs.pop("read", None)
         self.write = kwargs.pop("write", None)
         original_init(self, *args, **kwargs)
 
+    # evolved validators copy the context with the other attributes
+    cls.__init__ = __init__
+
+
+# optional features, off when None
+FEATURES = (
+    "result_cache",
+    "conversions",
+    "sampling",
+    "limits",
+    "metrics",
+    "profiler",
+)
+# trace of validations the profiler didn't sample
+_UNSAMPLED = _Trace(time.perf_counter)
+
+
+def _apply_changes(
+    validator: Validator, state: Dict[str, Any], changes: Dict[str, Any]
+) -> None:
+    for name, value in changes.items():
+        if name.startswith("_") or name not in state:
+            raise TypeError(
+                f"evolve() got an unexpected keyword argument {name!r}"
+            )
+        state[name] = value
+    if state["resolver"] is None:
+        state["resolver"] = RefResolver.from_schema(
+            state["schema"], id_of=validator.ID_OF
+        )
+    state["_result_cache_root"] = (
+        validator._result_cache_root and "schema" not in changes
+    )
+    if not changes.keys().isdisjoint(FEATURES):
+        # validators with other features start their own validation
+        state["_features"] = any(state[name] is not None for name in FEATURES)
+        state["_validating"] = False
+        state["_sample"] = state["_usage"] = state["_trace"] = None
+
+
+def _patch_validator_with_features(cls: Type[Validator]) -> None:
+    """Adds keyword cache and optional features to jsonschema validator class
+
+    Validators without features validate like the original class; the
+    features are checked once per node.
+    """
+    original_init = cls.__init__
+    original_iter_errors = cls.iter_errors
+    original_descend = cls.descend
+
+    def __init__(self: Validator, *args: Any, **kwargs: Any) -> None:
+        keyword_cache = kwargs.pop("keyword_cache", None)
+        pattern_policy = kwargs.pop("pattern_policy", None)
+        for name in FEATURES:
+            setattr(self, name, kwargs.pop(name, None))
+        self._features = any(
+            getattr(self, name) is not None for name in FEATURES
+        )
+        # state of the validation in progress, shared by descendants
+        self._validating = False
+        self._sample = self._usage = self._trace = None
+        # only whole instances are looked up in result caches and
+        # recorded in metrics, subtrees are left to keywords
+        self._result_cache_root = self._metrics_root = True
+        original_init(self, *args, **kwargs)
+        if keyword_cache is None:
+            keyword_cache = KeywordCache(pattern_policy)
+            keyword_cache.compile(self.schema, self.resolver)
+        self.keyword_cache = keyword_cache
+
     def evolve(self: Validator, **changes: Any) -> Validator:
-        validator = original_evolve(self, **changes)
-        validator.read = self.read
-        validator.write = self.write
+        validator_class = type(self)
+        schema = changes.get("schema", self.schema)
+        if isinstance(schema, dict) and "$schema" in schema:
+            new_class = validator_for(schema, default=validator_class)
+            if new_class is not validator_class:
+                # $schema switched to a class without the features
+                return new_class(
+                    schema=schema,
+                    resolver=changes.get("resolver", self.resolver),
+                    format_checker=changes.get(
+                        "format_checker", self.format_checker
+                    ),
+                )
+        # attributes are copied rather than initialized again, which
+        # keeps the keyword cache and the validation in progress
+        state = self.__dict__.copy()
+        if len(changes) == 1 and "schema" in changes:
+            state["schema"] = schema
+            state["_result_cache_root"] = False
+        else:
+            _apply_changes(self, state, changes)
+        state["_metrics_root"] = False
+        validator: Validator = object.__new__(validator_class)
+        validator.__dict__ = state
         return validator
 
+    def iter_errors(
+        self: Validator, instance: Any, _schema: Any = None
+    ) -> Iterator[ValidationError]:
+        errors: Iterator[ValidationError]
+        if not self._features:
+            errors = original_iter_errors(self, instance, _schema)
+            return errors
+        if not self._validating:
+            return _start(self, instance, _schema)
+        errors = original_iter_errors(self, instance, _schema)
+        if self.conversions is not None:
+            errors = self.conversions.iter_errors(errors)
+        usage: Optional[Usage] = self._usage
+        if usage is not None:
+            errors = usage.iter_errors(instance, errors)
+        trace: Optional[_Trace] = self._trace
+        if trace is not None and trace is not _UNSAMPLED:
+            schema = self.schema if _schema is None else _schema
+            location = self.profiler.location(self, schema)
+            if location is not None:
+                errors = trace.frame(errors, location)
+        return errors
+
+    def _start(
+        self: Validator, instance: Any, _schema: Any
+    ) -> Iterator[ValidationError]:
+        # validation starts at this validator, its descendants share
+        # the state kept by the features
+        validator = self.evolve()
+        validator._validating = True
+        sampling: Optional[Sampling] = self.sampling
+        if sampling is not None:
+            validator._sample = Sample(sampling)
+        if self.limits is not None:
+            validator._usage = Usage(self.limits)
+        profiler: Optional[Profiler] = self.profiler
+        trace = None
+        if profiler is not None:
+            # validations are sampled once, at the root
+            trace = profiler.start()
+            validator._trace = _UNSAMPLED if trace is None else trace
+
+        errors: Iterator[ValidationError]
+        result_cache: Optional[ResultCache] = self.result_cache
+        if (
+            result_cache is not None
+            and _schema is None
+            and self._result_cache_root
+        ):
+            errors = result_cache.lookup(
+                self, instance, lambda: validator.iter_errors(instance)
+            )
+        else:
+            errors = validator.iter_errors(instance, _schema)
+        if sampling is not None:
+            errors = sampling.iter_errors(validator._sample, errors)
+        metrics: Optional[Metrics] = self.metrics
+        if metrics is not None and self._metrics_root:
+            schema = self.schema if _schema is None else _schema
+            errors = metrics.observe(schema, instance, errors)
+        if profiler is not None and trace is not None:
+            errors = profiler.finish(trace, errors)
+        return errors
+
+    def descend(
+        self: Validator,
+        instance: Any,
+        schema: Any,
+        path: Any = None,
+        schema_path: Any = None,
+    ) -> Iterator[ValidationError]:
+        errors: Iterator[ValidationError]
+        errors = original_descend(self, instance, schema, path, schema_path)
+        if not self._features or path is None:
+            return errors
+        if self.conversions is not None:
+            errors = self.conversions.descend(errors, instance, path)
+        if self._sample is not None:
+            errors = self._sample.descend(errors, path)
+        if self._usage is not None:
+            errors = self._usage.descend(errors, path)
+        return errors
+
     cls.__init__ = __init__
     cls.evolve = evolve
+    cls.iter_errors = iter_errors
+    cls.descend = descend
+
+
+def _resolver_state(resolver: RefResolver) -> Dict[str, Any]:
+    # meta-schemas are in every store, the rest was given or resolved
+    defaults = RefResolver("", {}).store
+    return dict(
+        base_uri=resolver._scopes_stack[0],
+        referrer=resolver.referrer,
+        store={
+            uri: document
+            for uri, document in resolver.store.items()
+            if defaults.get(uri) is not document
+        },
+        cache_remote=resolver.cache_remote,
+        handlers=resolver.handlers,
+    )
+
+
+def _patch_validator_with_pickling(cls: Type[Validator], name: str) -> None:
+    """Makes jsonschema validator class importable and picklable"""
+    cls.__name__ = cls.__qualname__ = name
+    cls.__module__ = __name__
+
+    def __getstate__(self: Validator) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.__dict__.copy()
+        # resolver caches wrap functions that can't be pickled
+        if type(self.resolver) is RefResolver:
+            state["resolver"] = _resolver_state(self.resolver)
+        state["_validating"] = False
+        state["_sample"] = state["_usage"] = state["_trace"] = None
+        return state
+
+    def __setstate__(self: Validator, state: Dict[str, Any]) -> None:
+        if isinstance(state["resolver"], dict):
+            state["resolver"] = RefResolver(**state["resolver"])
+        self.__dict__.update(state)
+
+    cls.__getstate__ = __getstate__  # type: ignore[assignment]
+    cls.__setstate__ = __setstate__
 
 
 _patch_validator_with_read_write_context(OAS30Validator)
+_patch_validator_with_features(OAS30Validator)
+_patch_validator_with_features(OAS31Validator)
+_patch_validator_with_pickling(OAS30Validator, "OAS30Validator")
+_patch_validator_with_pickling(OAS31Validator, "OAS31Validator")
@@ -0,0 +1,186 @@
+import pytest
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.classification import SchemaMatcher
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "Event": {
+                "type": "object",
+                "required": ["type", "id"],
+                "properties": {
+                    "type": {"type": "string"},
+                    "id": {"type": "string"},
+                },
+            },
+            "OrderCreated": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Event"},
+                    {
+                        "required": ["order"],
+                        "properties": {"type": {"enum": ["order.created"]}},
+                    },
+                ],
+            },
+            "OrderUpdated": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Event"},
+                    {
+                        "required": ["order"],
+                        "properties": {
+                            "type": {
+                                "enum": ["order.updated", "order.patched"]
+                            }
+                        },
+                    },
+                ],
+            },
+            "Ping": {
+                "type": "object",
+                "required": ["ping"],
+                "properties": {"ping": {"type": "boolean"}},
+            },
+            "Any": {"type": "object"},
+            "Message": {"type": "string"},
+            "Shipment": {
+                "oneOf": [{"$ref": "#/components/schemas/Event"}],
+                "discriminator": {
+                    "propertyName": "type",
+                    "mapping": {"shipped": "#/components/schemas/Event"},
+                },
+            },
+        },
+    },
+}
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestSchemaMatcher:
+    def matcher(self, validator_class, **kwargs):
+        resolver = RefResolver("", SPEC)
+        return SchemaMatcher(
+            {
+                name: validator_class(schema, resolver=resolver, **kwargs)
+                for name, schema in SPEC["components"]["schemas"].items()
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "instance,candidates,matches",
+        [
+            (
+                {"type": "order.created", "id": "1", "order": {}},
+                ["Event", "OrderCreated", "Any"],
+                ["Event", "OrderCreated", "Any"],
+            ),
+            (
+                {"type": "order.patched", "id": "1", "order": {}},
+                ["Event", "OrderUpdated", "Any"],
+                ["Event", "OrderUpdated", "Any"],
+            ),
+            (
+                {"type": "shipped", "id": "1"},
+                ["Event", "Any", "Shipment"],
+                ["Event", "Any", "Shipment"],
+            ),
+            ({"ping": True}, ["Ping", "Any"], ["Ping", "Any"]),
+            ({"ping": 1}, ["Ping", "Any"], ["Any"]),
+            ("hello", ["Message"], ["Message"]),
+            (1, [], []),
+        ],
+    )
+    def test_matches(self, validator_class, instance, candidates, matches):
+        matcher = self.matcher(validator_class)
+
+        assert matcher.candidates(instance) == candidates
+        assert matcher.matches(instance) == matches
+
+    def test_same_matches(self, validator_class):
+        matcher = self.matcher(validator_class)
+        # discriminators look up properties of objects only
+        instances = [
+            {},
+            {"type": None, "id": "1"},
+            {"type": 5, "id": "1", "order": 1},
+            {"type": "order.updated", "id": 1, "order": {}},
+            {"type": "Ping", "id": "1"},
+            {"type": "Message", "id": "1"},
+        ]
+
+        for instance in instances:
+            assert matcher.matches(instance) == [
+                key
+                for key, validator in zip(matcher.keys, matcher.validators)
+                if validator.is_valid(instance)
+            ]
+
+    def test_first_match(self, validator_class):
+        matcher = self.matcher(validator_class)
+
+        assert matcher.first_match({"ping": False}) == "Ping"
+        assert matcher.first_match(1) is None
+
+    def test_conditional_keywords_not_indexed(self, validator_class):
+        schema = {
+            "anyOf": [
+                {"properties": {"type": {"enum": ["a"]}}},
+                {"required": ["b"]},
+            ],
+        }
+        matcher = SchemaMatcher({"Either": validator_class(schema)})
+
+        assert matcher.candidates({"type": "c"}) == ["Either"]
+        assert matcher.matches({"type": "c", "b": 1}) == ["Either"]
+
+    def test_integer_is_number(self, validator_class):
+        matcher = SchemaMatcher(
+            {
+                "IntegerNumber": validator_class(
+                    {"type": "integer", "allOf": [{"type": "number"}]}
+                ),
+                "NumberInteger": validator_class(
+                    {"type": "number", "allOf": [{"type": "integer"}]}
+                ),
+                "Number": validator_class({"type": "number"}),
+            }
+        )
+
+        assert matcher.matches(1) == [
+            "IntegerNumber",
+            "NumberInteger",
+            "Number",
+        ]
+        assert matcher.matches(1.5) == ["Number"]
+
+
+class TestSchemaMatcherOAS30:
+    def test_nullable(self):
+        matcher = SchemaMatcher(
+            {
+                "Nullable": OAS30Validator(
+                    {"type": "object", "nullable": True}
+                ),
+                "Object": OAS30Validator({"type": "object"}),
+            }
+        )
+
+        assert matcher.matches(None) == ["Nullable"]
+
+    def test_write_context(self):
+        schema = {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "integer", "readOnly": True}},
+        }
+        matcher = SchemaMatcher(
+            {
+                "Read": OAS30Validator(schema, read=True),
+                "Write": OAS30Validator(schema, write=True),
+            }
+        )
+
+        assert matcher.candidates({}) == ["Write"]
+        assert matcher.matches({"id": 1}) == ["Read"]
@@ -0,0 +1,229 @@
+import json
+
+import pytest
+
+from openapi_schema_validator import cli
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Orders", "version": "1.0"},
+    "paths": {},
+    "components": {
+        "schemas": {
+            "Order": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {
+                    "id": {"type": "integer"},
+                    "tags": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Tag"},
+                    },
+                    "note": {"type": "string", "nullable": True},
+                },
+            },
+            "Tag": {"type": "string", "maxLength": 3},
+        },
+    },
+}
+
+
+@pytest.fixture
+def spec(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(SPEC))
+    return str(path)
+
+
+def run(capsys, *argv):
+    code = cli.main(["validate", *argv])
+    out, err = capsys.readouterr()
+    errors = [json.loads(line) for line in out.splitlines()]
+    return code, errors, err
+
+
+class TestValidate:
+    schema = "#/components/schemas/Order"
+
+    def test_json(self, capsys, tmp_path, spec):
+        path = tmp_path / "order.json"
+        path.write_text(json.dumps({"id": 1, "tags": ["a"], "note": None}))
+
+        code, errors, err = run(
+            capsys, "--spec", spec, "--schema", self.schema, str(path)
+        )
+
+        assert code == 0
+        assert errors == []
+        assert err.startswith("1 records (0 invalid, 0 errors) in ")
+        assert "records/s" in err
+        assert "MB/s" in err
+
+    def test_array(self, capsys, tmp_path, spec):
+        path = tmp_path / "orders.json"
+        path.write_text(json.dumps([{"id": 1}, {"id": "2", "tags": ["long"]}]))
+
+        code, errors, _ = run(
+            capsys, "--spec", spec, "--schema", self.schema, str(path)
+        )
+
+        assert code == 1
+        assert errors == [
+            {
+                "file": str(path),
+                "record": 1,
+                "path": "/id",
+                "schema_path": "/properties/id/type",
+                "message": "'2' is not of type 'integer'",
+            },
+            {
+                "file": str(path),
+                "record": 1,
+                "path": "/tags/0",
+                "schema_path": "/properties/tags/items/maxLength",
+                "message": "'long' is too long",
+            },
+        ]
+
+    def test_array_read_in_parts(self, capsys, tmp_path, spec, monkeypatch):
+        monkeypatch.setattr(cli, "READ_SIZE", 8)
+        path = tmp_path / "orders.json"
+        records = [
+            {"id": index, "tags": ["ab"] * index} for index in range(50)
+        ]
+        records[20] = {"id": 2.5e-3}
+        path.write_text(json.dumps(records)[:-1] + ", {]")
+
+        code, errors, err = run(
+            capsys, "--spec", spec, "--schema", self.schema, str(path)
+        )
+
+        assert code == 1
+        assert [(error["record"], error["path"]) for error in errors] == [
+            (20, "/id"),
+            (None, ""),
+        ]
+        assert errors[1]["message"].startswith("Invalid JSON: ")
+        assert err.startswith("51 records (2 invalid, 2 errors) in ")
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_ndjson(self, capsys, tmp_path, spec, monkeypatch, jobs):
+        monkeypatch.setattr(cli, "MIN_CHUNK_SIZE", 64)
+        path = tmp_path / "orders.ndjson"
+        lines = [json.dumps({"id": index}) for index in range(100)]
+        lines[10] = json.dumps({"id": "x"})
+        lines[50] = "{"
+        lines[70] = ""
+        lines[99] = json.dumps({})
+        path.write_text("\n".join(lines) + "\n")
+
+        code, errors, err = run(
+            capsys,
+            "--spec",
+            spec,
+            "--schema",
+            self.schema,
+            "--jobs",
+            jobs,
+            str(path),
+        )
+
+        assert code == 1
+        assert [(error["record"], error["path"]) for error in errors] == [
+            (11, "/id"),
+            (51, ""),
+            (100, ""),
+        ]
+        assert errors[1]["message"].startswith("Invalid JSON: ")
+        assert err.startswith("99 records (3 invalid, 3 errors) in ")
+
+    def test_max_errors(self, capsys, tmp_path, spec):
+        path = tmp_path / "orders.ndjson"
+        path.write_text("{}\n" * 5)
+
+        code, errors, err = run(
+            capsys,
+            "--spec",
+            spec,
+            "--schema",
+            self.schema,
+            "--max-errors",
+            "3",
+            str(path),
+        )
+
+        assert code == 1
+        assert [error["record"] for error in errors] == [1, 2, 3]
+        assert err.startswith("3 records (3 invalid, 3 errors) in ")
+
+    def test_fail_fast(self, capsys, tmp_path, spec):
+        first = tmp_path / "first.json"
+        first.write_text(json.dumps({"id": "1", "tags": [1]}))
+        second = tmp_path / "second.json"
+        second.write_text(json.dumps({}))
+
+        code, errors, _ = run(
+            capsys,
+            "--spec",
+            spec,
+            "--schema",
+            self.schema,
+            "--fail-fast",
+            str(first),
+            str(second),
+        )
+
+        assert code == 1
+        assert len(errors) == 1
+        assert errors[0]["file"] == str(first)
+
+    def test_input_format(self, capsys, tmp_path, spec):
+        path = tmp_path / "orders.txt"
+        path.write_text('{"id": 1}\n{"id": 2}\n')
+
+        code, errors, err = run(
+            capsys,
+            "--spec",
+            spec,
+            "--schema",
+            self.schema,
+            "--input-format",
+            "ndjson",
+            str(path),
+        )
+
+        assert code == 0
+        assert err.startswith("2 records (0 invalid, 0 errors) in ")
+
+    def test_yaml_spec(self, capsys, tmp_path):
+        pytest.importorskip("yaml")
+        spec = tmp_path / "spec.yaml"
+        spec.write_text(
+            "openapi: 3.1.0\n"
+            "components:\n"
+            "  schemas:\n"
+            "    Order:\n"
+            "      type: [object]\n"
+            "      required: [id]\n"
+        )
+        path = tmp_path / "order.json"
+        path.write_text("{}")
+
+        code, errors, _ = run(
+            capsys, "--spec", str(spec), "--schema", self.schema, str(path)
+        )
+
+        assert code == 1
+        assert errors[0]["schema_path"] == "/required"
+
+    def test_schema_not_found(self, capsys, tmp_path, spec):
+        path = tmp_path / "order.json"
+        path.write_text("{}")
+
+        code, errors, err = run(
+            capsys, "--spec", spec, "--schema", "#/missing", str(path)
+        )
+
+        assert code == 2
+        assert errors == []
+        assert "#/missing" in err
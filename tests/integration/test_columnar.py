@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import oas30_format_checker
+
+pytest.importorskip("numpy")
+
+from openapi_schema_validator.columnar import ColumnarValidator  # noqa: E402
+
+
+def record_errors(validator, records):
+    errors = []
+    for index, record in enumerate(records):
+        for error in validator.iter_errors(record):
+            errors.append(((index,) + tuple(error.path), error.message))
+    return sorted(errors)
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestColumnarValidator:
+    schema = {
+        "type": "object",
+        "required": ["id"],
+        "additionalProperties": False,
+        "properties": {
+            "id": {"type": "integer", "format": "int32", "minimum": 0},
+            "price": {
+                "type": "number",
+                "minimum": 0,
+                "exclusiveMinimum": True,
+                "maximum": 1000,
+                "multipleOf": 0.5,
+            },
+            "quantity": {"type": "integer", "multipleOf": 3, "nullable": True},
+            "code": {"type": "string", "enum": ["PL", "DE", "FR"]},
+            "name": {"type": "string", "minLength": 2, "maxLength": 5},
+            "active": {"type": "boolean", "enum": [True]},
+            "tag": {"type": "string", "pattern": "^x"},
+        },
+    }
+    values = {
+        "id": [1, -1, 2**31, True, "a", None, 1.0, 5],
+        "price": [0, 0.5, 1000, 1000.5, 0.25, 2**60, "x", None],
+        "quantity": [3, 4, None, 6.0, 1e308, True],
+        "code": ["PL", "XX", 1, None],
+        "name": ["a", "abc", "abcdef", b"ab"],
+        "active": [True, False, 1, None],
+        "tag": ["xa", "a", 1],
+    }
+
+    def test_valid(self, validator_class):
+        records = [
+            {"id": i, "price": 1.5 + i, "code": "PL", "name": "abc"}
+            for i in range(500)
+        ]
+        validator = ColumnarValidator(
+            self.schema, validator_class, format_checker=oas30_format_checker
+        )
+
+        assert validator.is_valid(records)
+        assert list(validator.iter_errors(records)) == []
+
+    def test_errors_match_record_by_record_validation(self, validator_class):
+        generator = random.Random(0)
+        records = []
+        for _ in range(500):
+            record = {
+                name: generator.choice(values)
+                for name, values in self.values.items()
+                if generator.random() < 0.85
+            }
+            if generator.random() < 0.05:
+                record["extra"] = 1
+            if generator.random() < 0.02:
+                record = generator.choice([None, [], "record"])
+            records.append(record)
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+        columnar = ColumnarValidator(
+            self.schema, validator_class, format_checker=oas30_format_checker
+        )
+
+        errors = sorted(
+            (tuple(error.path), error.message)
+            for error in columnar.iter_errors(records)
+        )
+
+        assert errors
+        assert errors == record_errors(validator, records)
+
+    def test_error_paths(self, validator_class):
+        records = [{"id": 1}, {"id": 2, "code": "XX"}, {"code": "PL"}]
+        validator = ColumnarValidator(self.schema, validator_class)
+
+        errors = list(validator.iter_errors(records))
+
+        assert [list(error.path) for error in errors] == [[1, "code"], [2]]
+        assert list(errors[0].schema_path) == ["properties", "code", "enum"]
+        assert errors[1].message == "'id' is a required property"
+
+    def test_enum_trailing_nul(self, validator_class):
+        records = [{"id": 1, "code": "PL\x00"}, {"id": 2, "code": "PL"}]
+        validator = ColumnarValidator(self.schema, validator_class)
+
+        errors = list(validator.iter_errors(records))
+
+        assert [list(error.path) for error in errors] == [[0, "code"]]
+
+    def test_unsupported_record_schema(self, validator_class):
+        schema = {"type": "object", "minProperties": 2}
+        validator = ColumnarValidator(schema, validator_class)
+
+        errors = list(validator.iter_errors([{"a": 1, "b": 2}, {"a": 1}]))
+
+        assert [list(error.path) for error in errors] == [[1]]
@@ -0,0 +1,148 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import ResultCache
+from openapi_schema_validator import ThreadSafeValidator
+
+
+@pytest.fixture
+def switch_often():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+class TestThreadSafeValidator:
+    # references to item.json resolve differently in each scope
+    schema = {
+        "$id": "https://example.com/root.json",
+        "type": "object",
+        "properties": {
+            "a": {"$ref": "a/schema.json"},
+            "b": {"$ref": "b/schema.json"},
+        },
+        "$defs": {
+            "a": {
+                "$id": "https://example.com/a/schema.json",
+                "type": "array",
+                "items": {"$ref": "item.json"},
+                "$defs": {
+                    "item": {
+                        "$id": "https://example.com/a/item.json",
+                        "type": "integer",
+                    },
+                },
+            },
+            "b": {
+                "$id": "https://example.com/b/schema.json",
+                "type": "array",
+                "items": {"$ref": "item.json"},
+                "$defs": {
+                    "item": {
+                        "$id": "https://example.com/b/item.json",
+                        "type": "string",
+                    },
+                },
+            },
+        },
+    }
+
+    def errors(self, validator, instance):
+        return [
+            (list(error.path), error.message)
+            for error in validator.iter_errors(instance)
+        ]
+
+    @pytest.mark.parametrize("result_cache", [None, ResultCache()])
+    def test_stress(self, switch_often, result_cache):
+        validator = ThreadSafeValidator(self.schema, result_cache=result_cache)
+        valid = {"a": list(range(20)), "b": [str(i) for i in range(20)]}
+        invalid = {"a": [0, "1"], "b": ["0", 1]}
+        expected = [
+            (["a", 1], "'1' is not of type 'integer'"),
+            (["b", 1], "1 is not of type 'string'"),
+        ]
+        threads = 8
+        barrier = threading.Barrier(threads)
+
+        def run(_):
+            barrier.wait()
+            results = []
+            for _ in range(50):
+                results.append(validator.is_valid(valid))
+                results.append(self.errors(validator, invalid) == expected)
+            return all(results)
+
+        with ThreadPoolExecutor(threads) as executor:
+            assert all(executor.map(run, range(threads)))
+
+    @pytest.mark.parametrize("threads", [1, 4, 8])
+    def test_same_results_across_threads(self, switch_often, threads):
+        validator = ThreadSafeValidator(self.schema)
+        instances = [
+            {"a": list(range(20)), "b": [str(i) for i in range(20)]},
+            {"a": [0, "1"], "b": ["0", 1]},
+            {"a": ["0"] * 5, "b": list(range(5))},
+        ]
+        expected = [
+            self.errors(OAS31Validator(self.schema), instance)
+            for instance in instances
+        ]
+        barrier = threading.Barrier(threads)
+
+        def run(_):
+            barrier.wait()
+            return [
+                [self.errors(validator, instance) for instance in instances]
+                for _ in range(20)
+            ]
+
+        with ThreadPoolExecutor(threads) as executor:
+            for results in executor.map(run, range(threads)):
+                assert results == [expected] * 20
+
+    def test_validator_per_thread(self):
+        validator = ThreadSafeValidator(self.schema)
+        barrier = threading.Barrier(2)
+        validators = []
+
+        def run():
+            barrier.wait()
+            validators.append(validator.validator)
+
+        threads = [threading.Thread(target=run) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert validator.validator is validator.validator
+        assert validators[0] is not validators[1]
+
+    def test_shared_state(self):
+        validator = ThreadSafeValidator(
+            {"type": "object", "properties": {"id": {"readOnly": True}}},
+            OAS30Validator,
+            write=True,
+        )
+
+        with ThreadPoolExecutor(1) as executor:
+            thread_validator = executor.submit(
+                lambda: validator.validator
+            ).result()
+
+        assert thread_validator.write is True
+        assert (
+            thread_validator.keyword_cache is validator.validator.keyword_cache
+        )
+        assert (
+            thread_validator.resolver.store
+            is validator.validator.resolver.store
+        )
+        assert not validator.is_valid({"id": 1})
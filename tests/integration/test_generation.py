@@ -0,0 +1,211 @@
+import pytest
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import oas30_format_checker
+from openapi_schema_validator import oas31_format_checker
+from openapi_schema_validator.generation import PayloadGenerator
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "Pet": {
+                "type": "object",
+                "required": ["kind", "name"],
+                "properties": {
+                    "kind": {"type": "string"},
+                    "name": {"type": "string", "minLength": 1},
+                    "tags": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "pattern": "^[a-z]+-\\d+$",
+                        },
+                        "uniqueItems": True,
+                        "maxItems": 5,
+                    },
+                    "born": {"type": "string", "format": "date"},
+                    "uid": {"type": "string", "format": "uuid"},
+                },
+            },
+            "Cat": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Pet"},
+                    {
+                        "type": "object",
+                        "properties": {
+                            "lives": {
+                                "type": "integer",
+                                "format": "int32",
+                                "minimum": 1,
+                                "maximum": 9,
+                            },
+                        },
+                    },
+                ],
+            },
+            "Dog": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Pet"},
+                    {
+                        "type": "object",
+                        "properties": {"weight": {"type": "number"}},
+                    },
+                ],
+            },
+            "Pets": {
+                "type": "array",
+                "items": {
+                    "oneOf": [
+                        {"$ref": "#/components/schemas/Cat"},
+                        {"$ref": "#/components/schemas/Dog"},
+                    ],
+                    "discriminator": {
+                        "propertyName": "kind",
+                        "mapping": {
+                            "cat": "#/components/schemas/Cat",
+                            "dog": "#/components/schemas/Dog",
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "validator_class,format_checker",
+    [
+        (OAS30Validator, oas30_format_checker),
+        (OAS31Validator, oas31_format_checker),
+    ],
+)
+class TestPayloadGenerator:
+    def validator(self, validator_class, format_checker, schema=None):
+        return validator_class(
+            schema or SPEC["components"]["schemas"]["Pets"],
+            resolver=RefResolver("", SPEC),
+            format_checker=format_checker,
+        )
+
+    def test_valid(self, validator_class, format_checker):
+        validator = self.validator(validator_class, format_checker)
+        generator = PayloadGenerator(validator, seed=1, size=50)
+
+        for _ in range(20):
+            payload = generator.valid()
+
+            assert validator.is_valid(payload)
+            assert all(pet["kind"] in ("cat", "dog") for pet in payload)
+
+    def test_invalid(self, validator_class, format_checker):
+        validator = self.validator(validator_class, format_checker)
+        generator = PayloadGenerator(validator, seed=1, size=50)
+
+        for _ in range(20):
+            assert not validator.is_valid(generator.invalid())
+
+    def test_seed(self, validator_class, format_checker):
+        validator = self.validator(validator_class, format_checker)
+
+        first = PayloadGenerator(validator, seed=7)
+        second = PayloadGenerator(validator, seed=7)
+
+        assert [first.valid(), first.invalid()] == [
+            second.valid(),
+            second.invalid(),
+        ]
+
+    def test_size(self, validator_class, format_checker):
+        validator = self.validator(validator_class, format_checker)
+
+        small = PayloadGenerator(validator, seed=1, size=10).valid()
+        large = PayloadGenerator(validator, seed=1, size=1000).valid()
+
+        assert len(large) > 10 * len(small)
+
+    def test_max_depth(self, validator_class, format_checker):
+        schema = {
+            "type": "object",
+            "properties": {
+                "children": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/schemas/Tree"},
+                },
+            },
+        }
+        spec = {"components": {"schemas": {"Tree": schema}}}
+        validator = validator_class(schema, resolver=RefResolver("", spec))
+
+        payload = PayloadGenerator(validator, seed=1, max_depth=3).valid()
+
+        assert validator.is_valid(payload)
+        depth = 0
+        while payload.get("children"):
+            payload = payload["children"][0]
+            depth += 1
+        assert depth <= 1
+
+    @pytest.mark.parametrize(
+        "schema,valid",
+        [
+            ({"type": "string", "format": "date-time"}, str),
+            ({"type": "string", "format": "byte"}, str),
+            ({"type": "integer", "format": "int64"}, int),
+            ({"type": "number", "format": "double"}, float),
+            ({"enum": ["a", "b"]}, str),
+        ],
+    )
+    def test_formats(self, validator_class, format_checker, schema, valid):
+        validator = self.validator(validator_class, format_checker, schema)
+        generator = PayloadGenerator(validator, seed=1)
+
+        assert isinstance(generator.valid(), valid)
+        assert not validator.is_valid(generator.invalid())
+
+    def test_unsatisfiable(self, validator_class, format_checker):
+        schema = {"type": "string", "not": {"type": "string"}}
+        validator = self.validator(validator_class, format_checker, schema)
+
+        with pytest.raises(ValueError):
+            PayloadGenerator(validator, attempts=5).valid()
+
+
+class TestPayloadGeneratorOAS30:
+    schema = {
+        "type": "object",
+        "required": ["id", "password"],
+        "properties": {
+            "id": {"type": "integer", "readOnly": True},
+            "password": {"type": "string", "writeOnly": True},
+            "name": {"type": "string", "nullable": True},
+        },
+    }
+
+    def test_write_context(self):
+        validator = OAS30Validator(self.schema, write=True)
+        generator = PayloadGenerator(validator, seed=1)
+
+        for _ in range(20):
+            payload = generator.valid()
+
+            assert "id" not in payload
+            assert "password" in payload
+
+    def test_read_context(self):
+        validator = OAS30Validator(self.schema, read=True)
+        generator = PayloadGenerator(validator, seed=1)
+
+        for _ in range(20):
+            payload = generator.valid()
+
+            assert "id" in payload
+            assert "password" not in payload
+
+    def test_binary(self):
+        schema = {"type": "string", "format": "binary"}
+        validator = OAS30Validator(schema, format_checker=oas30_format_checker)
+
+        assert isinstance(PayloadGenerator(validator).valid(), bytes)
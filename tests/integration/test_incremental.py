@@ -0,0 +1,188 @@
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.incremental import JsonPatchError
+from openapi_schema_validator.incremental import apply_patch
+from openapi_schema_validator.incremental import iter_errors
+
+
+class TestApplyPatch:
+    def test_operations(self):
+        document = {"a": [1, 2, 3], "b": {"c": "d"}}
+        patch = [
+            {"op": "add", "path": "/a/1", "value": 9},
+            {"op": "remove", "path": "/a/0"},
+            {"op": "replace", "path": "/b/c", "value": "e"},
+            {"op": "move", "from": "/b/c", "path": "/f"},
+            {"op": "copy", "from": "/a", "path": "/g"},
+            {"op": "add", "path": "/g/-", "value": 4},
+            {"op": "test", "path": "/f", "value": "e"},
+        ]
+
+        document, changes = apply_patch(document, patch)
+
+        assert document == {
+            "a": [9, 2, 3],
+            "b": {},
+            "f": "e",
+            "g": [9, 2, 3, 4],
+        }
+        assert changes.children["a"].resized
+        assert list(changes.children["a"].children) == [0]
+        assert changes.children["b"].children["c"].replaced
+        assert changes.children["g"].replaced
+
+    def test_replace_document(self):
+        document, changes = apply_patch(
+            {"a": 1}, [{"op": "replace", "path": "", "value": [1]}]
+        )
+
+        assert document == [1]
+        assert changes.replaced
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "remove", "path": "/missing"},
+            {"op": "add", "path": "/a/5", "value": 1},
+            {"op": "add", "path": "/a/01", "value": 1},
+            {"op": "replace", "path": "a", "value": 1},
+            {"op": "test", "path": "/a/0", "value": True},
+            {"op": "move", "from": "/a", "path": "/a/0"},
+            {"op": "unknown", "path": "/a"},
+        ],
+    )
+    def test_invalid(self, operation):
+        with pytest.raises(JsonPatchError):
+            apply_patch({"a": [1]}, [operation])
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestIterErrors:
+    schema = {
+        "type": "object",
+        "required": ["id", "tags"],
+        "additionalProperties": False,
+        "properties": {
+            "id": {"type": "integer"},
+            "tags": {
+                "type": "array",
+                "uniqueItems": True,
+                "items": {"$ref": "#/components/schemas/Tag"},
+            },
+            "pets": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Pet"},
+            },
+        },
+        "components": {
+            "schemas": {
+                "Tag": {
+                    "type": "object",
+                    "properties": {"name": {"type": "string"}},
+                    "required": ["name"],
+                },
+                "Pet": {
+                    "type": "object",
+                    "properties": {"petType": {"type": "string"}},
+                    "oneOf": [
+                        {"$ref": "#/components/schemas/Cat"},
+                        {"$ref": "#/components/schemas/Dog"},
+                    ],
+                    "discriminator": {"propertyName": "petType"},
+                },
+                "Cat": {
+                    "type": "object",
+                    "properties": {"lives": {"type": "integer", "maximum": 9}},
+                },
+                "Dog": {
+                    "type": "object",
+                    "properties": {"bark": {"type": "string"}},
+                    "required": ["bark"],
+                },
+            },
+        },
+    }
+
+    def document(self):
+        return {
+            "id": 1,
+            "tags": [{"name": str(i)} for i in range(1000)],
+            "pets": [{"petType": "Cat", "lives": 1}],
+        }
+
+    def errors(self, validator_class, patch):
+        validator = validator_class(self.schema)
+        document = self.document()
+        assert validator.is_valid(document)
+
+        document, changes = apply_patch(document, patch)
+        errors = [
+            (list(error.path), error.message)
+            for error in iter_errors(validator, document, changes)
+        ]
+
+        full = [
+            (list(error.path), error.message)
+            for error in validator.iter_errors(document)
+        ]
+        assert sorted(errors) == sorted(full)
+        return errors
+
+    def test_valid(self, validator_class):
+        patch = [
+            {"op": "add", "path": "/tags/-", "value": {"name": "new"}},
+            {"op": "replace", "path": "/id", "value": 2},
+        ]
+
+        assert self.errors(validator_class, patch) == []
+
+    @pytest.mark.parametrize(
+        "patch,expected",
+        [
+            (
+                [{"op": "replace", "path": "/tags/5/name", "value": 5}],
+                [(["tags", 5, "name"], "5 is not of type 'string'")],
+            ),
+            (
+                [{"op": "remove", "path": "/id"}],
+                [([], "'id' is a required property")],
+            ),
+            (
+                [{"op": "add", "path": "/tags/-", "value": {"name": "0"}}],
+                [(["tags"], "has non-unique elements")],
+            ),
+            (
+                [{"op": "add", "path": "/extra", "value": 1}],
+                [([], "Additional properties are not allowed")],
+            ),
+            (
+                [{"op": "replace", "path": "/pets/0/lives", "value": 10}],
+                [(["pets", 0, "lives"], "10 is greater than the maximum")],
+            ),
+            (
+                [{"op": "replace", "path": "/pets/0/petType", "value": "Dog"}],
+                [(["pets", 0], "'bark' is a required property")],
+            ),
+        ],
+    )
+    def test_invalid(self, validator_class, patch, expected):
+        errors = self.errors(validator_class, patch)
+
+        assert len(errors) == len(expected)
+        for (path, message), (expected_path, expected_message) in zip(
+            errors, expected
+        ):
+            assert path == expected_path
+            assert expected_message in message
+
+    def test_unchanged_members_not_revalidated(self, validator_class):
+        validator = validator_class(self.schema)
+        document = self.document()
+        document["tags"][0]["name"] = 0
+        patch = [{"op": "replace", "path": "/tags/1/name", "value": "x"}]
+
+        document, changes = apply_patch(document, patch)
+
+        assert list(iter_errors(validator, document, changes)) == []
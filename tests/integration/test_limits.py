@@ -0,0 +1,144 @@
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import oas30_format_checker
+from openapi_schema_validator.limits import LimitExceededError
+from openapi_schema_validator.limits import Limits
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestLimits:
+    schema = {
+        "type": "object",
+        "properties": {
+            "children": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Node"},
+            },
+            "code": {"type": "string", "pattern": "^[a-z]+$"},
+            "date": {"type": "string", "format": "date"},
+            "labels": {
+                "type": "object",
+                "patternProperties": {"^x-": {"type": "string"}},
+            },
+        },
+        "components": {
+            "schemas": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "children": {
+                            "type": "array",
+                            "items": {"$ref": "#/components/schemas/Node"},
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+    def validate(self, validator_class, instance, **limits):
+        validator = validator_class(
+            self.schema,
+            format_checker=oas30_format_checker,
+            limits=Limits(**limits),
+        )
+        with pytest.raises(LimitExceededError) as exc_info:
+            list(validator.iter_errors(instance))
+        return exc_info.value
+
+    def test_max_depth(self, validator_class):
+        instance = node = {}
+        for _ in range(2000):
+            node["children"] = [{}]
+            node = node["children"][0]
+
+        error = self.validate(validator_class, instance, max_depth=10)
+
+        assert error.limit == "max_depth"
+        assert error.validator == "limits"
+        assert list(error.path) == ["children", 0] * 5 + ["children"]
+
+    def test_max_nodes(self, validator_class):
+        instance = {"children": [{}] * 100}
+
+        error = self.validate(validator_class, instance, max_nodes=50)
+
+        assert error.limit == "max_nodes"
+        assert error.path[0] == "children"
+
+    def test_max_array_length(self, validator_class):
+        instance = {"children": [{"children": [{}] * 11}]}
+
+        error = self.validate(validator_class, instance, max_array_length=10)
+
+        assert error.limit == "max_array_length"
+        assert list(error.path) == ["children", 0, "children"]
+
+    def test_max_object_keys(self, validator_class):
+        instance = {"labels": {f"x-{index}": "" for index in range(11)}}
+
+        error = self.validate(validator_class, instance, max_object_keys=10)
+
+        assert error.limit == "max_object_keys"
+        assert list(error.path) == ["labels"]
+
+    @pytest.mark.parametrize(
+        "instance,path",
+        [
+            ({"code": "a" * 11}, ["code"]),
+            ({"date": "2020-01-01" + " " * 10}, ["date"]),
+        ],
+    )
+    def test_max_string_length(self, validator_class, instance, path):
+        error = self.validate(validator_class, instance, max_string_length=10)
+
+        assert error.limit == "max_string_length"
+        assert list(error.path) == path
+
+    def test_max_key_length(self, validator_class):
+        if validator_class is OAS30Validator:
+            pytest.skip("patternProperties is not supported by OAS 3.0")
+        instance = {"labels": {"x-" + "a" * 10: ""}}
+
+        error = self.validate(validator_class, instance, max_string_length=10)
+
+        assert error.limit == "max_string_length"
+        assert list(error.path) == ["labels"]
+
+    def test_timeout(self, validator_class):
+        instance = {"children": [{}] * 100}
+
+        error = self.validate(validator_class, instance, timeout=0)
+
+        assert error.limit == "timeout"
+
+    def test_within_limits(self, validator_class):
+        validator = validator_class(
+            self.schema,
+            limits=Limits(
+                max_depth=5,
+                max_nodes=100,
+                max_array_length=3,
+                max_object_keys=4,
+                max_string_length=10,
+                timeout=60,
+            ),
+        )
+        instance = {
+            "children": [{"children": [{}, {}]}],
+            "code": 1,
+            "labels": {"x-a": "b"},
+        }
+
+        errors = list(validator.iter_errors(instance))
+
+        assert [error.validator for error in errors] == ["type"]
+
+    def test_usage_per_validation(self, validator_class):
+        validator = validator_class(self.schema, limits=Limits(max_nodes=10))
+        instance = {"children": [{}, {}, {}]}
+
+        for _ in range(5):
+            assert validator.is_valid(instance)
@@ -0,0 +1,142 @@
+import pickle
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import ResultCache
+from openapi_schema_validator import oas30_format_checker
+from openapi_schema_validator import validate
+from openapi_schema_validator.metrics import SIZE_BUCKETS
+from openapi_schema_validator.metrics import Metrics
+from openapi_schema_validator.metrics import render_prometheus
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestMetrics:
+    schema = {
+        "title": "Pet",
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer", "format": "int32"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+    }
+
+    def test_validations(self, validator_class):
+        metrics = Metrics(size_buckets=SIZE_BUCKETS)
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker, metrics=metrics
+        )
+
+        assert validator.is_valid({"id": 1, "tags": ["a"]})
+        assert not validator.is_valid({"id": 2**40})
+        list(validator.iter_errors({"tags": [1, 2]}))
+
+        snapshot = metrics.snapshot()
+        assert snapshot.validations == {"Pet": 3}
+        assert snapshot.failures == {"Pet": 2}
+        assert snapshot.errors == {
+            ("Pet", "format"): 1,
+            ("Pet", "required"): 1,
+            ("Pet", "type"): 2,
+        }
+        assert snapshot.format_checks == {
+            ("int32", True): 1,
+            ("int32", False): 1,
+        }
+        assert snapshot.durations["Pet"].observations == 3
+        sizes = snapshot.sizes["Pet"]
+        assert sizes.observations == 3
+        assert sizes.sum == 4 + 2 + 4
+
+    def test_sizes_opt_in(self, validator_class):
+        metrics = Metrics()
+        validator = validator_class(self.schema, metrics=metrics)
+
+        assert validator.is_valid({"id": 1})
+
+        snapshot = metrics.snapshot()
+        assert snapshot.validations == {"Pet": 1}
+        assert snapshot.sizes == {}
+
+    def test_unknown_format_not_counted(self, validator_class):
+        metrics = Metrics()
+        validator = validator_class(
+            {"format": "unknown"},
+            format_checker=oas30_format_checker,
+            metrics=metrics,
+        )
+
+        assert not validator.is_valid("a")
+        assert metrics.snapshot().format_checks == {}
+
+    def test_result_cache(self, validator_class):
+        metrics = Metrics()
+        validator = validator_class(
+            self.schema, metrics=metrics, result_cache=ResultCache()
+        )
+
+        for _ in range(4):
+            validator.is_valid({"id": 1})
+
+        snapshot = metrics.snapshot()
+        assert snapshot.validations == {"Pet": 4}
+        assert snapshot.hit_rate("result") == 0.75
+
+    def test_shortcut(self, validator_class):
+        metrics = Metrics()
+
+        with pytest.raises(ValidationError):
+            validate({}, self.schema, validator_class, metrics=metrics)
+
+        assert metrics.snapshot().errors == {("Pet", "required"): 1}
+
+    def test_without_metrics(self, validator_class):
+        validator = validator_class(self.schema)
+
+        assert validator.metrics is None
+        assert not validator.is_valid({})
+
+
+class TestRenderPrometheus:
+    def test_render(self):
+        metrics = Metrics(duration_buckets=[1.0], timer=lambda: 0.0)
+        validator = OAS31Validator(
+            {"$id": 'say "hi"', "type": "string"}, metrics=metrics
+        )
+        validator.is_valid(1)
+
+        text = metrics.render_prometheus()
+
+        lines = text.splitlines()
+        assert 'openapi_validation_total{schema="say \\"hi\\""} 1' in lines
+        assert (
+            "openapi_validation_errors_total"
+            '{schema="say \\"hi\\"",keyword="type"} 1'
+        ) in lines
+        assert (
+            "openapi_validation_duration_seconds_bucket"
+            '{schema="say \\"hi\\"",le="+Inf"} 1'
+        ) in lines
+        assert "# TYPE openapi_validation_instance_size histogram" in lines
+        assert text == render_prometheus(metrics.snapshot())
+
+    def test_reset(self):
+        metrics = Metrics()
+        OAS31Validator({}, metrics=metrics).is_valid(1)
+
+        metrics.reset()
+
+        assert metrics.snapshot().validations == {}
+
+    def test_pickle(self):
+        metrics = Metrics(size_buckets=[5])
+        OAS31Validator({}, metrics=metrics).is_valid(1)
+
+        unpickled = pickle.loads(pickle.dumps(metrics))
+
+        assert unpickled.size_buckets == (5,)
+        assert unpickled.snapshot().validations == {}
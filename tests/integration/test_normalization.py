@@ -0,0 +1,94 @@
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.normalization import intern_schema
+
+
+def error(name="code"):
+    return {
+        "type": "object",
+        "required": [name],
+        "properties": {
+            name: {"type": "string", "enum": ["A", "B"]},
+        },
+    }
+
+
+class TestInternSchema:
+    def test_duplicates_shared(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "first": error(),
+                "second": error(),
+                "other": error("reason"),
+            },
+        }
+
+        interned = intern_schema(schema)
+
+        assert interned == schema
+        properties = interned["properties"]
+        assert properties["first"] is properties["second"]
+        assert properties["first"] is not properties["other"]
+        assert (
+            properties["first"]["properties"]["code"]["enum"]
+            is properties["other"]["properties"]["reason"]["enum"]
+        )
+        assert (
+            schema["properties"]["first"] is not schema["properties"]["second"]
+        )
+
+    def test_types_and_order_kept(self):
+        schema = {
+            "allOf": [
+                {"enum": [1]},
+                {"enum": [1.0]},
+                {"enum": [True]},
+                {"type": "string", "minLength": 1},
+                {"minLength": 1, "type": "string"},
+            ],
+        }
+
+        interned = intern_schema(schema)["allOf"]
+
+        assert len({id(each) for each in interned}) == 5
+        assert [type(each["enum"][0]) for each in interned[:3]] == [
+            int,
+            float,
+            bool,
+        ]
+        assert list(interned[4]) == ["minLength", "type"]
+
+    def test_shared_between_schemas(self):
+        interned = {}
+
+        first = intern_schema({"items": error()}, interned)
+        second = intern_schema({"additionalProperties": error()}, interned)
+
+        assert first["items"] is second["additionalProperties"]
+
+    def test_validation_unchanged(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "first": error(),
+                "second": error(),
+                "items": {"type": "array", "items": error()},
+            },
+        }
+        instance = {
+            "first": {"code": "C"},
+            "second": {},
+            "items": [{"code": 1}, {"code": "A"}],
+        }
+
+        for cls in (OAS30Validator, OAS31Validator):
+            original = [
+                (list(each.path), list(each.schema_path), each.message)
+                for each in cls(schema).iter_errors(instance)
+            ]
+            interned = [
+                (list(each.path), list(each.schema_path), each.message)
+                for each in cls(intern_schema(schema)).iter_errors(instance)
+            ]
+            assert interned == original
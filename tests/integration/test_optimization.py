@@ -0,0 +1,373 @@
+import copy
+
+import pytest
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.optimization import flatten_all_of
+from openapi_schema_validator.optimization import fold_always_true
+from openapi_schema_validator.optimization import optimize_schema
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "Named": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {"name": {"type": "string"}},
+            },
+            "Pet": {
+                "description": "A pet",
+                "allOf": [
+                    {"$ref": "#/components/schemas/Named"},
+                    {
+                        "type": "object",
+                        "required": ["age"],
+                        "properties": {"age": {"type": "integer"}},
+                    },
+                ],
+            },
+            "Cat": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Pet"},
+                    {
+                        "properties": {
+                            "age": {"minimum": 0},
+                            "lives": {"type": "integer", "maximum": 9},
+                        },
+                    },
+                ],
+            },
+            "Closed": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Named"},
+                    {
+                        "properties": {"id": {}},
+                        "additionalProperties": False,
+                    },
+                ],
+            },
+            "Tagged": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Named"},
+                    {
+                        "anyOf": [
+                            {"required": ["tag"]},
+                            {"required": ["tags"]},
+                        ],
+                    },
+                ],
+            },
+        },
+    },
+}
+INSTANCES = [
+    None,
+    1,
+    {},
+    {"name": "Tom"},
+    {"name": "Tom", "age": 3},
+    {"name": 1, "age": -1},
+    {"name": "Tom", "age": 3, "lives": 10},
+    {"name": "Tom", "id": 1},
+    {"name": "Tom", "other": 1},
+    {"name": "Tom", "tag": "a"},
+]
+
+
+def errors(validator, instance, optimized=None):
+    found = (
+        validator.iter_errors(instance)
+        if optimized is None
+        else optimized.iter_errors(validator, instance)
+    )
+    return sorted(
+        (tuple(error.path), tuple(error.schema_path), error.message)
+        for error in found
+    )
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestOptimizeSchema:
+    def optimized(self, validator_class, name):
+        schema = SPEC["components"]["schemas"][name]
+        optimized = optimize_schema(schema, SPEC)
+        original = validator_class(schema, resolver=RefResolver("", SPEC))
+        validator = validator_class(
+            optimized.schema, resolver=RefResolver("", optimized.referrer)
+        )
+        return original, validator, optimized
+
+    def test_merged(self, validator_class):
+        _, _, optimized = self.optimized(validator_class, "Cat")
+
+        assert "allOf" not in optimized.schema
+        assert optimized.schema["required"] == ["name", "age"]
+        assert optimized.schema["properties"]["age"] == {
+            "type": "integer",
+            "minimum": 0,
+        }
+        assert "description" not in optimized.schema
+
+    @pytest.mark.parametrize("name", ["Pet", "Cat", "Closed", "Tagged"])
+    def test_same_errors(self, validator_class, name):
+        original, validator, optimized = self.optimized(validator_class, name)
+
+        # equal keywords of merged schemas report errors once
+        for instance in INSTANCES:
+            found = errors(validator, instance, optimized)
+            expected = errors(original, instance)
+            assert set(found) <= set(expected)
+            assert {(path, message) for path, _, message in found} == {
+                (path, message) for path, _, message in expected
+            }
+
+    def test_relocated(self, validator_class):
+        _, validator, optimized = self.optimized(validator_class, "Cat")
+
+        found = errors(validator, {"name": "Tom", "lives": 10}, optimized)
+
+        assert found == [
+            (
+                (),
+                ("allOf", 0, "allOf", 1, "required"),
+                "'age' is a required property",
+            ),
+            (
+                ("lives",),
+                ("allOf", 1, "properties", "lives", "maximum"),
+                "10 is greater than the maximum of 9",
+            ),
+        ]
+
+    def test_context_relocated(self, validator_class):
+        _, validator, optimized = self.optimized(validator_class, "Tagged")
+
+        (error,) = optimized.iter_errors(validator, {"name": "Tom"})
+
+        assert list(error.schema_path) == ["allOf", 1, "anyOf"]
+        assert sorted(list(e.schema_path) for e in error.context) == [
+            [0, "required"],
+            [1, "required"],
+        ]
+
+    def test_additional_properties_kept(self, validator_class):
+        _, _, optimized = self.optimized(validator_class, "Closed")
+
+        assert optimized.schema["allOf"] == [
+            {"properties": {"id": {}}, "additionalProperties": False}
+        ]
+
+    def test_discriminator_kept(self, validator_class):
+        spec = {
+            "components": {
+                "schemas": {
+                    "Pet": {
+                        "allOf": [{"type": "object"}],
+                        "discriminator": {"propertyName": "kind"},
+                    },
+                },
+            },
+        }
+        schema = spec["components"]["schemas"]["Pet"]
+
+        optimized = optimize_schema(schema, spec)
+
+        assert optimized.schema is schema
+
+    def test_not_modified(self, validator_class):
+        spec = copy.deepcopy(SPEC)
+
+        optimize_schema(spec["components"]["schemas"]["Cat"], spec)
+
+        assert spec == SPEC
+
+    def test_passes(self, validator_class):
+        schema = SPEC["components"]["schemas"]["Pet"]
+
+        optimized = optimize_schema(schema, SPEC, passes=[flatten_all_of])
+
+        assert optimized.schema["description"] == "A pet"
+        assert "allOf" not in optimized.schema
+
+    def test_no_passes(self, validator_class):
+        schema = SPEC["components"]["schemas"]["Cat"]
+
+        optimized = optimize_schema(schema, SPEC, passes=[])
+
+        assert optimized.schema is schema
+        assert optimized.referrer == SPEC
+
+    def test_stripped(self, validator_class):
+        schema = {
+            "title": "Pet",
+            "description": "A pet",
+            "x-internal": True,
+            "nullable": False,
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "example": "Tom",
+                    "deprecated": True,
+                    "xml": {"name": "name"},
+                },
+            },
+            "anyOf": [{"type": "object"}],
+            "discriminator": {"propertyName": "kind"},
+        }
+
+        optimized = optimize_schema(schema)
+
+        assert optimized.schema == {
+            "title": "Pet",
+            "properties": {"name": {"type": "string"}},
+            "anyOf": [{"type": "object"}],
+            "discriminator": {"propertyName": "kind"},
+        }
+
+    def test_always_true_folded(self, validator_class):
+        schema = {
+            "allOf": [{}, {"description": "x"}, {"minProperties": 1}],
+            "anyOf": [{"required": ["a"]}, {}],
+            "properties": {"a": {}},
+            "additionalProperties": True,
+            "items": {},
+        }
+
+        optimized = optimize_schema(schema, passes=[fold_always_true])
+
+        assert optimized.schema == {
+            "allOf": [{"description": "x"}, {"minProperties": 1}],
+        }
+
+    def test_folded_relocated(self, validator_class):
+        schema = {
+            "allOf": [{}, {"minProperties": 1}],
+            "anyOf": [{"required": ["kind"]}],
+        }
+
+        optimized = optimize_schema(schema, passes=[fold_always_true])
+        validator = validator_class(optimized.schema)
+
+        assert optimized.schema["allOf"] == [{"minProperties": 1}]
+        schema_paths = sorted(
+            list(error.schema_path)
+            for error in optimized.iter_errors(validator, {})
+        )
+        assert schema_paths == [["allOf", 1, "minProperties"], ["anyOf"]]
+
+    def test_constant_checks_first(self, validator_class):
+        schema = {
+            "properties": {"a": {"type": "string"}},
+            "pattern": "a",
+            "type": "object",
+            "required": ["a"],
+        }
+
+        optimized = optimize_schema(schema)
+
+        assert list(optimized.schema) == [
+            "type",
+            "required",
+            "properties",
+            "pattern",
+        ]
+
+
+class TestOptimizeSchemaOAS30:
+    def test_nullable(self):
+        schema = {
+            "allOf": [
+                {"type": "object", "nullable": True},
+                {"type": "object"},
+            ],
+        }
+
+        optimized = optimize_schema(schema)
+
+        assert optimized.schema == {"type": "object"}
+        validator = OAS30Validator(optimized.schema)
+        found = list(optimized.iter_errors(validator, None))
+        assert found
+        assert all(
+            list(error.schema_path) == ["allOf", 1, "type"] for error in found
+        )
+
+    def test_read_only_required_kept(self):
+        # required of the parent doesn't see readOnly inside allOf
+        schema = {
+            "required": ["id"],
+            "allOf": [{"properties": {"id": {"readOnly": True}}}],
+        }
+
+        optimized = optimize_schema(schema)
+
+        assert optimized.schema is schema
+        validator = OAS30Validator(optimized.schema, write=True)
+        assert not validator.is_valid({})
+
+
+class TestOptimizeSchemaOAS31:
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {
+                "allOf": [{"properties": {"a": {"type": "string"}}}],
+                "unevaluatedProperties": False,
+            },
+            {
+                "allOf": [{"$ref": "#/$defs/A"}],
+                "$defs": {
+                    "A": {
+                        "allOf": [{"properties": {"a": {"type": "string"}}}],
+                        "unevaluatedProperties": False,
+                    },
+                },
+            },
+            {
+                "allOf": [{"properties": {"a": {}}}],
+                "unevaluatedProperties": False,
+            },
+            {
+                "$ref": "#/$defs/B",
+                "unevaluatedProperties": False,
+                "$defs": {"B": {"properties": {"a": True}}},
+            },
+            {
+                "anyOf": [{}, {"properties": {"b": {}}}],
+                "unevaluatedProperties": False,
+            },
+            {"items": {}, "unevaluatedItems": False},
+        ],
+    )
+    def test_unevaluated_same_errors(self, schema):
+        optimized = optimize_schema(schema)
+        original = OAS31Validator(schema)
+        validator = OAS31Validator(
+            optimized.schema, resolver=RefResolver("", optimized.referrer)
+        )
+
+        for instance in [
+            {},
+            {"a": "x"},
+            {"a": 1},
+            {"b": 1},
+            {"a": "x", "b": 1},
+            [1, "x"],
+        ]:
+            assert errors(validator, instance, optimized) == errors(
+                original, instance
+            )
+
+    def test_unevaluated_not_folded(self):
+        schema = {
+            "$ref": "#/$defs/B",
+            "unevaluatedProperties": False,
+            "$defs": {"B": {"properties": {"a": True}}},
+        }
+
+        optimized = optimize_schema(schema, passes=[fold_always_true])
+
+        assert optimized.schema is schema
+        assert optimized.referrer == schema
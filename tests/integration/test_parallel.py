@@ -0,0 +1,189 @@
+import pickle
+
+import pytest
+from jsonschema.exceptions import ValidationError
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.limits import Limits
+from openapi_schema_validator import parallel
+from openapi_schema_validator.metrics import Metrics
+from openapi_schema_validator.parallel import ParallelValidator
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "Export": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Item"},
+                        "uniqueItems": True,
+                    },
+                    "matrix": {"$ref": "#/components/schemas/Matrix"},
+                    "meta": {
+                        "type": "object",
+                        "properties": {
+                            "ids": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "maxItems": 5,
+                            },
+                        },
+                    },
+                },
+            },
+            "Item": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {"id": {"type": "integer", "minimum": 0}},
+            },
+            "Matrix": {
+                "type": "array",
+                "items": {"type": "array", "items": {"type": "number"}},
+            },
+        },
+    },
+}
+DOCUMENT = {
+    "items": [{"id": 1}, {"id": -1}, {}, {"id": 2}, {"id": 1}],
+    "matrix": [[1], [2, "a"], [], ["b"]],
+    "meta": {"ids": [1, 2, "c", 4, 5, 6]},
+}
+
+
+def errors(found):
+    return sorted(
+        (tuple(error.path), tuple(error.schema_path), error.message)
+        for error in found
+    )
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestParallelValidator:
+    def validator(self, validator_class, **kwargs):
+        return validator_class(
+            SPEC["components"]["schemas"]["Export"],
+            resolver=RefResolver("", SPEC),
+            **kwargs,
+        )
+
+    def test_same_errors(self, validator_class):
+        validator = self.validator(validator_class)
+
+        with ParallelValidator(validator, 2, chunk_size=2) as parallel:
+            found = errors(parallel.iter_errors(DOCUMENT))
+
+        assert found == errors(validator.iter_errors(DOCUMENT))
+        assert (
+            ("items", 1, "id"),
+            ("properties", "items", "items", "properties", "id", "minimum"),
+            "-1 is less than the minimum of 0",
+        ) in found
+        assert (
+            ("matrix", 1, 1),
+            ("properties", "matrix", "items", "items", "type"),
+            "'a' is not of type 'number'",
+        ) in found
+
+    def test_unique_items_across_chunks(self, validator_class):
+        validator = self.validator(validator_class)
+        document = {"items": [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 1}]}
+
+        with ParallelValidator(validator, 2, chunk_size=2) as parallel:
+            (error,) = parallel.iter_errors(document)
+
+        assert error.validator == "uniqueItems"
+        assert list(error.path) == ["items"]
+
+    def test_valid(self, validator_class):
+        validator = self.validator(validator_class)
+        document = {"items": [{"id": index} for index in range(10)]}
+
+        with ParallelValidator(validator, 2, chunk_size=3) as parallel:
+            assert parallel.is_valid(document)
+            parallel.validate(document)
+            assert not parallel.is_valid(DOCUMENT)
+            with pytest.raises(ValidationError):
+                parallel.validate(DOCUMENT)
+
+    def test_not_split(self, validator_class):
+        validator = self.validator(validator_class)
+
+        with ParallelValidator(validator, 2) as parallel:
+            found = errors(parallel.iter_errors(DOCUMENT))
+
+        assert parallel._executor is None
+        assert found == errors(validator.iter_errors(DOCUMENT))
+
+    def test_limits(self, validator_class):
+        validator = self.validator(
+            validator_class, limits=Limits(max_nodes=1000)
+        )
+
+        with ParallelValidator(validator, 2, chunk_size=2) as parallel:
+            found = errors(parallel.iter_errors(DOCUMENT))
+
+        assert found == errors(validator.iter_errors(DOCUMENT))
+        assert parallel._executor is None
+
+    def test_worker_resolves_schema(self, validator_class, monkeypatch):
+        validator = self.validator(validator_class)
+        document = {"items": [{"id": index} for index in range(-2, 4)]}
+        planner = parallel._Planner(validator, 2)
+        planner.shell(validator.schema, document, [], [])
+        (split,) = planner.splits
+        # workers get a copy of the validator
+        worker = pickle.loads(pickle.dumps(validator))
+        monkeypatch.setattr(parallel, "_validator", worker)
+
+        for _ in range(3):
+            chunk_errors = parallel._validate_chunk(
+                split.ref, split.pointer, split.scope, 0, split.items
+            )
+
+        assert [list(error.path) for error in chunk_errors] == [
+            [0, "id"],
+            [1, "id"],
+        ]
+        assert parallel._subschema(split.ref, split.pointer) is (
+            worker.resolver.referrer["components"]["schemas"]["Export"][
+                "properties"
+            ]["items"]["items"]
+        )
+
+    def test_metrics(self, validator_class):
+        metrics = Metrics()
+        validator = self.validator(validator_class, metrics=metrics)
+
+        with ParallelValidator(validator, 2, chunk_size=2) as parallel:
+            parallel.is_valid(DOCUMENT)
+
+        snapshot = metrics.snapshot()
+        assert snapshot.validations == {"": 1}
+        assert snapshot.failures == {"": 1}
+
+
+class TestParallelValidatorOAS30:
+    def test_write_context(self):
+        schema = {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"id": {"type": "integer", "readOnly": True}},
+            },
+        }
+        validator = OAS30Validator(schema, write=True)
+        document = [{}, {"id": 1}, {}]
+
+        with ParallelValidator(validator, 2, chunk_size=1) as parallel:
+            (error,) = parallel.iter_errors(document)
+
+        assert list(error.path) == [1, "id"]
+        assert error.validator == "readOnly"
+
+    def test_chunk_size(self):
+        with pytest.raises(ValueError):
+            ParallelValidator(OAS30Validator({}), chunk_size=0)
@@ -0,0 +1,172 @@
+import re
+
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.limits import LimitExceededError
+from openapi_schema_validator.patterns import LinearPattern
+from openapi_schema_validator.patterns import PatternPolicy
+from openapi_schema_validator.patterns import analyze_pattern
+
+
+class TestAnalyzePattern:
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"^(a+)+$",
+            r"(\w+\s?)*$",
+            r"(x+x+)+y",
+            r"^(([a-z])+.)+[A-Z]([a-z])+$",
+        ],
+    )
+    def test_nested_quantifier(self, pattern):
+        (issue,) = analyze_pattern(pattern)
+
+        assert issue.startswith("nested quantifier")
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"^(\w+|\d+)*$",
+            r"(ab|a.)*c",
+            r"^(a|a?)+$",
+            r"(a|aa)*$",
+            r"(a|ab)*",
+        ],
+    )
+    def test_ambiguous_alternation(self, pattern):
+        (issue,) = analyze_pattern(pattern)
+
+        assert issue.startswith("ambiguous alternation")
+
+    @pytest.mark.parametrize("pattern", [r"(a?a)*$", r"^(\d?\d)+$"])
+    def test_ambiguous_option(self, pattern):
+        (issue,) = analyze_pattern(pattern)
+
+        assert issue.startswith("ambiguous option")
+
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"^[a-z]+$",
+            r"^([a-z0-9]+[-.])*[a-z]+$",
+            r"^(\d{3}-)*\d{4}$",
+            r"^(\d{3}-?)*$",
+            r"^(foo|bar)*$",
+            r"^\+?[0-9 ]+$",
+            r"(a{2})*",
+        ],
+    )
+    def test_safe(self, pattern):
+        assert analyze_pattern(pattern) == []
+
+    def test_invalid(self):
+        with pytest.raises(re.error):
+            analyze_pattern("(")
+
+
+class TestLinearPattern:
+    @pytest.mark.parametrize(
+        "pattern",
+        [
+            r"^(a+)+$",
+            r"(ab|a.)*c",
+            r"^[^\d_-]{2,3}\b",
+            r"(?i)^A[b-d]+$",
+            r"x?y{0,2}z",
+            r"^$",
+            r"\Aa\Z",
+            r"(?m)^b$",
+            r"(?s)a.b",
+            r"\Bb\s+\S",
+            r"[\w.]+@\W",
+        ],
+    )
+    @pytest.mark.parametrize(
+        "string",
+        [
+            "",
+            "a",
+            "aaa!",
+            "ab",
+            "Abcd",
+            "abc",
+            "yyz",
+            "a\nb",
+            "a\n",
+            "b ",
+            "_@!",
+        ],
+    )
+    def test_same_as_re(self, pattern, string):
+        expected = re.search(pattern, string) is not None
+
+        assert LinearPattern(pattern).search(string) is expected
+
+    def test_linear(self):
+        pattern = LinearPattern(r"^(a+)+$", max_steps=200_000)
+
+        assert pattern.search("a" * 10_000 + "!") is False
+
+    def test_max_steps(self):
+        pattern = LinearPattern(r"^(a+)+$", max_steps=1000)
+
+        with pytest.raises(LimitExceededError) as exc_info:
+            pattern.search("a" * 1000)
+
+        assert exc_info.value.limit == "max_pattern_steps"
+
+    @pytest.mark.parametrize("pattern", [r"(a)\1", r"a(?=b)", r"(?>a+)b"])
+    def test_unsupported(self, pattern):
+        with pytest.raises(ValueError):
+            LinearPattern(pattern)
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestPatternPolicy:
+    schema = {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "pattern": r"^(\w+\s?)*$"},
+            "code": {"type": "string", "pattern": r"^[A-Z]{3}$"},
+        },
+    }
+
+    def test_unsafe_patterns(self, validator_class):
+        validator = validator_class(self.schema)
+
+        assert list(validator.keyword_cache.unsafe_patterns) == [
+            r"^(\w+\s?)*$"
+        ]
+
+    def test_flagged(self, validator_class):
+        validator = validator_class(
+            self.schema, pattern_policy=PatternPolicy()
+        )
+
+        errors = list(
+            validator.iter_errors({"name": "a" * 5000 + "!", "code": "AB"})
+        )
+
+        assert [error.path[0] for error in errors] == ["name", "code"]
+        regex = validator.keyword_cache.regex
+        assert isinstance(regex(r"^(\w+\s?)*$"), LinearPattern)
+        assert not isinstance(regex(r"^[A-Z]{3}$"), LinearPattern)
+
+    def test_all(self, validator_class):
+        validator = validator_class(
+            self.schema, pattern_policy=PatternPolicy(linear="all")
+        )
+
+        assert validator.is_valid({"name": "a b", "code": "ABC"})
+        regex = validator.keyword_cache.regex
+        assert isinstance(regex(r"^[A-Z]{3}$"), LinearPattern)
+
+    def test_max_steps(self, validator_class):
+        validator = validator_class(
+            self.schema, pattern_policy=PatternPolicy(max_steps=1000)
+        )
+
+        with pytest.raises(LimitExceededError):
+            validator.is_valid({"name": "a" * 1000})
@@ -0,0 +1,121 @@
+import multiprocessing
+import pickle
+from operator import methodcaller
+
+import pytest
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import ResultCache
+from openapi_schema_validator import ThreadSafeValidator
+from openapi_schema_validator import oas30_format_checker
+from openapi_schema_validator import oas31_format_checker
+from openapi_schema_validator.limits import Limits
+from openapi_schema_validator.patterns import LinearPattern
+from openapi_schema_validator.patterns import PatternPolicy
+
+
+def error_messages(validator, instance):
+    return sorted(error.message for error in validator.iter_errors(instance))
+
+
+@pytest.mark.parametrize(
+    "validator_class,format_checker",
+    [
+        (OAS30Validator, oas30_format_checker),
+        (OAS31Validator, oas31_format_checker),
+    ],
+)
+class TestPickle:
+    schema = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer", "format": "int32"},
+            "kind": {"enum": ["a", "b"]},
+            "code": {"type": "string", "pattern": r"^(\w+\s?)*$"},
+            "owner": {"$ref": "#/components/schemas/Owner"},
+        },
+        "components": {
+            "schemas": {
+                "Owner": {"type": "string", "readOnly": True},
+            },
+        },
+    }
+    invalid = {"id": 2**40, "kind": "c", "code": "a!", "owner": 1}
+
+    def test_round_trip(self, validator_class, format_checker):
+        validator = validator_class(
+            self.schema,
+            format_checker=format_checker,
+            pattern_policy=PatternPolicy(max_steps=10_000),
+            limits=Limits(max_depth=10),
+            result_cache=ResultCache(maxsize=8),
+        )
+        expected = error_messages(validator, self.invalid)
+
+        unpickled = pickle.loads(pickle.dumps(validator))
+
+        assert type(unpickled) is validator_class
+        assert unpickled.schema == self.schema
+        assert unpickled.resolver.referrer is unpickled.schema
+        assert unpickled.limits == validator.limits
+        assert unpickled.result_cache.maxsize == 8
+        assert isinstance(
+            unpickled.keyword_cache.regex(r"^(\w+\s?)*$"), LinearPattern
+        )
+        assert error_messages(unpickled, self.invalid) == expected
+        assert unpickled.is_valid({"id": 1, "kind": "a", "owner": "x"})
+
+    def test_read_write_context(self, validator_class, format_checker):
+        if validator_class is OAS31Validator:
+            pytest.skip("read/write context is only supported by OAS 3.0")
+        validator = validator_class(self.schema, write=True)
+
+        unpickled = pickle.loads(pickle.dumps(validator))
+
+        assert unpickled.write == validator.write
+        assert error_messages(unpickled, {"id": 1}) == error_messages(
+            validator, {"id": 1}
+        )
+
+    def test_resolved_documents_kept(self, validator_class, format_checker):
+        remote = {"Id": {"type": "integer"}}
+        resolver = RefResolver(
+            "", self.schema, store={"https://example.com/defs": remote}
+        )
+        validator = validator_class(
+            {"$ref": "https://example.com/defs#/Id"}, resolver=resolver
+        )
+
+        unpickled = pickle.loads(pickle.dumps(validator))
+
+        assert unpickled.resolver.store["https://example.com/defs"] == remote
+        assert not unpickled.is_valid("1")
+
+    def test_thread_safe_validator(self, validator_class, format_checker):
+        validator = ThreadSafeValidator(self.schema, validator_class)
+        validator.is_valid({})
+
+        unpickled = pickle.loads(pickle.dumps(validator))
+
+        assert error_messages(unpickled, self.invalid) == error_messages(
+            validator, self.invalid
+        )
+
+    def test_pool(self, validator_class, format_checker):
+        validator = validator_class(self.schema, format_checker=format_checker)
+        instances = [{"id": 1}, self.invalid, {}]
+        context = multiprocessing.get_context("spawn")
+
+        with context.Pool(2) as pool:
+            results = pool.map(
+                methodcaller("is_valid", self.invalid), [validator] * 2
+            )
+            validators = pool.map(pickle.loads, [pickle.dumps(validator)])
+
+        assert results == [False, False]
+        assert [error_messages(validators[0], each) for each in instances] == [
+            error_messages(validator, each) for each in instances
+        ]
@@ -0,0 +1,161 @@
+import pickle
+from itertools import count
+
+import pytest
+from jsonschema.validators import RefResolver
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.profiling import Profiler
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "Order": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Item"},
+                    },
+                    "pet": {
+                        "oneOf": [
+                            {"$ref": "#/components/schemas/Cat"},
+                            {"$ref": "#/components/schemas/Dog"},
+                        ],
+                        "discriminator": {"propertyName": "kind"},
+                    },
+                },
+            },
+            "Item": {
+                "type": "object",
+                "properties": {"sku": {"type": "string"}},
+            },
+            "Cat": {"type": "object", "required": ["lives"]},
+            "Dog": {"type": "object"},
+        },
+    },
+}
+ORDER = "#/components/schemas/Order"
+ITEMS = ORDER + "/properties/items"
+
+
+def timer():
+    # every call takes a millisecond
+    ticks = count()
+    return lambda: next(ticks) / 1000
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestProfiler:
+    def validator(self, validator_class, profiler):
+        return validator_class(
+            SPEC["components"]["schemas"]["Order"],
+            resolver=RefResolver("", SPEC),
+            profiler=profiler,
+        )
+
+    def test_locations(self, validator_class):
+        profiler = Profiler()
+        validator = self.validator(validator_class, profiler)
+
+        assert validator.is_valid({"items": [{"sku": "a"}, {"sku": "b"}]})
+
+        stats = profiler.stats()
+        assert profiler.validations == 1
+        assert stats[ORDER].visits == 1
+        assert stats[ITEMS + "/items"].visits == 2
+        assert stats["#/components/schemas/Item"].visits == 2
+        assert stats["#/components/schemas/Item/properties/sku"].visits == 2
+        assert stats[ORDER].total_time >= stats[ITEMS].total_time
+
+    def test_stacks(self, validator_class):
+        profiler = Profiler(timer=timer())
+        validator = self.validator(validator_class, profiler)
+
+        validator.is_valid({"items": [{}]})
+
+        stacks = profiler.stacks()
+        item = (ORDER, ITEMS, ITEMS + "/items", "#/components/schemas/Item")
+        assert item in stacks
+        assert all(stats.self_time >= 0 for stats in stacks.values())
+        assert stacks[item[:1]].total_time == pytest.approx(
+            sum(stats.self_time for stats in stacks.values())
+        )
+
+    def test_discriminator_branch(self, validator_class):
+        profiler = Profiler()
+        validator = self.validator(validator_class, profiler)
+
+        assert not validator.is_valid({"pet": {"kind": "Cat"}})
+
+        stats = profiler.stats()
+        assert stats["#/components/schemas/Cat"].visits == 1
+        assert "#/components/schemas/Dog" not in stats
+
+    def test_sampling(self, validator_class):
+        profiler = Profiler(rate=0.1, seed=1)
+        validator = self.validator(validator_class, profiler)
+
+        for _ in range(200):
+            validator.is_valid({})
+
+        assert 5 < profiler.validations < 40
+        assert profiler.stats()[ORDER].visits == profiler.validations
+
+    def test_sampled_at_root(self, validator_class):
+        profiler = Profiler(rate=0.01, seed=1)
+        validator = self.validator(validator_class, profiler)
+
+        for _ in range(5):
+            validator.is_valid({"items": [{}] * 1000})
+
+        assert profiler.validations == 0
+        assert profiler.stats() == {}
+
+    def test_collapsed(self, validator_class):
+        profiler = Profiler(timer=timer())
+        validator = self.validator(validator_class, profiler)
+
+        validator.is_valid({"items": [{}]})
+
+        lines = profiler.collapsed().splitlines()
+        stacks = dict(line.rsplit(" ", 1) for line in lines)
+        assert f"{ORDER};{ITEMS}" in stacks
+        assert all(int(value) >= 0 for value in stacks.values())
+
+    def test_top(self, validator_class):
+        profiler = Profiler()
+        validator = self.validator(validator_class, profiler)
+
+        validator.is_valid({"items": [{}] * 3})
+
+        top = profiler.top(2, by="visits")
+        assert [stats.visits for _, stats in top] == [3, 3]
+        report = profiler.report(2, by="visits")
+        assert len(report.splitlines()) == 3
+
+    def test_reset(self, validator_class):
+        profiler = Profiler()
+        self.validator(validator_class, profiler).is_valid({})
+
+        profiler.reset()
+
+        assert profiler.validations == 0
+        assert profiler.collapsed() == ""
+
+
+class TestProfilerOptions:
+    def test_rate(self):
+        with pytest.raises(ValueError):
+            Profiler(rate=0)
+
+    def test_pickle(self):
+        profiler = Profiler(rate=0.5, seed=3)
+        validator = OAS31Validator({}, profiler=profiler)
+        validator.is_valid({})
+
+        unpickled = pickle.loads(pickle.dumps(validator))
+
+        assert unpickled.profiler.rate == 0.5
+        assert unpickled.profiler.stats() == {}
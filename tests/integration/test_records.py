@@ -0,0 +1,90 @@
+import gc
+import weakref
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.records import ErrorRecord
+from openapi_schema_validator.records import iter_records
+
+
+class Node(dict):
+    pass
+
+
+class TestErrorRecord:
+    schema = {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "integer"}},
+            "oneOf": [
+                {"required": ["cat"]},
+                {"required": ["dog"]},
+            ],
+        },
+    }
+
+    def test_to_error(self):
+        validator = OAS31Validator(self.schema)
+        document = [{"id": "1"}]
+        errors = list(validator.iter_errors(document))
+
+        records = list(iter_records(validator.iter_errors(document)))
+
+        assert len(records) == len(errors)
+        for record, error in zip(records, errors):
+            converted = record.to_error(document)
+            assert converted.message == error.message
+            assert converted.validator == error.validator
+            assert converted.validator_value == error.validator_value
+            assert converted.path == error.path
+            assert converted.schema_path == error.schema_path
+            assert converted.instance == error.instance
+            assert converted.schema is error.schema
+            assert [each.message for each in converted.context] == [
+                each.message for each in error.context
+            ]
+            assert [each.instance for each in converted.context] == [
+                each.instance for each in error.context
+            ]
+
+    def test_containers_not_kept(self):
+        validator = OAS31Validator(self.schema)
+        document = [Node(id=1)]
+        node = weakref.ref(document[0])
+
+        records = list(iter_records(validator.iter_errors(document)))
+        del document
+        gc.collect()
+
+        assert node() is None
+        assert len(records) == 1
+        assert not records[0].has_instance
+        assert records[0].to_error().message == records[0].message
+
+    def test_scalars_kept(self):
+        validator = OAS31Validator(self.schema)
+
+        (record,) = [
+            record
+            for record in iter_records(validator.iter_errors([{"id": "1"}]))
+            if record.keyword == "type"
+        ]
+
+        assert record.has_instance
+        assert record.to_error().instance == "1"
+
+    def test_shared_paths(self):
+        validator = OAS30Validator(self.schema)
+        interned = {}
+
+        first, second = [
+            ErrorRecord.from_error(error, interned)
+            for error in validator.iter_errors([{"id": 1}, {"id": 2}])
+        ]
+
+        assert first.path == (0,)
+        assert second.path == (1,)
+        assert first.schema_path is second.schema_path
+        assert not hasattr(first, "__dict__")
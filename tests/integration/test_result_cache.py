@@ -0,0 +1,231 @@
+import json
+
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import ResultCache
+from openapi_schema_validator import oas30_format_checker
+from openapi_schema_validator.limits import LimitExceededError
+from openapi_schema_validator.limits import Limits
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def errors(validator, instance):
+    return [
+        (list(error.path), error.message)
+        for error in validator.iter_errors(instance)
+    ]
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestResultCache:
+    schema = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer"},
+            "tags": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Tag"},
+            },
+        },
+        "components": {
+            "schemas": {
+                "Tag": {
+                    "type": "object",
+                    "properties": {"name": {"type": "string"}},
+                    "required": ["name"],
+                },
+            },
+        },
+    }
+
+    def test_hit(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+        instance = {"id": "1", "tags": [{"name": 1}]}
+        expected = errors(validator_class(self.schema), instance)
+
+        assert errors(validator, instance) == expected
+        assert errors(validator, json.loads(json.dumps(instance))) == expected
+        assert cache.info().hits == 1
+
+    def test_errors_are_copies(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+        instance = {"tags": [{}]}
+
+        for error in validator.iter_errors(instance):
+            error.path.appendleft("outer")
+
+        assert errors(validator, instance) == [
+            ([], "'id' is a required property"),
+            (["tags", 0], "'name' is a required property"),
+        ]
+
+    def test_items_deduplicated(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+        instance = {"id": 1, "tags": [{"name": 1}, {}] * 500}
+
+        assert errors(validator, instance) == errors(
+            validator_class(self.schema), instance
+        )
+        # whole instance and two distinct tags
+        assert cache.info().misses == 3
+        assert cache.info().hits == 998
+
+    def test_json_types_distinguished(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+
+        assert errors(validator, {"id": 1}) == []
+        assert errors(validator, {"id": 1.5}) != []
+        assert errors(validator, {"id": True}) != []
+
+    def test_schema_keyed(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+        strict = validator_class(
+            dict(self.schema, additionalProperties=False), result_cache=cache
+        )
+        instance = {"id": 1, "extra": 1}
+
+        assert errors(validator, instance) == []
+        assert errors(strict, instance) != []
+
+    def test_raw(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema)
+        raw = b'{"id": "1"}'
+
+        first = list(cache.iter_errors(validator, json.loads(raw), raw=raw))
+        second = list(cache.iter_errors(validator, json.loads(raw), raw=raw))
+
+        assert [error.message for error in first] == [
+            error.message for error in second
+        ]
+        assert cache.info().hits == 1
+
+    def test_partially_consumed_not_stored(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+
+        assert not validator.is_valid({"id": "1", "tags": 1})
+        assert cache.info().currsize == 0
+        assert len(errors(validator, {"id": "1", "tags": 1})) == 2
+
+    def test_lru(self, validator_class):
+        cache = ResultCache(maxsize=2)
+        validator = validator_class(self.schema, result_cache=cache)
+
+        for instance in [{"id": 1}, {"id": 2}, {"id": 1}, {"id": 3}]:
+            errors(validator, instance)
+        errors(validator, {"id": 1})
+
+        assert cache.info() == (2, 3, 1, 2, 2)
+
+    def test_ttl(self, validator_class):
+        timer = FakeTimer()
+        cache = ResultCache(ttl=10, timer=timer)
+        validator = validator_class(self.schema, result_cache=cache)
+
+        errors(validator, {"id": 1})
+        timer.now = 5
+        errors(validator, {"id": 1})
+        timer.now = 20
+        errors(validator, {"id": 1})
+
+        assert cache.info().hits == 1
+        assert cache.info().misses == 2
+
+    def test_unserializable_not_cached(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(self.schema, result_cache=cache)
+
+        assert errors(validator, {"id": object()}) != []
+        assert cache.info() == (0, 0, 0, 1024, 0)
+
+    def test_limits_checked_first(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class(
+            {"type": "array", "items": {"$ref": "#"}},
+            limits=Limits(max_depth=50),
+            result_cache=cache,
+        )
+        instance = []
+        for _ in range(5000):
+            instance = [instance]
+
+        with pytest.raises(LimitExceededError):
+            list(validator.iter_errors(instance))
+        assert cache.info() == (0, 0, 0, 1024, 0)
+
+    def test_deep_not_cached(self, validator_class):
+        cache = ResultCache()
+        validator = validator_class({"type": "array"}, result_cache=cache)
+        instance = []
+        for _ in range(100000):
+            instance = [instance]
+
+        assert errors(validator, instance) == []
+        assert cache.info() == (0, 0, 0, 1024, 0)
+
+
+class TestResultCacheContext:
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer", "readOnly": True},
+            "date": {"type": "string", "format": "date"},
+        },
+    }
+
+    def test_read_write(self):
+        cache = ResultCache()
+        instance = {"id": 1}
+
+        assert (
+            errors(OAS30Validator(self.schema, result_cache=cache), instance)
+            == []
+        )
+        assert (
+            errors(
+                OAS30Validator(self.schema, result_cache=cache, write=True),
+                instance,
+            )
+            != []
+        )
+
+    def test_format_checker(self):
+        cache = ResultCache()
+        instance = {"date": "not a date"}
+
+        assert (
+            errors(OAS30Validator(self.schema, result_cache=cache), instance)
+            == []
+        )
+        assert (
+            errors(
+                OAS30Validator(
+                    self.schema,
+                    result_cache=cache,
+                    format_checker=oas30_format_checker,
+                ),
+                instance,
+            )
+            != []
+        )
+
+    @pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"ttl": 0}])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            ResultCache(**kwargs)
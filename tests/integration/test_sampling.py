@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import ResultCache
+from openapi_schema_validator.sampling import Sampling
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestSampling:
+    schema = {
+        "type": "object",
+        "properties": {
+            "ids": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "maxItems": 1000,
+            },
+        },
+    }
+
+    def test_count(self, validator_class):
+        sampling = Sampling(count=10, seed=1)
+        validator = validator_class(self.schema, sampling=sampling)
+        instance = {"ids": ["x"] * 100}
+
+        errors = list(validator.iter_errors(instance))
+
+        checked = sampling.checked[("ids",)]
+        assert len(checked) == 10
+        assert checked == sorted(checked)
+        assert [error.path[-1] for error in errors] == checked
+        assert all(list(error.path)[:1] == ["ids"] for error in errors)
+
+    def test_rate(self, validator_class):
+        sampling = Sampling(rate=0.25)
+        validator = validator_class(self.schema, sampling=sampling)
+
+        validator.is_valid({"ids": list(range(101))})
+
+        assert len(sampling.checked[("ids",)]) == 26
+
+    def test_deterministic(self, validator_class):
+        instance = {"ids": list(range(1000))}
+        samples = []
+        for seed in (1, 1, 2):
+            sampling = Sampling(count=5, seed=seed)
+            validator_class(self.schema, sampling=sampling).validate(instance)
+            samples.append(sampling.checked[("ids",)])
+
+        assert samples[0] == samples[1]
+        assert samples[0] != samples[2]
+
+    def test_small_array_checked_fully(self, validator_class):
+        sampling = Sampling(count=10)
+        validator = validator_class(self.schema, sampling=sampling)
+
+        errors = list(validator.iter_errors({"ids": ["a", "b"]}))
+
+        assert len(errors) == 2
+        assert sampling.checked == {}
+
+    def test_array_keywords_not_sampled(self, validator_class):
+        sampling = Sampling(count=1)
+        validator = validator_class(self.schema, sampling=sampling)
+
+        errors = list(validator.iter_errors({"ids": list(range(1001))}))
+
+        assert [error.validator for error in errors] == ["maxItems"]
+
+    def test_result_cache_bypassed(self, validator_class):
+        cache = ResultCache()
+        sampling = Sampling(count=1)
+        validator = validator_class(
+            self.schema, sampling=sampling, result_cache=cache
+        )
+
+        validator.validate({"ids": [1, 2, 3]})
+
+        assert cache.info().currsize == 0
+        assert list(sampling.checked) == [("ids",)]
+
+    def test_checked_per_validation(self, validator_class):
+        sampling = Sampling(count=10)
+        validator = validator_class(self.schema, sampling=sampling)
+
+        assert validator.is_valid({"ids": list(range(100))})
+        assert list(sampling.checked) == [("ids",)]
+
+        assert validator.is_valid({"ids": [1]})
+        assert sampling.checked == {}
+
+    def test_threads(self, validator_class):
+        sampling = Sampling(count=3, seed=2)
+        validator = validator_class(self.schema, sampling=sampling)
+        instance = {"ids": ["x"] * 50}
+        expected = [
+            list(error.path) for error in validator.iter_errors(instance)
+        ]
+
+        def paths(_):
+            return [
+                list(error.path) for error in validator.iter_errors(instance)
+            ]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(paths, range(200)))
+
+        assert all(result == expected for result in results)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"rate": 0.5, "count": 1}, {"rate": 0}, {"count": 0}],
+    )
+    def test_invalid(self, validator_class, kwargs):
+        with pytest.raises(ValueError):
+            Sampling(**kwargs)
+
+
+class TestPrefixItems:
+    def test_prefix_and_items_share_sample(self):
+        schema = {
+            "type": "array",
+            "prefixItems": [{"type": "string"}] * 50,
+            "items": {"type": "integer"},
+        }
+        sampling = Sampling(count=20, seed=3)
+        validator = OAS31Validator(schema, sampling=sampling)
+        instance = [None] * 100
+
+        errors = list(validator.iter_errors(instance))
+
+        checked = sampling.checked[()]
+        assert [error.path[0] for error in errors] == checked
+        assert [
+            (error.schema_path[0], error.schema_path[1]) for error in errors
+        ] == [
+            ("prefixItems", index) if index < 50 else ("items", "type")
+            for index in checked
+        ]
@@ -0,0 +1,152 @@
+import pytest
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator.subtree import iter_errors
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestIterErrors:
+    schema = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer"},
+            "tags": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Tag"},
+            },
+            "pets": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Pet"},
+            },
+            "contact": {
+                "anyOf": [
+                    {
+                        "type": "object",
+                        "properties": {"email": {"type": "string"}},
+                    },
+                    {
+                        "type": "object",
+                        "properties": {"email": {"type": "boolean"}},
+                    },
+                ],
+            },
+        },
+        "components": {
+            "schemas": {
+                "Tag": {
+                    "type": "object",
+                    "properties": {"name": {"type": "string"}},
+                    "required": ["name"],
+                },
+                "Pet": {
+                    "type": "object",
+                    "oneOf": [
+                        {"$ref": "#/components/schemas/Cat"},
+                        {"$ref": "#/components/schemas/Dog"},
+                    ],
+                    "discriminator": {
+                        "propertyName": "petType",
+                        "mapping": {"cat": "#/components/schemas/Cat"},
+                    },
+                },
+                "Cat": {
+                    "type": "object",
+                    "properties": {"lives": {"type": "integer", "maximum": 9}},
+                },
+                "Dog": {
+                    "type": "object",
+                    "properties": {"bark": {"type": "string"}},
+                    "required": ["bark"],
+                },
+            },
+        },
+    }
+    document = {
+        "tags": [{"name": 1}, {}, {"name": "ok"}],
+        "pets": [
+            {"petType": "cat", "lives": 20},
+            {"petType": "Dog"},
+            {"petType": "cat", "lives": "a"},
+        ],
+        "contact": {"email": 1},
+    }
+
+    @pytest.mark.parametrize(
+        "pointer",
+        [
+            "",
+            "/tags",
+            "/tags/0",
+            "/tags/0/name",
+            "/tags/1",
+            "/tags/2/name",
+            "/pets/0",
+            "/pets/0/lives",
+            "/pets/1",
+            "/pets/2/lives",
+        ],
+    )
+    def test_same_as_full(self, validator_class, pointer):
+        validator = validator_class(self.schema)
+        tokens = [
+            int(token) if token.isdigit() else token
+            for token in pointer.split("/")[1:]
+        ]
+
+        errors = [
+            (list(error.path), list(error.schema_path), error.message)
+            for error in iter_errors(validator, self.document, pointer)
+        ]
+
+        full = [
+            (list(error.path), list(error.schema_path), error.message)
+            for error in validator.iter_errors(self.document)
+            if list(error.path)[: len(tokens)] == tokens
+        ]
+        assert errors == full
+
+    def test_ancestors_not_validated(self, validator_class):
+        validator = validator_class(self.schema)
+        document = {"id": "1", "tags": [{"name": "ok"}]}
+
+        assert list(iter_errors(validator, document, "/tags/0")) == []
+
+    def test_branches(self, validator_class):
+        validator = validator_class(self.schema)
+
+        (error,) = iter_errors(validator, self.document, "/contact/email")
+
+        assert list(error.path) == ["contact", "email"]
+        assert list(error.schema_path) == ["properties", "contact", "anyOf"]
+        assert error.validator == "anyOf"
+        assert [list(each.absolute_path) for each in error.context] == [
+            ["contact", "email"],
+            ["contact", "email"],
+        ]
+        assert [list(each.schema_path) for each in error.context] == [
+            [0, "properties", "email", "type"],
+            [1, "properties", "email", "type"],
+        ]
+
+    def test_branch_accepts(self, validator_class):
+        validator = validator_class(self.schema)
+        document = {"contact": {"email": False}}
+
+        assert list(iter_errors(validator, document, "/contact/email")) == []
+
+    @pytest.mark.parametrize(
+        "pointer,exception",
+        [
+            ("/missing", KeyError),
+            ("/tags/9", IndexError),
+            ("/tags/first", KeyError),
+            ("tags", ValueError),
+        ],
+    )
+    def test_invalid_pointer(self, validator_class, pointer, exception):
+        validator = validator_class(self.schema)
+
+        with pytest.raises(exception):
+            iter_errors(validator, self.document, pointer)
@@ -0,0 +1,264 @@
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest import mock
+from uuid import UUID
+
+import pytest
+from jsonschema import FormatChecker
+from jsonschema import ValidationError
+
+from openapi_schema_validator import OAS30Validator
+from openapi_schema_validator import OAS31Validator
+from openapi_schema_validator import ResultCache
+from openapi_schema_validator import oas30_format_checker
+from openapi_schema_validator.unmarshalling import FORMAT_CONVERTERS
+from openapi_schema_validator.unmarshalling import to_datetime
+from openapi_schema_validator.unmarshalling import unmarshal
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestUnmarshal:
+    schema = {
+        "type": "object",
+        "properties": {
+            "date": {"type": "string", "format": "date"},
+            "created": {"type": "string", "format": "date-time"},
+            "id": {"type": "string", "format": "uuid"},
+            "data": {"type": "string", "format": "byte"},
+            "days": {
+                "type": "array",
+                "items": {"type": "string", "format": "date"},
+            },
+            "extra": {
+                "type": "object",
+                "additionalProperties": {"$ref": "#/components/schemas/Date"},
+            },
+            "name": {"type": "string"},
+        },
+        "components": {
+            "schemas": {
+                "Date": {"type": "string", "format": "date"},
+            },
+        },
+    }
+
+    def test_converted(self, validator_class):
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+        instance = {
+            "date": "2020-01-02",
+            "created": "2020-01-02T03:04:05.25-01:30",
+            "id": "12345678-1234-5678-1234-567812345678",
+            "data": "aGk=",
+            "days": ["2020-01-01", "2021-02-03"],
+            "extra": {"end": "2022-03-04"},
+            "name": "2020-01-02",
+        }
+
+        result = unmarshal(validator, instance)
+
+        assert result == {
+            "date": date(2020, 1, 2),
+            "created": datetime(
+                2020,
+                1,
+                2,
+                3,
+                4,
+                5,
+                250000,
+                tzinfo=timezone(-timedelta(hours=1, minutes=30)),
+            ),
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "data": b"hi",
+            "days": [date(2020, 1, 1), date(2021, 2, 3)],
+            "extra": {"end": date(2022, 3, 4)},
+            "name": "2020-01-02",
+        }
+        assert instance["date"] == "2020-01-02"
+        assert instance["days"] == ["2020-01-01", "2021-02-03"]
+
+    def test_unconverted_shared(self, validator_class):
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+        instance = {"days": ["2020-01-01"], "extra": {}}
+
+        result = unmarshal(validator, instance)
+
+        assert result is not instance
+        assert result["days"] is not instance["days"]
+        assert result["extra"] is instance["extra"]
+
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            {"date": "2020-13-01"},
+            {"created": "2020-01-02T03:04:05"},
+            {"id": "12345678123456781234567812345678"},
+            {"data": "aGk"},
+            {"days": ["2020-01-01", "01/02/2020"]},
+        ],
+    )
+    def test_invalid(self, validator_class, instance):
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+
+        with pytest.raises(ValidationError) as exc_info:
+            unmarshal(validator, instance)
+
+        assert exc_info.value.validator == "format"
+
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            {"date": "2020-1-2"},
+            {"date": "2020-01-02T03:04:05Z"},
+            {"created": "2020-01-02 03:04:05Z"},
+            {"created": "2020-01-02T03:04:05"},
+            {"id": "12345678-1234-5678-1234-56781234567A"},
+            {"data": b"aGk="},
+        ],
+    )
+    def test_agrees_with_validate(self, validator_class, instance):
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+
+        if validator.is_valid(instance):
+            unmarshal(validator, instance)
+        else:
+            with pytest.raises(ValidationError):
+                unmarshal(validator, instance)
+
+    def test_date_converted_as_checked(self, validator_class):
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+
+        result = unmarshal(validator, {"date": "2020-1-2"})
+
+        assert result == {"date": date(2020, 1, 2)}
+
+    @mock.patch(
+        "openapi_schema_validator._format.DATETIME_HAS_RFC3339_VALIDATOR",
+        False,
+    )
+    @mock.patch(
+        "openapi_schema_validator._format.DATETIME_HAS_STRICT_RFC3339",
+        False,
+    )
+    @mock.patch("openapi_schema_validator._format.DATETIME_HAS_ISODATE", False)
+    def test_unconvertible_kept(self, validator_class):
+        # without a date-time library every string is a date-time
+        validator = validator_class(
+            self.schema, format_checker=oas30_format_checker
+        )
+        instance = {"created": "yesterday"}
+
+        assert unmarshal(validator, instance) == instance
+
+    def test_failed_branch_not_converted(self, validator_class):
+        validator = validator_class(
+            {
+                "oneOf": [
+                    {"type": "string", "format": "uuid", "maxLength": 3},
+                    {"type": "string", "minLength": 4},
+                ],
+            },
+            format_checker=oas30_format_checker,
+        )
+        instance = "12345678-1234-5678-1234-567812345678"
+
+        assert unmarshal(validator, instance) == instance
+
+    def test_without_format_checker(self, validator_class):
+        validator = validator_class(self.schema)
+        instance = {"date": "2020-13-01", "id": "1"}
+
+        assert unmarshal(validator, instance) == instance
+
+    def test_custom_converters(self, validator_class):
+        format_checker = FormatChecker(())
+
+        @format_checker.checks("float-string", raises=ValueError)
+        def is_float_string(instance):
+            return float(instance) is not None
+
+        validator = validator_class(
+            {"type": "string", "format": "float-string"},
+            format_checker=format_checker,
+        )
+        converters = dict(FORMAT_CONVERTERS, **{"float-string": float})
+
+        assert unmarshal(validator, "1.5", converters) == 1.5
+        with pytest.raises(ValidationError):
+            unmarshal(validator, "one", converters)
+
+    def test_result_cache_bypassed(self, validator_class):
+        validator = validator_class(
+            self.schema,
+            format_checker=oas30_format_checker,
+            result_cache=ResultCache(),
+        )
+        instance = {"date": "2020-01-02"}
+
+        validator.validate(instance)
+
+        assert unmarshal(validator, instance) == {"date": date(2020, 1, 2)}
+
+
+class TestToDatetime:
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            (
+                "2020-01-02T03:04:05Z",
+                datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            ),
+            (
+                "2020-01-02t03:04:05.1234567+02:00",
+                datetime(
+                    2020,
+                    1,
+                    2,
+                    3,
+                    4,
+                    5,
+                    123456,
+                    tzinfo=timezone(timedelta(hours=2)),
+                ),
+            ),
+            (
+                "2016-12-31T23:59:60Z",
+                datetime(2017, 1, 1, tzinfo=timezone.utc),
+            ),
+            (
+                "2016-12-31T18:59:60.5-05:00",
+                datetime(
+                    2016,
+                    12,
+                    31,
+                    19,
+                    0,
+                    0,
+                    500000,
+                    tzinfo=timezone(-timedelta(hours=5)),
+                ),
+            ),
+        ],
+    )
+    def test_valid(self, value, expected):
+        assert to_datetime(value) == expected
+
+    @pytest.mark.parametrize(
+        "value",
+        ["2020-01-02", "2020-01-02T25:00:00Z", "2020-01-02T03:04:05+2:00"],
+    )
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            to_datetime(value)
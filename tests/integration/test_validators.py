@@ -1,4 +1,8 @@
+import array
+import mmap
+
 import pytest
+from jsonschema import SchemaError
 from jsonschema import ValidationError
 
 from openapi_schema_validator import OAS30Validator
@@ -222,6 +226,16 @@ class TestOAS30ValidatorValidate:
 
         assert result is None
 
+    def test_string_format_unknown(self):
+        schema = {"type": "string", "format": "custom"}
+        validator = OAS30Validator(schema, format_checker=oas30_format_checker)
+
+        with pytest.raises(
+            ValidationError,
+            match="Format checker for 'custom' format not found",
+        ):
+            validator.validate("x")
+
     def test_allof_required(self):
         schema = {
             "allOf": [
@@ -859,3 +873,235 @@ class TestOAS31ValidatorValidate:
 
         error = "Expected at most 4 items, but found 5"
         assert error in str(excinfo.value)
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestEnum:
+    @pytest.mark.parametrize(
+        "value",
+        ["PL", 1, 1.0, None, [1, "a"], {"code": "PL"}],
+    )
+    def test_valid(self, validator_class, value):
+        schema = {"enum": ["PL", 1, None, [1, "a"], {"code": "PL"}]}
+        validator = validator_class(schema)
+
+        result = validator.validate(value)
+
+        assert result is None
+
+    @pytest.mark.parametrize(
+        "value",
+        ["DE", True, 0, False, [True, "a"], {"code": "DE"}],
+    )
+    def test_invalid(self, validator_class, value):
+        schema = {"enum": ["PL", 1, None, [1, "a"], {"code": "PL"}]}
+        validator = validator_class(schema)
+
+        with pytest.raises(ValidationError, match="is not one of"):
+            validator.validate(value)
+
+    def test_index_shared_with_descendants(self, validator_class):
+        codes = [f"C{i:05}" for i in range(10000)]
+        schema = {"type": "array", "items": {"enum": codes}}
+        validator = validator_class(schema)
+
+        assert validator.is_valid(codes)
+        assert not validator.is_valid(["C99999"])
+
+        assert list(validator.keyword_cache._enums) == [id(codes)]
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestUniqueItems:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            [1, True],
+            [0, False],
+            [{"a": 1}, {"a": True}],
+            [[1, 2], [2, 1]],
+            [{"a": [1, {"b": 2}]}, {"a": [1, {"b": 3}]}],
+        ],
+    )
+    def test_unique(self, validator_class, value):
+        schema = {"type": "array", "uniqueItems": True}
+        validator = validator_class(schema)
+
+        result = validator.validate(value)
+
+        assert result is None
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            [1, 1.0],
+            [{"a": 1, "b": [1]}, {"b": [1.0], "a": 1}],
+            [[1, {"b": 2}], [1, {"b": 2}]],
+        ],
+    )
+    def test_not_unique(self, validator_class, value):
+        schema = {"type": "array", "uniqueItems": True}
+        validator = validator_class(schema)
+
+        with pytest.raises(ValidationError, match="has non-unique elements"):
+            validator.validate(value)
+
+    def test_large_array_of_objects(self, validator_class):
+        schema = {"type": "array", "uniqueItems": True}
+        validator = validator_class(schema)
+        value = [{"id": i, "tags": [str(i)]} for i in range(5000)]
+
+        assert validator.is_valid(value)
+        assert not validator.is_valid(value + [{"id": 0, "tags": ["0"]}])
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestPattern:
+    def test_patterns_compiled_on_load(self, validator_class):
+        schema = {
+            "type": "object",
+            "properties": {
+                "code": {"$ref": "#/components/schemas/Code"},
+                "name": {"type": "string", "pattern": "^[A-Z]"},
+            },
+            "components": {
+                "schemas": {
+                    "Code": {"type": "string", "pattern": "^[0-9]{3}$"},
+                },
+            },
+        }
+
+        validator = validator_class(schema)
+
+        assert set(validator.keyword_cache._patterns) == {
+            "^[A-Z]",
+            "^[0-9]{3}$",
+        }
+        assert validator.is_valid({"code": "123", "name": "Bob"})
+        with pytest.raises(ValidationError, match="does not match"):
+            validator.validate({"code": "12a"})
+
+    def test_invalid_pattern_raises_on_load(self, validator_class):
+        schema = {"properties": {"name": {"pattern": "^[A-Z"}}}
+
+        with pytest.raises(
+            SchemaError, match="is not a valid regular expression"
+        ):
+            validator_class(schema)
+
+
+class TestOAS31PatternProperties:
+    def test_pattern_properties(self):
+        schema = {
+            "type": "object",
+            "patternProperties": {"^x-": {"type": "string"}},
+        }
+        validator = OAS31Validator(schema)
+
+        assert validator.is_valid({"x-id": "a", "id": 1})
+        with pytest.raises(ValidationError, match="is not of type 'string'"):
+            validator.validate({"x-id": 1})
+
+    def test_invalid_pattern_raises_on_load(self):
+        schema = {"patternProperties": {"^x-(": {"type": "string"}}}
+
+        with pytest.raises(
+            SchemaError, match="is not a valid regular expression"
+        ):
+            OAS31Validator(schema)
+
+
+@pytest.mark.parametrize("validator_class", [OAS30Validator, OAS31Validator])
+class TestIntegerFormats:
+    @pytest.mark.parametrize(
+        "format,value",
+        [
+            ("int32", 2**31 - 1),
+            ("int32", -(2**31)),
+            ("int64", 2**63 - 1),
+            ("int64", -(2**63)),
+        ],
+    )
+    def test_in_range(self, validator_class, format, value):
+        schema = {"type": "integer", "format": format}
+        validator = validator_class(
+            schema, format_checker=oas30_format_checker
+        )
+
+        result = validator.validate(value)
+
+        assert result is None
+
+    @pytest.mark.parametrize(
+        "format,value",
+        [
+            ("int32", 2**31),
+            ("int32", -(2**31) - 1),
+            ("int64", 2**63),
+            ("int64", -(2**63) - 1),
+        ],
+    )
+    def test_out_of_range(self, validator_class, format, value):
+        schema = {"type": "integer", "format": format}
+        validator = validator_class(
+            schema, format_checker=oas30_format_checker
+        )
+
+        with pytest.raises(ValidationError, match=f"is not a '{format}'"):
+            validator.validate(value)
+
+
+def buffers(content):
+    mapped = mmap.mmap(-1, len(content))
+    mapped.write(content)
+    return [
+        content,
+        bytearray(content),
+        memoryview(content),
+        memoryview(bytearray(content)),
+        mapped,
+    ]
+
+
+class TestOAS30BinaryBuffers:
+    @pytest.mark.parametrize("value", buffers(b"\x00\xff" * 8))
+    def test_binary(self, value):
+        schema = {"type": "string", "format": "binary", "maxLength": 16}
+        validator = OAS30Validator(schema, format_checker=oas30_format_checker)
+
+        result = validator.validate(value)
+
+        assert result is None
+
+    @pytest.mark.parametrize("value", buffers(b"SGVsbG8="))
+    def test_byte(self, value):
+        schema = {"type": "string", "format": "byte"}
+        validator = OAS30Validator(schema, format_checker=oas30_format_checker)
+
+        result = validator.validate(value)
+
+        assert result is None
+
+    @pytest.mark.parametrize("value", buffers(b"SGVsbG8"))
+    def test_byte_invalid(self, value):
+        schema = {"type": "string", "format": "byte"}
+        validator = OAS30Validator(schema, format_checker=oas30_format_checker)
+
+        with pytest.raises(ValidationError, match="is not a 'byte'"):
+            validator.validate(value)
+
+    def test_length_in_bytes(self):
+        value = memoryview(array.array("I", [1, 2]))
+        validator = OAS30Validator({"type": "string", "maxLength": 7})
+
+        with pytest.raises(ValidationError, match="is too long"):
+            validator.validate(value)
+        assert OAS30Validator({"minLength": 8}).is_valid(value)
+
+    @pytest.mark.parametrize("value", buffers(b"PL"))
+    def test_enum(self, value):
+        validator = OAS30Validator({"enum": [b"PL", "DE"]})
+
+        result = validator.validate(value)
+
+        assert result is None
@@ -1,5 +1,8 @@
 from unittest import TestCase
 
+from jsonschema import ValidationError
+
+from openapi_schema_validator import OAS30Validator
 from openapi_schema_validator import validate
 
 
@@ -19,3 +22,42 @@ class ValidateTest(TestCase):
         validate({"email": "foo@bar.com"}, schema)
 
         self.assertTrue("nullable" not in schema["properties"]["email"].keys())
+
+    def test_validate_fail_fast_stops_at_first_error(self):
+        schema = {"type": "array", "items": {"type": "integer"}}
+        lazy = LazyList(["a", "b", "c"])
+        with self.assertRaises(ValidationError):
+            validate(lazy, schema, cls=OAS30Validator, fail_fast=True)
+        self.assertEqual(lazy.consumed, 1)
+
+    def test_validate_best_match_window(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "items": {"type": "array", "items": {"type": "integer"}},
+            },
+            "required": ["name"],
+        }
+        instance = {"items": ["a", "b", "c"]}
+
+        with self.assertRaisesRegex(ValidationError, "'a' is not of type"):
+            validate(instance, schema, best_match_window=1)
+        with self.assertRaisesRegex(ValidationError, "'name' is a required"):
+            validate(instance, schema, best_match_window=10)
+        with self.assertRaisesRegex(ValidationError, "'name' is a required"):
+            validate(instance, schema)
+
+    def test_validate_best_match_window_invalid(self):
+        with self.assertRaises(ValueError):
+            validate({}, {"type": "object"}, best_match_window=0)
+
+
+class LazyList(list):
+    def __init__(self, items):
+        super().__init__(items)
+        self.consumed = 0
+
+    def __iter__(self):
+        for item in super().__iter__():
+            self.consumed += 1
+            yield item